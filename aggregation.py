@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Aggregation Module
+-----------------
+Experience totals per O*NET code, matched title, position and company,
+computed once and shared by the text report and the charts. The O*NET code
+and matched title totals are elapsed months, so overlapping roles in the
+same group are counted once.
+"""
+
+from collections import defaultdict
+
+from date_utils import duration_months
+from timeline import match_coverage, role_intervals
+
+
+def period_months(period):
+    """
+    Get the duration of a work period in months
+
+    Args:
+        period: Work period dictionary with 'start' and 'end' (and optionally 'months')
+
+    Returns:
+        int: Duration in months or None if the dates are invalid
+    """
+    if 'months' in period:
+        return period['months']
+    return duration_months(period['start'], period['end'])
+
+
+def aggregate_experience(all_matches, all_work_periods, now=None):
+    """
+    Build a (position, company) -> durations index and all experience totals in one pass
+
+    The O*NET code and matched title totals merge the work periods of every
+    role matched to the group, as timeline.onet_coverage() does.
+
+    Args:
+        all_matches: List of match dictionaries ('position', 'company', 'match', 'score')
+        all_work_periods: List of work period dictionaries ('start', 'end', 'company', 'position')
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        dict: Aggregated experience with the keys
+            'period_index': (position, company) -> list of durations in months
+            'onet_groups': O*NET-SOC code -> list of match dictionaries
+            'onet_months': O*NET-SOC code -> covered months
+            'title_months': matched alternate title -> covered months
+            'position_months': position -> total months
+            'company_months': company -> total months
+    """
+    period_index = defaultdict(list)
+    position_months = {}
+    company_months = {}
+
+    for period in all_work_periods:
+        months = period_months(period)
+        if months is None:
+            continue
+        position, company = period['position'], period['company']
+        period_index[(position, company)].append(months)
+        position_months[position] = position_months.get(position, 0) + months
+        company_months[company] = company_months.get(company, 0) + months
+
+    onet_groups = defaultdict(list)
+    title_groups = defaultdict(list)
+
+    for match_info in all_matches:
+        onet_groups[match_info['match']['onet_soc_code']].append(match_info)
+        title_groups[match_info['match']['alternate_title']].append(match_info)
+
+    intervals_by_role = role_intervals(all_work_periods, now=now)
+
+    return {
+        'period_index': dict(period_index),
+        'onet_groups': onet_groups,
+        'onet_months': match_coverage(onet_groups, intervals_by_role),
+        'title_months': match_coverage(title_groups, intervals_by_role),
+        'position_months': position_months,
+        'company_months': company_months,
+    }
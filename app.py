@@ -1,21 +1,261 @@
-from flask import Flask, render_template
+from flask import Flask, Response, render_template, request, jsonify, make_response, send_from_directory, stream_with_context
 import json
+import mimetypes
 import os
+import threading
+import uuid
+from datetime import datetime, timezone
 
 app = Flask(__name__)
+app.config["MAX_CONTENT_LENGTH"] = 20 * 1024 * 1024
 
 DATA_PATH = "../data_output.json"
 CHART_DIR = "static/charts"
+TITLES_PATH = "../data/Alternate_Titles.txt"
+STORE_PATH = "../data/candidates.sqlite3"
+UPLOAD_DIR = "../uploads"
+
+# Yükleme kuyruğu: analiz eden işçi süreç sayısı ve bekleyebilecek en fazla iş (dolunca 429)
+JOB_WORKERS = 2
+MAX_PENDING_JOBS = 16
+
+# Önceden sıkıştırılmış statik dosya uzantıları, tercih sırasına göre (chart_renderer.precompress yazar)
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+
+# Okunan rapor verisi ve bu veriyle üretilen HTML; dosyanın inode/mtime/boyutu değişince yenilenir
+report_cache = {"version": None, "data": None, "html": None, "last_modified": None}
+report_cache_lock = threading.Lock()
+
+# Aday veritabanı ilk API isteğinde açılır (bağlantılar iş parçacığı başına)
+candidate_store = None
+candidate_store_lock = threading.Lock()
+
+# İş kuyruğu ilk yüklemede başlatılır
+job_queue = None
+job_queue_lock = threading.Lock()
+
+
+def load_report_data():
+    """
+    Rapor verisini döndürür; dosya yalnızca inode, mtime veya boyutu değiştiğinde yeniden okunur
+
+    Returns:
+        tuple: (sürüm anahtarı, veri) ya da dosya yoksa (None, None)
+    """
+    try:
+        st = os.stat(DATA_PATH)
+    except OSError:
+        return None, None
+
+    version = f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+    with report_cache_lock:
+        if report_cache["version"] != version:
+            with open(DATA_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            report_cache.update(version=version, data=data, html=None,
+                                last_modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc))
+        return version, report_cache["data"]
+
 
 @app.route("/")
 def report():
-    if not os.path.exists(DATA_PATH):
+    version, data = load_report_data()
+    if version is None:
         return "Veri dosyası bulunamadı. Lütfen önce main.py'yi çalıştırın."
 
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # HTML her veri sürümü için bir kez üretilir
+    with report_cache_lock:
+        html = report_cache["html"] if report_cache["version"] == version else None
+        last_modified = report_cache["last_modified"]
+    if html is None:
+        html = render_template("report.html", data=data)
+        with report_cache_lock:
+            if report_cache["version"] == version:
+                report_cache["html"] = html
+
+    # ETag/Last-Modified ile tarayıcı aynı veri için 304 alır
+    response = make_response(html)
+    response.set_etag(version)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def serve_static(filename):
+    # Tarayıcı destekliyorsa grafiklerin önceden sıkıştırılmış (.br/.gz) kopyasını gönderir
+    path = os.path.join(app.static_folder, filename)
+    accepted = request.accept_encodings
+    for encoding, suffix in PRECOMPRESSED:
+        compressed = path + suffix
+        if (accepted[encoding] and os.path.isfile(compressed) and os.path.isfile(path)
+                and os.path.getmtime(compressed) >= os.path.getmtime(path)):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            response.vary.add("Accept-Encoding")
+            return response
+
+    response = send_from_directory(app.static_folder, filename)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+app.view_functions["static"] = serve_static
+
+
+def get_candidate_store():
+    global candidate_store
+    from candidate_store import CandidateStore
+
+    with candidate_store_lock:
+        if candidate_store is None:
+            candidate_store = CandidateStore(STORE_PATH)
+        return candidate_store
+
+
+@app.route("/api/candidates")
+def list_candidates():
+    # Örnek: /api/candidates?onet_code=15-1252.00&min_years=5&sort=months&page=2&per_page=50
+    args = request.args
+    try:
+        min_months = args.get("min_months", type=int)
+        if "min_years" in args:
+            min_months = int(round(float(args["min_years"]) * 12))
+        result = get_candidate_store().query(
+            onet_code=args.get("onet_code"),
+            min_months=min_months,
+            min_score=args.get("min_score", type=float),
+            name=args.get("name"),
+            sort=args.get("sort", "total_months"),
+            order=args.get("order", "desc"),
+            page=args.get("page", 1, type=int),
+            per_page=args.get("per_page", 20, type=int),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+
+@app.route("/api/candidates/<int:candidate_id>")
+def candidate_detail(candidate_id):
+    candidate = get_candidate_store().get(candidate_id)
+    if candidate is None:
+        return jsonify({"error": "candidate not found"}), 404
+    return jsonify(candidate)
+
+
+@app.route("/candidates/<int:candidate_id>")
+def candidate_report(candidate_id):
+    # Veritabanındaki bir adayın raporunu aynı şablonla gösterir
+    candidate = get_candidate_store().get(candidate_id)
+    if candidate is None:
+        return "Aday bulunamadı.", 404
+    return render_template("report.html", data=candidate["data"])
+
+def get_job_queue():
+    global job_queue
+    from job_queue import JobQueue
+
+    with job_queue_lock:
+        if job_queue is None:
+            job_queue = JobQueue(titles_file=TITLES_PATH, store_path=STORE_PATH,
+                                 workers=JOB_WORKERS, max_pending=MAX_PENDING_JOBS)
+        return job_queue
+
+
+@app.route("/api/jobs", methods=["POST"])
+def upload_resume():
+    # PDF'i kaydedip kuyruğa ekler; analiz arka planda yapılır, istemciye hemen iş numarası döner
+    from job_queue import QueueFull
+
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"error": "a PDF must be uploaded in the 'file' field"}), 400
+    if upload.stream.read(5) != b"%PDF-":
+        return jsonify({"error": "the uploaded file is not a PDF"}), 400
+    upload.stream.seek(0)
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}.pdf")
+    upload.save(path)
+    try:
+        job = get_job_queue().submit(path, source_name=upload.filename)
+    except QueueFull as e:
+        os.remove(path)
+        response = jsonify({"error": f"analysis queue is full ({e}), try again later"})
+        response.status_code = 429
+        response.headers["Retry-After"] = "5"
+        return response
+
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers["Location"] = f"/api/jobs/{job['id']}"
+    return response
+
+
+@app.route("/api/jobs")
+def job_stats():
+    return jsonify(get_job_queue().stats())
+
+
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "job not found"}), 404
+    return jsonify(job)
+
+
+@app.route("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    # Server-sent events: işin her durum değişikliği bir olay olarak gönderilir, iş bitince akış kapanır
+    jobs = get_job_queue()
+    if jobs.get(job_id) is None:
+        return jsonify({"error": "job not found"}), 404
+
+    def events():
+        from job_queue import FINISHED_STATES
+
+        version = -1
+        while True:
+            job = jobs.wait(job_id, version)
+            if job is None:
+                return
+            if job["version"] == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = job["version"]
+            yield f"event: {job['status']}\ndata: {json.dumps(job)}\n\n"
+            if job["status"] in FINISHED_STATES:
+                return
+
+    response = Response(stream_with_context(events()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@app.route("/api/match", methods=["POST"])
+def match():
+    # Eşleştirme sunucusu çalışıyorsa onu kullanır, yoksa modeli bu süreçte yükler
+    from match_server import match_positions
+
+    payload = request.get_json(silent=True) or {}
+    positions = payload.get("positions")
+    if not isinstance(positions, list) or not all(isinstance(p, str) for p in positions):
+        return jsonify({"error": "positions must be a list of strings"}), 400
+    try:
+        top_n = int(payload.get("top_n", 1))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_n must be an integer"}), 400
+    if top_n < 1:
+        return jsonify({"error": "top_n must be at least 1"}), 400
 
-    return render_template("report.html", data=data)
+    matches = match_positions(positions, titles_file=TITLES_PATH, top_n=top_n)
+    return jsonify({"matches": {
+        position: [{"match": m, "score": float(score)} for m, score in pairs]
+        for position, pairs in matches.items()
+    }})
 
 if __name__ == "__main__":
     app.run(debug=True)
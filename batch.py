@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batch Processing Module
+----------------------
+Analyse a folder (or glob) of PDF resumes with a pool of worker processes.
+
+Usage:
+    python batch.py ./resumes --output-dir batch_output --workers 8 --chunk-size 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from date_utils import current_month_ordinal, split_months
+from metrics import collect, summarize_stages, sum_counters
+from candidate_store import CandidateStore
+from embedding_store import file_sha256
+from output_formatter import build_web_data
+from parse_cache import DEFAULT_CACHE_DIR
+from timeline import batch_coverage, covered_months, resume_intervals
+
+
+def find_resume_files(inputs):
+    """
+    Expand directories and glob patterns into a sorted list of PDF files
+
+    Args:
+        inputs: List of directories, glob patterns or file paths
+
+    Returns:
+        list: Unique PDF file paths
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            files.update(glob.glob(os.path.join(item, '**', '*.pdf'), recursive=True))
+            files.update(glob.glob(os.path.join(item, '**', '*.PDF'), recursive=True))
+        else:
+            files.update(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+    return sorted(files)
+
+
+def parse_resume_worker(file_path, stop_early=False, cache_dir=None):
+    """
+    Parse one resume in a worker process
+
+    Only the plain experience and contact arrays are returned, so the
+    DataFrames never have to be pickled back to the parent process.
+
+    Args:
+        file_path: Path to the PDF resume
+        stop_early: Skip the pages after the sections the analysis needs
+        cache_dir: Optional parse cache folder; unchanged PDFs skip pdfminer
+
+    Returns:
+        dict: File path, parsed arrays or error message, parse time and the metrics of the parse
+    """
+    from pdf_parser import parse_pdf_resume
+    from parse_cache import ParseCache
+
+    start = time.perf_counter()
+    with collect() as parse_metrics:
+        try:
+            cache = ParseCache(cache_dir) if cache_dir else None
+            _, _, _, arr, arr_co = parse_pdf_resume(file_path, stop_early=stop_early, cache=cache)
+            result = {'file': file_path, 'arr': arr, 'arr_co': arr_co, 'error': None}
+        except Exception as e:
+            result = {'file': file_path, 'arr': [], 'arr_co': [], 'error': f"{type(e).__name__}: {e}"}
+    result['parse_seconds'] = time.perf_counter() - start
+    result['metrics'] = parse_metrics.to_dict()
+    return result
+
+
+def collect_positions(arr):
+    """
+    Get the positions listed in a parsed experience array
+
+    Args:
+        arr: Parsed experience array
+
+    Returns:
+        list: Position titles
+    """
+    return [exp.get('position', 'Unknown Position') for item in arr for exp in item.get('experience', [])]
+
+
+def total_experience(arr):
+    """
+    Calculate total experience as elapsed time, counting overlapping roles once
+
+    Args:
+        arr: Parsed experience array
+
+    Returns:
+        tuple: (years, months) total experience
+    """
+    return split_months(covered_months(resume_intervals(arr)))
+
+
+def experience_coverage(arrs, now=None):
+    """
+    Calculate the covered and gap months of many resumes with one vectorized sweep
+
+    Args:
+        arrs: List of parsed experience arrays
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        tuple: (covered, gaps) int64 arrays with one entry per resume
+    """
+    if now is None:
+        now = current_month_ordinal()
+    starts, ends, owners = [], [], []
+    for owner, arr in enumerate(arrs):
+        for start, end in resume_intervals(arr, now=now):
+            starts.append(start)
+            ends.append(end)
+            owners.append(owner)
+    return batch_coverage(starts, ends, owners, n_owners=len(arrs))
+
+
+def output_name(file_path, used_names):
+    """Pick a unique JSON file name for a resume"""
+    base = os.path.splitext(os.path.basename(file_path))[0]
+    name = f"{base}.json"
+    counter = 1
+    while name in used_names:
+        counter += 1
+        name = f"{base}-{counter}.json"
+    used_names.add(name)
+    return name
+
+
+def run_batch(inputs, output_dir='batch_output', workers=None, chunk_size=4,
+              titles_file='./data/Alternate_Titles.txt', backend='exact', stop_early=False, cache_dir=None,
+              progress_every=10, store_path=None):
+    """
+    Analyse many resumes and write one JSON result per resume plus a manifest
+
+    Args:
+        inputs: List of directories, glob patterns or file paths
+        output_dir: Folder for the JSON results and manifest.json
+        workers: Number of worker processes (default: number of CPUs)
+        chunk_size: Number of resumes handed to a worker at a time
+        titles_file: Path to the alternate titles file
+        backend: Title search backend name ('exact' or 'ivf')
+        stop_early: Stop laying out each PDF once the needed sections are closed
+        cache_dir: Optional parse cache folder shared by the workers
+        progress_every: Report progress after this many parsed resumes
+        store_path: Optional candidate database to add the analyses to
+
+    Returns:
+        dict: The summary manifest
+    """
+    from data_parser import load_onet_data
+    from hybrid_matching import hybrid_match
+
+    files = find_resume_files(inputs)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    batch_start = time.perf_counter()
+
+    # Parse all PDFs in the worker pool
+    parsed = []
+    if files:
+        with Pool(processes=workers) as pool:
+            worker = partial(parse_resume_worker, stop_early=stop_early, cache_dir=cache_dir)
+            for result in pool.imap_unordered(worker, files, chunksize=chunk_size):
+                parsed.append(result)
+                done = len(parsed)
+                if done % progress_every == 0 or done == len(files):
+                    elapsed = time.perf_counter() - batch_start
+                    print(f"[parse] {done}/{len(files)} resumes ({done / elapsed:.2f} resumes/sec)",
+                          file=sys.stderr)
+    parse_seconds = time.perf_counter() - batch_start
+    parsed.sort(key=lambda result: result['file'])
+
+    # Match every unique position of every resume with a single encode call
+    match_start = time.perf_counter()
+    unique_positions = sorted({position for result in parsed for position in collect_positions(result['arr'])})
+    position_matches = {}
+    with collect() as match_metrics:
+        if unique_positions:
+            alternate_titles, _ = load_onet_data(titles_file)
+            position_matches = hybrid_match(unique_positions, alternate_titles, top_n=1, titles_file=titles_file,
+                                            backend=backend)
+    match_seconds = time.perf_counter() - match_start
+
+    # Total experience and career gaps of every resume in one NumPy call
+    covered, gaps = experience_coverage([result['arr'] for result in parsed])
+
+    # Write one JSON result per resume
+    entries = []
+    stored = []
+    used_names = set()
+    for result, covered_total, gap_total in zip(parsed, covered, gaps):
+        entry = {
+            'file': result['file'],
+            'status': 'error' if result['error'] else 'ok',
+            'error': result['error'],
+            'parse_seconds': round(result['parse_seconds'], 4),
+        }
+        if not result['error']:
+            years, months = split_months(int(covered_total))
+            web_data = build_web_data(result['arr'], result['arr_co'], position_matches, (years, months))
+            name = output_name(result['file'], used_names)
+            with open(os.path.join(output_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(web_data, f, indent=4, ensure_ascii=False)
+            if store_path:
+                stored.append((web_data, result['file'], file_sha256(result['file'])))
+            entry.update({
+                'output': name,
+                'positions': len(collect_positions(result['arr'])),
+                'total_experience': {'years': years, 'months': months},
+                'career_gap_months': int(gap_total),
+            })
+        entries.append(entry)
+
+    # Add every analysis to the candidate database in one transaction
+    if stored:
+        store = CandidateStore(store_path)
+        store.add_many(stored)
+        store.close()
+
+    total_seconds = time.perf_counter() - batch_start
+    manifest = {
+        'resumes': len(files),
+        'succeeded': sum(1 for entry in entries if entry['status'] == 'ok'),
+        'failed': sum(1 for entry in entries if entry['status'] == 'error'),
+        'unique_positions': len(unique_positions),
+        'stored': len(stored),
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'backend': backend,
+        'seconds': {
+            'parse': round(parse_seconds, 3),
+            'match': round(match_seconds, 3),
+            'total': round(total_seconds, 3),
+        },
+        'resumes_per_second': round(len(files) / total_seconds, 3) if total_seconds > 0 else None,
+        'stage_latency': summarize_stages([result['metrics'] for result in parsed]),
+        'match_stages': match_metrics.to_dict()['stages'],
+        'counters': sum_counters([result['metrics'] for result in parsed] + [match_metrics.to_dict()]),
+        'results': entries,
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+
+    print(f"Batch complete: {manifest['succeeded']}/{len(files)} resumes in {total_seconds:.2f}s "
+          f"({manifest['resumes_per_second']} resumes/sec). Results saved to '{output_dir}'", file=sys.stderr)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse a folder of PDF resumes in parallel")
+    parser.add_argument('inputs', nargs='+', help='directories, glob patterns or PDF files')
+    parser.add_argument('--output-dir', default='batch_output', help='folder for JSON results (default: batch_output)')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=4, help='resumes handed to a worker at a time (default: 4)')
+    parser.add_argument('--titles', default='./data/Alternate_Titles.txt', help='alternate titles file')
+    parser.add_argument('--backend', default='exact', choices=['exact', 'ivf'], help='title search backend')
+    parser.add_argument('--stop-early', action='store_true',
+                        help='stop reading each PDF once Contact, Experience and Education are closed')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'parse cache folder (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='always run pdfminer, never use the parse cache')
+    parser.add_argument('--store', default=None, help='candidate database to add the analyses to')
+    args = parser.parse_args(argv)
+
+    run_batch(args.inputs, output_dir=args.output_dir, workers=args.workers, chunk_size=args.chunk_size,
+              titles_file=args.titles, backend=args.backend, stop_early=args.stop_early,
+              cache_dir=None if args.no_cache else args.cache_dir, store_path=args.store)
+
+
+if __name__ == "__main__":
+    main()
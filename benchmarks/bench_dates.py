@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Date Range Benchmark
+-------------------
+Checks date_ranges.extract_date_ranges on a table of formats and locales,
+then times it against the original English-only expression on millions of
+synthetic resume lines.
+
+Usage:
+    python benchmarks/bench_dates.py --lines 2000000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+from date_ranges import extract_date_ranges
+from date_utils import month_ordinal
+
+# The original English-only date range expression
+LEGACY_DATE_RANGE_REGEX = re.compile(r'([a-zA-Z]+\s\d{4})\s-\s(?:([a-zA-Z]+\s\d{4})|(\w+))', re.IGNORECASE)
+
+# Line -> expected (start, end) ranges, as (year, month) pairs; None for an open end
+CASES = {
+    "June 2019 - Present (5 years 2 months)": [((2019, 6), None)],
+    "May 2003 - June 2004 (1 year 2 months)": [((2003, 5), (2004, 6))],
+    "Haziran 2019 - Günümüz (5 yıl)": [((2019, 6), None)],
+    "ŞUBAT 2018 - MAYIS 2019": [((2018, 2), (2019, 5))],
+    "Subat 2018 - Mayis 2019": [((2018, 2), (2019, 5))],
+    "Ağustos 2011 - Eylül 2012": [((2011, 8), (2012, 9))],
+    "Ekim 2020 - Halen": [((2020, 10), None)],
+    "Sept. 2015 – Dec 2017": [((2015, 9), (2017, 12))],
+    "März 2010 - heute": [((2010, 3), None)],
+    "janv. 2012 - déc. 2014": [((2012, 1), (2014, 12))],
+    "Diciembre 2001 - Actualidad": [((2001, 12), None)],
+    "06/2019 - 03/2021": [((2019, 6), (2021, 3))],
+    "10.2010 - 12.2012": [((2010, 10), (2012, 12))],
+    "2019-06 - 2021-03": [((2019, 6), (2021, 3))],
+    "2015 - 2018": [((2015, 1), (2018, 12))],
+    "Jan 2020 to current": [((2020, 1), None)],
+    "Summer 2019 - 2020 season": [((2019, 1), (2020, 12))],
+    "Revenue grew 15% in 2019": [],
+    "Managed 12 people": [],
+}
+
+
+def check_cases():
+    for line, expected in CASES.items():
+        expected = [(month_ordinal(*start), month_ordinal(*end) if end else None) for start, end in expected]
+        actual = extract_date_ranges(line)
+        if actual != expected:
+            raise AssertionError(f"{line!r}: expected {expected}, got {actual}")
+    print(f"ok  {len(CASES)} cases")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=2000000, help='synthetic lines to scan')
+    parser.add_argument('--date-share', type=float, default=0.3, help='share of the lines holding a date range')
+    args = parser.parse_args()
+
+    check_cases()
+    lines = synthetic.date_lines(args.lines, date_share=args.date_share)
+
+    start = time.perf_counter()
+    legacy_found = sum(1 for line in lines if LEGACY_DATE_RANGE_REGEX.findall(line))
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = sum(1 for line in lines if extract_date_ranges(line))
+    new_s = time.perf_counter() - start
+
+    print(f"{len(lines)} lines: legacy {legacy_s:.2f} s ({len(lines) / legacy_s:,.0f} lines/s, "
+          f"{legacy_found} with ranges), date_ranges {new_s:.2f} s ({len(lines) / new_s:,.0f} lines/s, "
+          f"{found} with ranges)")
+
+
+if __name__ == "__main__":
+    main()
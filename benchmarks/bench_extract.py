@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Extraction Benchmark
+-------------------
+Times pdf_parser.extract_rows on synthetic resumes of growing page counts and
+records the peak RSS of each run in a fresh interpreter, so the figures show
+whether memory stays flat as the page count grows.
+
+Exits with status 1 when the peak RSS of the largest resume exceeds that of
+the smallest by more than --max-growth-mb.
+
+Usage:
+    python benchmarks/bench_extract.py --companies 10 80 320
+    python benchmarks/bench_extract.py --boxes-flow 0.5     # with pdfminer's text box grouping
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+
+# Runs in the child interpreter: extract the rows and report time and peak RSS
+CHILD = """
+import json, sys, time
+from metrics import max_rss_bytes
+from pdf_parser import extract_rows, make_laparams
+
+overrides = json.loads(sys.argv[2])
+start = time.perf_counter()
+rows = extract_rows(sys.argv[1], laparams=make_laparams(**overrides))
+print(json.dumps({'rows': len(rows), 'seconds': time.perf_counter() - start, 'max_rss_bytes': max_rss_bytes()}))
+"""
+
+
+def run_case(path, overrides):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', CHILD, path, json.dumps(overrides)], env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, nargs='+', default=[10, 80, 320],
+                        help='companies per synthetic resume (about 2 pages per 10 companies)')
+    parser.add_argument('--boxes-flow', type=float, default=None, help='LAParams boxes_flow (default: skipped)')
+    parser.add_argument('--max-growth-mb', type=float, default=32.0,
+                        help='allowed peak RSS growth from the smallest to the largest resume')
+    args = parser.parse_args()
+
+    overrides = {'boxes_flow': args.boxes_flow}
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_companies in args.companies:
+            path = os.path.join(workdir, f"resume-{n_companies}.pdf")
+            pages = synthetic.write_resume_pdf(path, n_companies, body_lines=6)
+            result = dict(run_case(path, overrides), pages=pages)
+            results.append(result)
+            print(f"{pages:>5} pages {result['rows']:>7} rows {result['seconds']:>8.2f} s "
+                  f"{result['max_rss_bytes'] / 2 ** 20:>8.1f} MB peak RSS "
+                  f"{1000 * result['seconds'] / pages:>7.1f} ms/page")
+
+    growth = (results[-1]['max_rss_bytes'] - results[0]['max_rss_bytes']) / 2 ** 20
+    print(f"peak RSS growth: {growth:.1f} MB")
+    if growth > args.max_growth_mb:
+        print(f"FAIL: peak RSS grew by more than {args.max_growth_mb:.0f} MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Indentation Clustering Benchmark
+-------------------------------
+Checks that pdf_parser.cluster_indentation gives the same indent_label values
+as the original per-row binning on the bundled PDFs and on random inputs, then
+times both on synthetic multi-page documents.
+
+Usage:
+    python benchmarks/bench_indent.py --pages 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pdf_parser import cluster_indentation
+
+BUNDLED_PDFS = ['Profile.pdf', 'Profile2.pdf', 'ali.pdf']
+
+
+def legacy_indent_labels(df, pct=0.001):
+    """The original iterrows() binning and labeling() lookup, kept as the reference"""
+    indent_cat = {}
+    for index, row in df.iterrows():
+        feature = row['x0']
+        bin_found = False
+        for bin_key, bin_arr in indent_cat.items():
+            if feature >= (bin_key * (1.0 - pct)) and (bin_key * (1.0 + pct)) >= feature:
+                bin_found = True
+                bin_arr.append(index)
+        if not bin_found:
+            indent_cat[feature] = [index]
+
+    def labeling(x, cat_):
+        for key, val in cat_.items():
+            if x in val:
+                return list(sorted(cat_)).index(key)
+
+    return df.index.map(lambda x: labeling(x, indent_cat)).to_numpy()
+
+
+def synthetic_x0(pages, lines_per_page=60, seed=0):
+    """x0 values of a LinkedIn-style document: two columns with a few indent levels plus jitter"""
+    rng = np.random.default_rng(seed)
+    levels = np.array([21.6, 30.0, 223.6, 232.1, 250.0])
+    n_rows = pages * lines_per_page
+    x0 = levels[rng.integers(0, len(levels), n_rows)]
+    jitter = rng.random(n_rows) < 0.2
+    x0[jitter] += rng.uniform(-0.3, 0.3, jitter.sum())
+    return x0
+
+
+def check_bundled_pdfs():
+    """Compare both implementations on the rows extracted from the bundled PDFs"""
+    from pdf_parser import parse_pdf_resume
+
+    for name in BUNDLED_PDFS:
+        path = os.path.join(ROOT, name)
+        if not os.path.exists(path):
+            continue
+        df = parse_pdf_resume(path)[0]
+        expected = legacy_indent_labels(df)
+        if not np.array_equal(df['indent_label'].to_numpy(), expected):
+            raise AssertionError(f"indent_label mismatch for {name}")
+        print(f"ok  {name}: {len(df)} rows, {df['indent_label'].nunique()} levels")
+
+
+def check_random(cases=200, seed=1):
+    """Compare both implementations on random non-negative inputs with many near-duplicate values"""
+    rng = np.random.default_rng(seed)
+    for _ in range(cases):
+        n_rows = int(rng.integers(1, 80))
+        base = rng.choice([0.0, 10.0, 21.6, 100.0, 100.15, 100.3, 223.6], n_rows)
+        x0 = np.abs(base + rng.choice([0.0, 0.01, -0.02, 0.1], n_rows))
+        df = pd.DataFrame({'x0': x0})
+        if not np.array_equal(cluster_indentation(x0), legacy_indent_labels(df)):
+            raise AssertionError(f"indent_label mismatch for x0={x0.tolist()}")
+    print(f"ok  {cases} random cases")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=50, help='pages in the synthetic document')
+    parser.add_argument('--lines-per-page', type=int, default=60, help='text lines per page')
+    parser.add_argument('--skip-pdfs', action='store_true', help='skip the bundled PDF regression check')
+    args = parser.parse_args()
+
+    if not args.skip_pdfs:
+        check_bundled_pdfs()
+    check_random()
+
+    x0 = synthetic_x0(args.pages, args.lines_per_page)
+    df = pd.DataFrame({'x0': x0})
+
+    start = time.perf_counter()
+    expected = legacy_indent_labels(df)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    labels = cluster_indentation(x0)
+    new_s = time.perf_counter() - start
+
+    assert np.array_equal(labels, expected)
+    print(f"{args.pages} pages, {len(x0)} rows: legacy {legacy_s * 1000:.1f} ms, "
+          f"cluster_indentation {new_s * 1000:.2f} ms ({legacy_s / new_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
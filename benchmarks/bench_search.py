@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Search Backend Benchmark
+-----------------------
+Compares recall and query latency of the exact and IVF title search backends
+on synthetic clustered embeddings.
+
+Usage:
+    python benchmarks/bench_search.py --titles 50000 --queries 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_search import ExactSearch, IVFIndex
+
+
+def make_embeddings(n_titles, n_queries, dim=384, n_topics=500, noise=0.35, seed=0):
+    """
+    Generate clustered unit vectors that look like sentence embeddings of job titles
+
+    Returns:
+        tuple: (titles, queries) float32 matrices
+    """
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    titles = topics[rng.integers(0, n_topics, n_titles)] + noise * rng.normal(size=(n_titles, dim)).astype(np.float32)
+    queries = titles[rng.integers(0, n_titles, n_queries)] + noise * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    return titles, queries
+
+
+def time_search(engine, queries, top_n):
+    """Run a search and return (results, milliseconds per query)"""
+    start = time.perf_counter()
+    results = engine.search(queries, top_n)
+    elapsed = time.perf_counter() - start
+    return results, 1000.0 * elapsed / len(queries)
+
+
+def recall(exact_results, approx_results):
+    """Fraction of exact top-k ids that the approximate search also returned"""
+    hits = total = 0
+    for (exact_ids, _), (approx_ids, _) in zip(exact_results, approx_results):
+        hits += len(set(exact_ids.tolist()) & set(approx_ids.tolist()))
+        total += len(exact_ids)
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--titles', type=int, default=50000, help='number of alternate titles')
+    parser.add_argument('--queries', type=int, default=200, help='number of position queries')
+    parser.add_argument('--top-n', type=int, default=5, help='matches per query')
+    parser.add_argument('--probes', default='1,4,8,16,32', help='comma separated n_probe values for IVF')
+    args = parser.parse_args()
+
+    titles, queries = make_embeddings(args.titles, args.queries)
+
+    exact = ExactSearch(titles)
+    exact_results, exact_ms = time_search(exact, queries, args.top_n)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(titles)
+    build_s = time.perf_counter() - start
+
+    print(f"titles={args.titles} queries={args.queries} top_n={args.top_n} "
+          f"ivf_lists={index.centroids.shape[0]} ivf_build={build_s:.2f}s")
+    print(f"{'backend':<16}{'recall':>10}{'ms/query':>12}{'speedup':>10}")
+    print(f"{'exact':<16}{1.0:>10.3f}{exact_ms:>12.3f}{1.0:>10.1f}")
+    for n_probe in [int(p) for p in args.probes.split(',')]:
+        index.n_probe = n_probe
+        approx_results, approx_ms = time_search(index, queries, args.top_n)
+        print(f"{f'ivf n_probe={n_probe}':<16}{recall(exact_results, approx_results):>10.3f}"
+              f"{approx_ms:>12.3f}{exact_ms / approx_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Section Tagging Benchmark
+------------------------
+Checks that the columnar section tagging in pdf_parser (assign_titles,
+parse_experience_rows, parse_contact_rows), driven by the font style roles,
+builds the same Title columns and arr / arr_co structures as the original
+apply()/iterrows() code on line heights, then times both on a synthetic
+resume with a long work history.
+
+Usage:
+    python benchmarks/bench_sections.py --companies 300
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pdf_parser import assign_titles, parse_experience_rows, parse_contact_rows
+from styles import MAIN_HEADING_ROLES, SECTION_ROLES
+
+BUNDLED_PDFS = ['Profile.pdf', 'Profile2.pdf', 'ali.pdf']
+
+# The original English-only date range expression
+LEGACY_DATE_RANGE_REGEX = re.compile(r'([a-zA-Z]+\s\d{4})\s-\s(?:([a-zA-Z]+\s\d{4})|(\w+))', re.IGNORECASE)
+
+# Roles of the LinkedIn line heights, for the synthetic frames
+HEIGHT_ROLES = {26: 'title', 22: 'heading', 18: 'subheading', 17: 'company', 16: 'position', 15: 'body', 13: 'small'}
+
+
+def legacy_sections(df_1, df_0):
+    """The original per-row title propagation and section parsing, kept as the reference"""
+    df_1 = df_1.copy()
+    df_0 = df_0.copy()
+    regex = LEGACY_DATE_RANGE_REGEX
+
+    arr = []
+    def title(row):
+        if row.y_dif >= 22:
+            arr.append(row.line)
+        return arr[-1]
+    df_1['Title'] = df_1.apply(lambda row: title(row), axis=1)
+
+    arr_0 = []
+    def title_0(row):
+        if row.y_dif >= 18:
+            arr_0.append(row.line)
+        return arr_0[-1]
+    df_0['Title'] = df_0.apply(lambda row: title_0(row), axis=1)
+
+    df_ex = df_1[df_1['Title'] == 'Experience'].copy()
+    arr = []
+    for index, row in df_ex.iterrows():
+        if row['y_dif'] == 17:
+            arr.append({})
+            arr[-1]['company'] = row['line']
+        elif row['y_dif'] == 16:
+            if 'experience' not in arr[-1]:
+                arr[-1]['experience'] = []
+            arr[-1]['experience'].append({})
+            arr[-1]['experience'][-1]['position'] = row['line']
+        elif row['y_dif'] == 15 and regex.findall(row['line']):
+            if 'experience' in arr[-1]:
+                t = arr[-1]['experience'][-1]['date_period'] if('date_period' in arr[-1]['experience'][-1]) else []
+                arr[-1]['experience'][-1]['date_period'] = t + regex.findall(row['line'])
+        elif row['y_dif'] == 15:
+            if 'experience' in arr[-1]:
+                t = arr[-1]['experience'][-1]['meta'] if('meta' in arr[-1]['experience'][-1]) else ''
+                arr[-1]['experience'][-1]['meta'] = t + ' ' + row['line']
+
+    arr_co = []
+    df_co = df_0[df_0['Title'] == 'Contact'].copy()
+    for index, row in df_co.iterrows():
+        if row['y_dif'] == 18:
+            arr_co.append({})
+        if row['y_dif'] == 15:
+            t = arr_co[-1]['contact'] if ('contact' in arr_co[-1]) else []
+            arr_co[-1]['contact'] = t + [row['line']]
+
+    return df_1['Title'], df_0['Title'], arr, arr_co
+
+
+def columnar_sections(df_1, df_0):
+    """The current implementation, as parse_pdf_resume runs it"""
+    title_1 = assign_titles(df_1, MAIN_HEADING_ROLES)
+    title_0 = assign_titles(df_0, SECTION_ROLES)
+    arr = parse_experience_rows(df_1[title_1 == 'Experience'])
+    arr_co = parse_contact_rows(df_0[title_0 == 'Contact'])
+    return title_1, title_0, arr, arr_co
+
+
+def synthetic_columns(companies, positions_per_company=3, body_lines=8, seed=0):
+    """Build df_1 / df_0 frames shaped like a LinkedIn export with a long Experience section"""
+    rng = np.random.default_rng(seed)
+    rows_1 = [('Jane Doe', 26), ('Summary', 22), ('Experienced engineer.', 15), ('Experience', 22)]
+    for c in range(companies):
+        rows_1.append((f"Company {c}", 17))
+        for p in range(int(rng.integers(1, positions_per_company + 1))):
+            rows_1.append((f"Position {c}.{p}", 16))
+            rows_1.append((f"January {2000 + p} - {'Present' if p == 0 else f'March {2001 + p}'} (1 year)", 15))
+            for b in range(body_lines):
+                rows_1.append((f"Did thing {b} at company {c}", 15))
+    rows_1 += [('Education', 22), ('Some University', 17)]
+    rows_0 = [('Contact', 18), ('555 123 (Mobile)', 15), ('jane@example.com', 15), ('Top Skills', 18), ('Python', 15)]
+
+    df_1 = pd.DataFrame(rows_1, columns=['line', 'y_dif']).astype({'y_dif': float})
+    df_0 = pd.DataFrame(rows_0, columns=['line', 'y_dif']).astype({'y_dif': float})
+    df_1['role'] = df_1['y_dif'].map(HEIGHT_ROLES)
+    df_0['role'] = df_0['y_dif'].map(HEIGHT_ROLES)
+    return df_1, df_0
+
+
+def assert_same(expected, actual, label):
+    title_1, title_0, arr, arr_co = expected
+    new_title_1, new_title_0, new_arr, new_arr_co = actual
+    if not (title_1.equals(new_title_1) and title_0.equals(new_title_0) and arr == new_arr and arr_co == new_arr_co):
+        raise AssertionError(f"section tagging mismatch for {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, default=300, help='companies in the synthetic Experience section')
+    parser.add_argument('--skip-pdfs', action='store_true', help='skip the bundled PDF regression check')
+    args = parser.parse_args()
+
+    if not args.skip_pdfs:
+        from pdf_parser import parse_pdf_resume
+        for name in BUNDLED_PDFS:
+            path = os.path.join(ROOT, name)
+            if os.path.exists(path):
+                _, df_1, df_0, _, _ = parse_pdf_resume(path)
+                df_1 = df_1.drop(columns='Title')
+                df_0 = df_0.drop(columns='Title')
+                assert_same(legacy_sections(df_1, df_0), columnar_sections(df_1, df_0), name)
+                print(f"ok  {name}")
+
+    df_1, df_0 = synthetic_columns(args.companies)
+
+    start = time.perf_counter()
+    expected = legacy_sections(df_1, df_0)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = columnar_sections(df_1, df_0)
+    new_s = time.perf_counter() - start
+
+    assert_same(expected, actual, 'synthetic resume')
+    print(f"{args.companies} companies, {len(df_1)} rows: legacy {legacy_s * 1000:.1f} ms, "
+          f"columnar {new_s * 1000:.1f} ms ({legacy_s / new_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Startup Benchmark
+----------------
+Measures the import cost of main.py with `python -X importtime` and checks
+that each run mode stays away from the heavy libraries it doesn't need:
+
+    import main          no pdfminer, pandas, torch, matplotlib or plotly
+    main --parse-only    no torch, sentence_transformers, matplotlib or plotly
+    main --no-charts     no matplotlib or plotly
+
+Exits with status 1 when a mode imports a forbidden module or `import main`
+goes over the time budget.
+
+Usage:
+    python benchmarks/bench_startup.py --budget-ms 150 --resume Profile2.pdf
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['torch', 'sentence_transformers', 'sklearn', 'pdfminer', 'pandas', 'matplotlib', 'plotly']
+CHART_MODULES = ['matplotlib', 'plotly']
+MODEL_MODULES = ['torch', 'sentence_transformers', 'sklearn']
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr: Text written to stderr by the child interpreter
+
+    Returns:
+        tuple: (set of imported module names, list of (top-level module, cumulative microseconds))
+    """
+    modules = set()
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Nested imports are indented below the module that triggered them
+        if not name[1:].startswith(' '):
+            top_level.append((name.strip(), int(cumulative)))
+    return modules, top_level
+
+
+def run_mode(args, cwd):
+    """
+    Run a Python command with -X importtime
+
+    Returns:
+        tuple: (wall seconds, imported modules, top-level imports, return code, stderr)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])),
+               MPLBACKEND='Agg')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=cwd, env=env,
+                            capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    modules, top_level = parse_importtime(result.stderr)
+    return wall, modules, top_level, result.returncode, result.stderr
+
+
+def forbidden_loaded(modules, forbidden):
+    """Forbidden packages (or any of their submodules) that were imported"""
+    return sorted(name for name in forbidden if any(m == name or m.startswith(name + '.') for m in modules))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=150.0, help='import time budget for `import main`')
+    parser.add_argument('--repeat', type=int, default=5, help='number of `import main` runs (best is kept)')
+    parser.add_argument('--resume', default=os.path.join(REPO_DIR, 'Profile2.pdf'),
+                        help='PDF used for the --parse-only and --no-charts runs')
+    parser.add_argument('--data-dir', default=os.path.join(REPO_DIR, 'data'), help='O*NET data folder')
+    parser.add_argument('--skip-runs', action='store_true', help='only measure `import main`')
+    parser.add_argument('--top', type=int, default=5, help='number of heaviest imports to show')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # main.py writes its outputs to the working directory and reads ./data
+        if os.path.isdir(args.data_dir):
+            os.symlink(os.path.abspath(args.data_dir), os.path.join(workdir, 'data'))
+
+        best = None
+        for _ in range(args.repeat):
+            wall, modules, top_level, code, stderr = run_mode(['-c', 'import main'], workdir)
+            if code != 0:
+                print(stderr, file=sys.stderr)
+                sys.exit(1)
+            import_ms = sum(cumulative for _, cumulative in top_level) / 1000.0
+            if best is None or import_ms < best[0]:
+                best = (import_ms, wall, modules, top_level)
+
+        import_ms, wall, modules, top_level = best
+        print(f"import main: {import_ms:.1f} ms imports, {1000 * wall:.0f} ms wall (budget {args.budget_ms:.0f} ms)")
+        for name, cumulative in sorted(top_level, key=lambda item: -item[1])[:args.top]:
+            print(f"    {cumulative / 1000.0:8.1f} ms  {name}")
+        loaded = forbidden_loaded(modules, HEAVY_MODULES)
+        if loaded:
+            failures.append(f"import main loaded {', '.join(loaded)}")
+        if import_ms > args.budget_ms:
+            failures.append(f"import main took {import_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+        if not args.skip_runs:
+            resume = os.path.abspath(args.resume)
+            modes = [
+                ('--parse-only', MODEL_MODULES + CHART_MODULES),
+                ('--no-charts', CHART_MODULES),
+            ]
+            for flag, forbidden in modes:
+                wall, modules, top_level, code, stderr = run_mode(
+                    [os.path.join(REPO_DIR, 'main.py'), resume, flag, '--output', 'report.txt'], workdir)
+                if code != 0:
+                    failures.append(f"main {flag} exited with status {code}")
+                    print(stderr[-2000:], file=sys.stderr)
+                    continue
+                import_ms = sum(cumulative for _, cumulative in top_level) / 1000.0
+                print(f"main {flag}: {import_ms:.1f} ms imports, {1000 * wall:.0f} ms wall")
+                loaded = forbidden_loaded(modules, forbidden)
+                if loaded:
+                    failures.append(f"main {flag} loaded {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark Suite
+--------------
+Times the pipeline stages on synthetic data and writes the results as JSON:
+
+    parse.<n>c          parse_pdf_resume on a resume with n companies
+    titles.<n>          parse_alternate_titles_file on n alternate titles
+    match.<n>           match_all_positions_with_alternate_titles against n
+                        titles (stub encoder, no model download)
+    match.<n>.hybrid    hybrid_match on the same positions plus as many copies
+                        of alternate titles (empty match cache; the stub encoder
+                        is nearly free, so this is the cost of the extra tiers)
+    aggregate.<n>       aggregate_experience and the timeline on n work periods
+    chart.<name>        each visualization.save_* function
+    store.<n>.<query>   CandidateStore queries on a database of n candidates
+    dates.<n>           date_ranges.extract_date_ranges on n resume lines
+
+With --baseline, every case is compared with an earlier results file and the
+run fails when a case is slower than the baseline by more than --tolerance.
+
+Usage:
+    python benchmarks/run_suite.py --output bench.json
+    python benchmarks/run_suite.py --baseline bench.json --tolerance 0.25
+    python benchmarks/run_suite.py --quick --only parse titles
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+
+# Version of the results layout
+RESULTS_VERSION = 1
+
+# Case sizes for a full run and for --quick
+SIZES = {
+    'parse': {'full': [5, 20, 80], 'quick': [5, 20]},
+    'titles': {'full': [1000, 10000, 100000, 1000000], 'quick': [1000, 10000]},
+    'match': {'full': [1000, 10000, 100000], 'quick': [1000, 10000]},
+    'aggregate': {'full': [100, 1000, 10000], 'quick': [100, 1000]},
+    'store': {'full': [1000, 20000], 'quick': [1000]},
+    'dates': {'full': [1000000], 'quick': [100000]},
+}
+
+GROUPS = ['parse', 'titles', 'match', 'aggregate', 'charts', 'store', 'dates']
+
+
+def measure(func, repeat):
+    """
+    Call a function several times
+
+    Returns:
+        dict: Median and best time in seconds plus the number of runs
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'seconds': statistics.median(times), 'best': min(times), 'runs': repeat}
+
+
+def bench_parse(workdir, sizes, repeat):
+    from pdf_parser import parse_pdf_resume
+
+    results = {}
+    for n_companies in sizes:
+        path = os.path.join(workdir, f"resume-{n_companies}.pdf")
+        pages = synthetic.write_resume_pdf(path, n_companies)
+        _, _, _, arr, _ = parse_pdf_resume(path)
+        positions = sum(len(item.get('experience', [])) for item in arr)
+        if positions != 2 * n_companies:
+            raise RuntimeError(f"synthetic resume parsed into {positions} positions, expected {2 * n_companies}")
+        results[f"parse.{n_companies}c"] = dict(measure(lambda: parse_pdf_resume(path), repeat), pages=pages)
+    return results
+
+
+def bench_titles(workdir, sizes, repeat):
+    from data_parser import parse_alternate_titles_file
+
+    results = {}
+    for n_rows in sizes:
+        path = os.path.join(workdir, f"titles-{n_rows}.txt")
+        synthetic.write_alternate_titles(path, n_rows)
+        runs = repeat if n_rows < 1000000 else 1
+        results[f"titles.{n_rows}"] = measure(lambda: parse_alternate_titles_file(path), runs)
+    return results
+
+
+def bench_match(workdir, sizes, repeat, n_positions=50):
+    from data_parser import parse_alternate_titles_file
+
+    matching = synthetic.install_stub_encoder()
+    from hybrid_matching import MatchCache, hybrid_match
+
+    rng = random.Random(0)
+    positions = [synthetic.random_title(rng) for _ in range(n_positions)]
+
+    results = {}
+    for n_rows in sizes:
+        path = os.path.join(workdir, f"match-titles-{n_rows}.txt")
+        synthetic.write_alternate_titles(path, n_rows, seed=1)
+        alternate_titles = parse_alternate_titles_file(path)
+
+        # The first call encodes and stores the title embeddings; the timed calls reuse them
+        start = time.perf_counter()
+        matching.match_all_positions_with_alternate_titles(positions, alternate_titles, titles_file=path)
+        cold = time.perf_counter() - start
+        results[f"match.{n_rows}"] = dict(measure(
+            lambda: matching.match_all_positions_with_alternate_titles(positions, alternate_titles, titles_file=path),
+            repeat), cold_seconds=cold, positions=n_positions)
+
+        # Half of the positions are alternate titles, as common titles are in real resumes
+        mixed = positions + [item['alternate_title'] for item in rng.sample(alternate_titles, n_positions)]
+        results[f"match.{n_rows}.hybrid"] = dict(measure(
+            lambda: hybrid_match(mixed, alternate_titles, titles_file=path, cache=MatchCache()), repeat),
+            positions=len(mixed))
+    return results
+
+
+def bench_aggregate(sizes, repeat):
+    from aggregation import aggregate_experience
+    from timeline import covered_months, work_period_intervals
+
+    def run(all_matches, all_work_periods):
+        aggregate_experience(all_matches, all_work_periods)
+        covered_months(work_period_intervals(all_work_periods))
+
+    results = {}
+    for n_periods in sizes:
+        all_matches, all_work_periods = synthetic.work_history(n_periods)
+        results[f"aggregate.{n_periods}"] = measure(lambda: run(all_matches, all_work_periods), repeat)
+    return results
+
+
+def bench_charts(workdir, repeat, n_periods=12):
+    from aggregation import aggregate_experience
+    from chart_renderer import CHARTS, chart_inputs
+
+    all_matches, all_work_periods = synthetic.work_history(n_periods)
+    aggregate = aggregate_experience(all_matches, all_work_periods)
+    occupation_data = {code: {'title': f"Occupation {code}", 'description': ''}
+                       for code in aggregate['onet_months']}
+
+    # The chart functions write under ./web_viewer/static
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import visualization
+
+        results = {}
+        for name, args in chart_inputs(all_matches, all_work_periods, aggregate, occupation_data).items():
+            func = getattr(visualization, CHARTS[name][0])
+            results[f"chart.{name}"] = measure(lambda: func(*args), repeat)
+    finally:
+        os.chdir(previous_dir)
+    return results
+
+
+def bench_store(workdir, sizes, repeat):
+    from candidate_store import CandidateStore
+
+    queries = {
+        'top_experience': dict(sort='total_months'),
+        'onet_min_years': dict(onet_code=synthetic.onet_codes(1)[0], min_months=60, sort='months'),
+        'min_score_page_10': dict(min_score=0.9, sort='score', page=10),
+        'name_prefix': dict(name='Senior Candidate 1', sort='name', order='asc'),
+    }
+    results = {}
+    for n_candidates in sizes:
+        store = CandidateStore(os.path.join(workdir, f"candidates-{n_candidates}.sqlite3"))
+        analyses = [(analysis, None, None) for analysis in synthetic.candidate_analyses(n_candidates)]
+        start = time.perf_counter()
+        store.add_many(analyses)
+        elapsed = time.perf_counter() - start
+        results[f"store.{n_candidates}.insert"] = {'seconds': elapsed, 'best': elapsed, 'runs': 1}
+        for name, query in queries.items():
+            results[f"store.{n_candidates}.{name}"] = measure(lambda: store.query(**query), max(repeat, 5))
+        store.close()
+    return results
+
+
+def bench_dates(sizes, repeat):
+    from date_ranges import extract_date_ranges
+
+    results = {}
+    for n_lines in sizes:
+        lines = synthetic.date_lines(n_lines)
+        results[f"dates.{n_lines}"] = measure(lambda: [extract_date_ranges(line) for line in lines], repeat)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare case times with a baseline results file
+
+    Returns:
+        tuple: ({case: ratio}, list of regressed case names)
+    """
+    ratios, regressions = {}, []
+    for name, entry in results.items():
+        base = baseline.get('cases', {}).get(name)
+        if not base or base['seconds'] <= 0:
+            continue
+        ratio = entry['seconds'] / base['seconds']
+        ratios[name] = ratio
+        if ratio > 1.0 + tolerance:
+            regressions.append(name)
+    return ratios, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=None, help='write the results JSON to this file')
+    parser.add_argument('--baseline', default=None, help='results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (default: 0.25 = 25%%)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case (median is reported)')
+    parser.add_argument('--quick', action='store_true', help='use the small case sizes only')
+    parser.add_argument('--only', nargs='+', choices=GROUPS, default=GROUPS, help='case groups to run')
+    args = parser.parse_args()
+
+    size_key = 'quick' if args.quick else 'full'
+    output = os.path.abspath(args.output) if args.output else None
+    previous_dir = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep the embedding cache and chart output out of the working directory
+        os.chdir(workdir)
+        if 'parse' in args.only:
+            results.update(bench_parse(workdir, SIZES['parse'][size_key], args.repeat))
+        if 'titles' in args.only:
+            results.update(bench_titles(workdir, SIZES['titles'][size_key], args.repeat))
+        if 'match' in args.only:
+            results.update(bench_match(workdir, SIZES['match'][size_key], args.repeat))
+        if 'aggregate' in args.only:
+            results.update(bench_aggregate(SIZES['aggregate'][size_key], args.repeat))
+        if 'charts' in args.only:
+            results.update(bench_charts(workdir, args.repeat))
+        if 'store' in args.only:
+            results.update(bench_store(workdir, SIZES['store'][size_key], args.repeat))
+        if 'dates' in args.only:
+            results.update(bench_dates(SIZES['dates'][size_key], args.repeat))
+        os.chdir(previous_dir)
+
+    report = {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': args.quick,
+        'cases': results,
+    }
+
+    ratios, regressions = {}, []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        ratios, regressions = compare(results, baseline, args.tolerance)
+        report['baseline'] = {'file': args.baseline, 'tolerance': args.tolerance,
+                              'ratios': {name: round(ratio, 3) for name, ratio in ratios.items()},
+                              'regressions': regressions}
+
+    print(f"{'case':<28}{'median ms':>12}{'best ms':>12}{'vs baseline':>14}")
+    for name, entry in results.items():
+        ratio = f"{ratios[name]:.2f}x" if name in ratios else '-'
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f"{name:<28}{1000 * entry['seconds']:>12.2f}{1000 * entry['best']:>12.2f}{ratio:>14}{flag}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+    if regressions:
+        print(f"FAIL: {len(regressions)} case(s) slower than the baseline by more than "
+              f"{100 * args.tolerance:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
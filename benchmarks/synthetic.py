@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic Benchmark Data
+-----------------------
+Generators for the benchmark suite: LinkedIn-style resume PDFs with the
+line heights parse_pdf_resume expects, O*NET alternate title and occupation
+files of any size, matches and work periods for the aggregation and charts,
+and a deterministic stand-in for the S-BERT encoder.
+"""
+
+import hashlib
+import random
+import sys
+import types
+import zlib
+
+import numpy as np
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+
+WORDS = ["Senior", "Junior", "Lead", "Principal", "Staff", "Chief", "Assistant", "Associate",
+         "Software", "Data", "Finance", "Sales", "Marketing", "Operations", "Product", "Project",
+         "Treasury", "Risk", "Support", "Quality", "Network", "Security", "Research", "Clinical",
+         "Engineer", "Analyst", "Manager", "Director", "Specialist", "Consultant", "Officer",
+         "Coordinator", "Architect", "Developer", "Administrator", "Supervisor", "Technician"]
+
+COMPANY_WORDS = ["Global", "United", "First", "Bright", "Blue", "Atlas", "Nova", "Delta", "Prime",
+                 "Systems", "Holdings", "Bank", "Telecom", "Logistics", "Energy", "Labs", "Group"]
+
+# Page geometry of LinkedIn exports (US Letter, sidebar and main column)
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+SIDEBAR_X, MAIN_X, FOOTER_X = 21.6, 223.56, 384.0
+TOP_Y, BOTTOM_Y = 760, 60
+
+# Line heights of LinkedIn exports (the fonts are sized to match them)
+NAME_HEIGHT, SECTION_HEIGHT, CONTACT_HEADING_HEIGHT = 26, 22, 18
+COMPANY_HEIGHT, POSITION_HEIGHT, BODY_HEIGHT, FOOTER_HEIGHT = 17, 16, 15, 13
+
+# pdfminer sizes a Helvetica line by the font bounding box, which is 1.156 em tall
+HELVETICA_BBOX_HEIGHT = 1.156
+
+
+def font_size(height):
+    """Font size whose Helvetica line height rounds to the given height"""
+    return round(height / HELVETICA_BBOX_HEIGHT, 2)
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, pages):
+    """
+    Write a minimal PDF with Helvetica text lines
+
+    Args:
+        path: Output file path
+        pages: List of pages, each a list of (x, y, line height, text) lines
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = add(None)
+    page_ids = []
+    for lines in pages:
+        stream = "".join(f"BT /F1 {font_size(height)} Tf {x:.2f} {y:.2f} Td ({_escape(text)}) Tj ET\n"
+                         for x, y, height, text in lines).encode('latin-1', 'replace')
+        stream = zlib.compress(stream)
+        content_id = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, content_id)))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def random_title(rng, n_words=3):
+    """A random job-title-like phrase"""
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def random_period(rng, current=False):
+    """A "Month Year - Month Year" or "Month Year - Present" date range"""
+    start_year = rng.randint(1995, 2022)
+    start = f"{rng.choice(MONTH_NAMES)} {start_year}"
+    if current:
+        return f"{start} - Present"
+    return f"{start} - {rng.choice(MONTH_NAMES)} {rng.randint(start_year, 2024)}"
+
+
+def resume_lines(n_companies, positions_per_company=2, body_lines=3, seed=0):
+    """
+    Lay out a synthetic LinkedIn-style resume
+
+    The sidebar holds the Contact section (heading 18, lines 15); the main
+    column holds the name, Summary, Experience (company 17, position 16, body
+    15) and Education sections (headings 22).
+
+    Args:
+        n_companies: Number of companies in the Experience section
+        positions_per_company: Positions listed under each company
+        body_lines: Description lines under each position
+        seed: Random seed
+
+    Returns:
+        list: Pages of (x, y, line height, text) lines
+    """
+    rng = random.Random(seed)
+    pages = [[]]
+    y = {'main': TOP_Y, 'side': TOP_Y}
+
+    def put(column, height, text, gap=1.25):
+        if y[column] - height * gap < BOTTOM_Y:
+            if column == 'side':
+                return
+            pages.append([])
+            y['main'] = y['side'] = TOP_Y
+        y[column] -= height * gap
+        pages[-1].append((SIDEBAR_X if column == 'side' else MAIN_X, y[column], height, text))
+
+    put('side', CONTACT_HEADING_HEIGHT, "Contact")
+    put('side', BODY_HEIGHT, "555 0100 (Mobile)")
+    put('side', BODY_HEIGHT, "candidate@example.com")
+    put('side', BODY_HEIGHT, "www.linkedin.com/in/candidate")
+    put('side', BODY_HEIGHT, "(LinkedIn)")
+    put('side', CONTACT_HEADING_HEIGHT, "Top Skills")
+    for _ in range(3):
+        put('side', BODY_HEIGHT, rng.choice(WORDS))
+
+    put('main', NAME_HEIGHT, "Synthetic Candidate")
+    put('main', SECTION_HEIGHT, "Summary", gap=1.6)
+    put('main', BODY_HEIGHT, "Experienced professional in a synthetic benchmark.")
+    put('main', SECTION_HEIGHT, "Experience", gap=1.6)
+    for company_index in range(n_companies):
+        put('main', COMPANY_HEIGHT, f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {company_index}", gap=1.5)
+        for position_index in range(positions_per_company):
+            put('main', POSITION_HEIGHT, random_title(rng))
+            put('main', BODY_HEIGHT, random_period(rng, current=company_index == 0 and position_index == 0))
+            put('main', BODY_HEIGHT, "Istanbul, Turkey")
+            for _ in range(body_lines):
+                put('main', BODY_HEIGHT, " ".join(rng.choice(WORDS).lower() for _ in range(8)))
+    put('main', SECTION_HEIGHT, "Education", gap=1.6)
+    put('main', COMPANY_HEIGHT, "Synthetic University")
+    put('main', BODY_HEIGHT, "Bachelor of Science, Engineering")
+
+    for number, page in enumerate(pages, start=1):
+        page.append((FOOTER_X, 30, FOOTER_HEIGHT, f"Page {number} of {len(pages)}"))
+    return pages
+
+
+def write_resume_pdf(path, n_companies, positions_per_company=2, body_lines=3, seed=0):
+    """
+    Write a synthetic resume PDF
+
+    Returns:
+        int: Number of pages
+    """
+    pages = resume_lines(n_companies, positions_per_company, body_lines, seed)
+    write_pdf(path, pages)
+    return len(pages)
+
+
+def onet_codes(n_codes):
+    """O*NET-SOC style codes (nn-nnnn.nn)"""
+    return [f"{11 + i // 9000 % 89:02d}-{1000 + i % 9000:04d}.00" for i in range(n_codes)]
+
+
+def write_alternate_titles(path, n_rows, n_codes=1000, seed=0):
+    """
+    Write an Alternate_Titles.txt style file
+
+    Args:
+        path: Output file path
+        n_rows: Number of alternate titles
+        n_codes: Number of distinct O*NET-SOC codes
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    codes = onet_codes(n_codes)
+    with open(path, 'w') as f:
+        f.write("O*NET-SOC Code\tTitle\tAlternate Title\tShort Title\tSource(s)\n")
+        for i in range(n_rows):
+            f.write(f"{codes[i % n_codes]}\t{random_title(rng, rng.randint(2, 4))} {i}\tn/a\t08\n")
+
+
+def write_occupation_data(path, n_codes=1000, seed=0):
+    """Write an Occupation_Data.txt style file"""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("O*NET-SOC Code\tTitle\tDescription\n")
+        for code in onet_codes(n_codes):
+            f.write(f"{code}\t{random_title(rng)}s\tPlan, direct, or coordinate {random_title(rng).lower()} work.\n")
+
+
+def work_history(n_periods, n_codes=50, seed=0):
+    """
+    Build matches and work periods shaped like the ones main.main() collects
+
+    Returns:
+        tuple: (all_matches, all_work_periods)
+    """
+    rng = random.Random(seed)
+    codes = onet_codes(n_codes)
+    all_matches, all_work_periods = [], []
+    for i in range(n_periods):
+        position, company = random_title(rng), f"{rng.choice(COMPANY_WORDS)} {i % max(1, n_periods // 3)}"
+        start, end = random_period(rng, current=i == 0).split(" - ")
+        all_work_periods.append({'start': start, 'end': end, 'company': company, 'position': position})
+        all_matches.append({
+            'position': position,
+            'company': company,
+            'match': {'onet_soc_code': rng.choice(codes), 'alternate_title': random_title(rng, 2)},
+            'score': rng.random(),
+        })
+    return all_matches, all_work_periods
+
+
+def candidate_analyses(n_candidates, periods_per_candidate=6, n_codes=200, seed=0):
+    """
+    Build web report dictionaries (output_formatter.build_web_data() layout) for many candidates
+
+    Returns:
+        list: Analysis dictionaries
+    """
+    rng = random.Random(seed)
+    codes = onet_codes(n_codes)
+    analyses = []
+    for i in range(n_candidates):
+        experience = []
+        for _ in range(periods_per_candidate):
+            start, end = random_period(rng).split(" - ")
+            experience.append({
+                'position': random_title(rng),
+                'company': f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)}",
+                'start': start,
+                'end': end,
+                'duration': "N/A",
+                'match': {'alternate_title': random_title(rng, 2), 'onet_soc_code': rng.choice(codes)},
+                'score': round(rng.random(), 4),
+            })
+        total = rng.randint(0, 360)
+        analyses.append({
+            'contact': {'name': f"{rng.choice(WORDS)} Candidate {i}", 'email': f"candidate{i}@example.com",
+                        'phone': "Not Found", 'linkedin': "Not Found"},
+            'experience': experience,
+            'total_experience': {'years': total // 12, 'months': total % 12},
+        })
+    return analyses
+
+
+# Month names used by date_lines() besides the English ones
+LOCALE_MONTH_NAMES = [
+    ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"],
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sept", "Oct", "Nov", "Dec"],
+    ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli", "August", "September", "Oktober",
+     "November", "Dezember"],
+    ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre", "octubre",
+     "noviembre", "diciembre"],
+]
+
+
+def date_lines(n_lines, date_share=0.3, seed=0):
+    """
+    Build resume body lines, date_share of them holding a date range in one of
+    the formats date_ranges.py reads (several locales, numeric, year-only)
+
+    Returns:
+        list: Lines of text
+    """
+    rng = random.Random(seed)
+    present_words = ["Present", "Günümüz", "Current", "heute", "Halen"]
+    lines = []
+    for _ in range(n_lines):
+        if rng.random() >= date_share:
+            lines.append(f"{random_title(rng, 4)} for {rng.choice(COMPANY_WORDS)} clients in {rng.randint(2, 40)} "
+                         f"countries, {rng.randint(5, 95)}% growth")
+            continue
+        start_year = rng.randint(1995, 2022)
+        end_year = rng.randint(start_year, 2024)
+        start_month, end_month = rng.randint(1, 12), rng.randint(1, 12)
+        style = rng.randrange(5)
+        if style == 0:
+            start = f"{MONTH_NAMES[start_month - 1]} {start_year}"
+            end = f"{MONTH_NAMES[end_month - 1]} {end_year}"
+        elif style == 1:
+            names = rng.choice(LOCALE_MONTH_NAMES)
+            start = f"{names[start_month - 1]} {start_year}"
+            end = f"{names[end_month - 1]} {end_year}"
+        elif style == 2:
+            start, end = f"{start_month:02d}/{start_year}", f"{end_month:02d}/{end_year}"
+        elif style == 3:
+            start, end = f"{start_year}-{start_month:02d}", f"{end_year}-{end_month:02d}"
+        else:
+            start, end = str(start_year), str(end_year)
+        if rng.random() < 0.3:
+            end = rng.choice(present_words)
+        lines.append(f"{start} - {end} ({rng.randint(1, 20)} years)")
+    return lines
+
+
+class StubEncoder:
+    """
+    Deterministic bag-of-words hashing encoder with the SentenceTransformer.encode() interface
+    """
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode('utf-8')).hexdigest()[:8], 16) % self.dim] += 1.0
+        return out
+
+
+def install_stub_encoder(dim=384):
+    """
+    Make matching.py use StubEncoder instead of downloading the S-BERT model
+
+    When sentence_transformers is not installed, a placeholder module is
+    registered first so matching.py can still be imported.
+
+    Returns:
+        module: The matching module
+    """
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        placeholder = types.ModuleType('sentence_transformers')
+        placeholder.SentenceTransformer = lambda name: StubEncoder(dim)
+        sys.modules['sentence_transformers'] = placeholder
+
+    import matching
+    matching.sbert_model = StubEncoder(dim)
+    return matching
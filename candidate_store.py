@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Candidate Store Module
+---------------------
+SQLite storage for many analysed resumes, with indexed queries by O*NET
+code, experience, match score and name for the web API.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from date_utils import split_months
+from timeline import covered_months, period_interval
+
+
+# Default location of the candidate database
+DEFAULT_STORE_PATH = os.path.join("data", "candidates.sqlite3")
+
+# Columns the query results can be sorted by
+SORT_COLUMNS = {
+    'total_months': 'c.total_months',
+    'score': 'c.best_score',
+    'name': 'c.name COLLATE NOCASE',
+    'created': 'c.created',
+}
+
+# Largest page size the query accepts
+MAX_PER_PAGE = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT UNIQUE,
+    source_file TEXT,
+    name TEXT,
+    email TEXT,
+    total_months INTEGER NOT NULL,
+    best_score REAL,
+    created REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidate_occupations (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    onet_soc_code TEXT NOT NULL,
+    months INTEGER NOT NULL,
+    best_score REAL,
+    PRIMARY KEY (candidate_id, onet_soc_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_candidates_total_months ON candidates(total_months);
+CREATE INDEX IF NOT EXISTS idx_candidates_best_score ON candidates(best_score);
+CREATE INDEX IF NOT EXISTS idx_candidates_name ON candidates(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_occupations_code_months ON candidate_occupations(onet_soc_code, months);
+CREATE INDEX IF NOT EXISTS idx_occupations_code_score ON candidate_occupations(onet_soc_code, best_score);
+"""
+
+
+def occupation_totals(web_data):
+    """
+    Get the elapsed months and best match score per O*NET code of an analysis
+
+    Args:
+        web_data: Analysis dictionary from output_formatter.build_web_data()
+
+    Returns:
+        dict: O*NET-SOC code -> {'months', 'best_score'}
+    """
+    intervals, scores = {}, {}
+    for exp in web_data.get('experience', []):
+        match = exp.get('match')
+        if not match:
+            continue
+        code = match['onet_soc_code']
+        interval = period_interval(exp['start'], exp['end'])
+        intervals.setdefault(code, [])
+        if interval is not None:
+            intervals[code].append(interval)
+        if exp.get('score') is not None:
+            scores[code] = max(scores.get(code, exp['score']), exp['score'])
+    return {code: {'months': covered_months(code_intervals), 'best_score': scores.get(code)}
+            for code, code_intervals in intervals.items()}
+
+
+class CandidateStore:
+    """
+    SQLite database of analysed resumes (one connection per thread)
+    """
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def add(self, web_data, source_file=None, source_key=None):
+        """
+        Store an analysis, replacing an earlier one with the same source key
+
+        Args:
+            web_data: Analysis dictionary from output_formatter.build_web_data()
+            source_file: Optional path of the analysed PDF
+            source_key: Optional unique key of the source (e.g. the PDF's SHA-256)
+
+        Returns:
+            int: Candidate id
+        """
+        return self.add_many([(web_data, source_file, source_key)])[0]
+
+    def add_many(self, analyses):
+        """
+        Store many analyses in a single transaction
+
+        Args:
+            analyses: List of (web_data, source_file, source_key) tuples
+
+        Returns:
+            list: Candidate ids in input order
+        """
+        conn = self._connection()
+        candidate_ids = []
+        with conn:
+            for web_data, source_file, source_key in analyses:
+                candidate_ids.append(self._insert(conn, web_data, source_file, source_key))
+        return candidate_ids
+
+    def _insert(self, conn, web_data, source_file, source_key):
+        total = web_data.get('total_experience', {})
+        total_months = total.get('years', 0) * 12 + total.get('months', 0)
+        occupations = occupation_totals(web_data)
+        scores = [entry['best_score'] for entry in occupations.values() if entry['best_score'] is not None]
+        contact = web_data.get('contact', {})
+
+        if source_key is not None:
+            conn.execute("DELETE FROM candidates WHERE source_key = ?", (source_key,))
+        cursor = conn.execute(
+            "INSERT INTO candidates (source_key, source_file, name, email, total_months, best_score, created, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (source_key, source_file, contact.get('name'), contact.get('email'), total_months,
+             max(scores) if scores else None, time.time(), json.dumps(web_data, ensure_ascii=False)))
+        candidate_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO candidate_occupations (candidate_id, onet_soc_code, months, best_score) VALUES (?, ?, ?, ?)",
+            [(candidate_id, code, entry['months'], entry['best_score']) for code, entry in occupations.items()])
+        return candidate_id
+
+    def get(self, candidate_id):
+        """
+        Get a stored analysis
+
+        Args:
+            candidate_id: Candidate id
+
+        Returns:
+            dict or None: Candidate summary plus the full 'data', or None if not found
+        """
+        row = self._connection().execute(
+            "SELECT id, source_file, name, email, total_months, best_score, created, data FROM candidates WHERE id = ?",
+            (candidate_id,)).fetchone()
+        if row is None:
+            return None
+        result = _summary(row)
+        result['data'] = json.loads(row['data'])
+        result['occupations'] = [
+            {'onet_soc_code': code, 'months': months, 'best_score': score}
+            for code, months, score in self._connection().execute(
+                "SELECT onet_soc_code, months, best_score FROM candidate_occupations "
+                "WHERE candidate_id = ? ORDER BY months DESC", (candidate_id,))
+        ]
+        return result
+
+    def query(self, onet_code=None, min_months=None, min_score=None, name=None, sort='total_months',
+              order='desc', page=1, per_page=20):
+        """
+        Find candidates with filtering, sorting and pagination
+
+        With onet_code, min_months and min_score apply to the experience and
+        best match score in that occupation, and the 'months' and 'score'
+        fields of each result are those of the occupation.
+
+        Args:
+            onet_code: Optional O*NET-SOC code the candidates must have experience in
+            min_months: Optional minimum experience in months
+            min_score: Optional minimum match score
+            name: Optional case-insensitive name prefix
+            sort: 'total_months', 'score', 'name' or 'created' ('months' and
+                'score' use the occupation's values when onet_code is given)
+            order: 'asc' or 'desc'
+            page: Page number, starting at 1
+            per_page: Results per page (at most MAX_PER_PAGE)
+
+        Returns:
+            dict: 'total', 'page', 'per_page' and the 'results' of the page
+        """
+        if sort not in SORT_COLUMNS and sort != 'months':
+            raise ValueError(f"Unknown sort column: {sort} (choose from months, {', '.join(SORT_COLUMNS)})")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        page = max(1, int(page))
+        per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+
+        where, params = [], []
+        if onet_code:
+            source = "candidates c JOIN candidate_occupations o ON o.candidate_id = c.id"
+            where.append("o.onet_soc_code = ?")
+            params.append(onet_code)
+            months_column, score_column, id_column = "o.months", "o.best_score", "o.candidate_id"
+        else:
+            source = "candidates c"
+            months_column, score_column, id_column = "c.total_months", "c.best_score", "c.id"
+        if min_months is not None:
+            where.append(f"{months_column} >= ?")
+            params.append(int(min_months))
+        if min_score is not None:
+            where.append(f"{score_column} >= ?")
+            params.append(float(min_score))
+        if name:
+            # Prefix range so the NOCASE name index can be used
+            where.append("c.name >= ? COLLATE NOCASE AND c.name < ? COLLATE NOCASE")
+            params.extend([name, name + '\U0010ffff'])
+
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+        if sort in ('months', 'total_months'):
+            sort_column = months_column
+        elif sort == 'score':
+            sort_column = score_column
+        else:
+            sort_column = SORT_COLUMNS[sort]
+
+        conn = self._connection()
+        total = conn.execute(f"SELECT COUNT(*) FROM {source}{where_sql}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT c.id, c.source_file, c.name, c.email, c.total_months, c.best_score, c.created, "
+            f"{months_column} AS months, {score_column} AS score "
+            f"FROM {source}{where_sql} ORDER BY {sort_column} {order.upper()}, {id_column} {order.upper()} "
+            f"LIMIT ? OFFSET ?", params + [per_page, (page - 1) * per_page]).fetchall()
+
+        results = []
+        for row in rows:
+            result = _summary(row)
+            result['months'] = row['months']
+            result['score'] = row['score']
+            results.append(result)
+        return {'total': total, 'page': page, 'per_page': per_page, 'results': results}
+
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _summary(row):
+    years, months = split_months(row['total_months'])
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'email': row['email'],
+        'source_file': row['source_file'],
+        'total_experience': {'years': years, 'months': months},
+        'best_score': row['best_score'],
+        'created': row['created'],
+    }
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chart Renderer Module
+--------------------
+Renders the report charts in a process pool. Each chart's input data is
+fingerprinted, and charts whose data and output files are unchanged since
+the last run are skipped.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import date
+from multiprocessing import Pool
+
+from metrics import count, record_stage
+
+
+# Bump when a chart function changes so old fingerprints no longer match
+RENDERER_VERSION = 1
+
+# Chart name -> (visualization function name, output files relative to web_viewer/static)
+CHARTS = {
+    'similarity': ('save_similarity_scores_bar', ['charts/similarity.png']),
+    'position_durations': ('save_position_durations_bar', ['charts/position_durations.png']),
+    'onet_experience': ('save_onet_experience_pie', ['charts/onet_experience.png']),
+    'matched_titles': ('save_matched_titles_pie', ['charts/matched_titles_pie.png']),
+    'position_titles': ('save_position_titles_pie', ['charts/position_titles_pie.png']),
+    'matched_plotly': ('save_matched_titles_pie_plotly', ['charts_html/matched.html']),
+    'company_plotly': ('save_company_durations_pie_plotly', ['charts_html/company.html']),
+    'onet_plotly': ('save_onet_experience_pie_plotly', ['charts_html/onet.html']),
+    'career_plotly': ('save_career_timeline_plotly', ['charts_html/career.html']),
+}
+
+# Charts that draw "Present" periods up to today, so their fingerprint includes the date
+DATE_DEPENDENT_CHARTS = {'career_plotly'}
+
+# Folder the chart paths in CHARTS are relative to
+STATIC_DIR = os.path.join("web_viewer", "static")
+
+# Chart files worth compressing (PNG is already compressed)
+PRECOMPRESS_EXTENSIONS = ('.html', '.js')
+
+# File that stores the fingerprint and output file stats of each rendered chart
+FINGERPRINT_FILE = os.path.join(STATIC_DIR, "chart_fingerprints.json")
+
+
+def chart_inputs(all_matches, all_work_periods, aggregate, occupation_data):
+    """
+    Build the arguments of every chart function
+
+    Charts built from the aggregate only get the totals they draw, so a chart
+    is re-rendered only when its own data changes.
+
+    Args:
+        all_matches: List of match dictionaries
+        all_work_periods: List of work period dictionaries
+        aggregate: Result of aggregation.aggregate_experience()
+        occupation_data: O*NET-SOC code -> occupation dictionary
+
+    Returns:
+        dict: Chart name -> tuple of arguments
+    """
+    onet_titles = {code: {'title': occupation_data[code]['title']}
+                   for code in aggregate['onet_months'] if code in occupation_data}
+    return {
+        'similarity': (all_matches,),
+        'position_durations': (all_work_periods,),
+        'onet_experience': ({'onet_months': aggregate['onet_months']},),
+        'matched_titles': ({'title_months': aggregate['title_months']},),
+        'position_titles': ({'position_months': aggregate['position_months']},),
+        'matched_plotly': ({'title_months': aggregate['title_months']},),
+        'company_plotly': ({'company_months': aggregate['company_months']},),
+        'onet_plotly': ({'onet_months': aggregate['onet_months']}, onet_titles),
+        'career_plotly': (all_work_periods,),
+    }
+
+
+def _canonical(value):
+    # JSON-friendly copy that keeps dict order, since the order changes the charts
+    if isinstance(value, dict):
+        return [[_canonical(key), _canonical(item)] for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def chart_fingerprint(name, args):
+    """
+    Fingerprint a chart's input data
+
+    Args:
+        name: Chart name (key of CHARTS)
+        args: Tuple of arguments passed to the chart function
+
+    Returns:
+        str: Hex digest of the chart name, renderer version and arguments
+    """
+    today = date.today().isoformat() if name in DATE_DEPENDENT_CHARTS else None
+    payload = json.dumps([RENDERER_VERSION, name, CHARTS[name][0], today, _canonical(args)],
+                         ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _output_stats(name):
+    # (path, size, mtime_ns) of every output file of the chart that exists
+    stats = []
+    for relative_path in CHARTS[name][1]:
+        path = os.path.join(STATIC_DIR, relative_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats.append([relative_path, st.st_size, st.st_mtime_ns])
+    return stats
+
+
+def _load_fingerprints():
+    try:
+        with open(FINGERPRINT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_fingerprints(fingerprints):
+    os.makedirs(os.path.dirname(FINGERPRINT_FILE), exist_ok=True)
+    tmp_path = f"{FINGERPRINT_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(fingerprints, f, indent=2)
+    os.replace(tmp_path, FINGERPRINT_FILE)
+
+
+def precompress(path):
+    """
+    Write gzip (and brotli, when installed) copies of a file for the web viewer
+
+    The copies are written next to the file as path.gz and path.br.
+
+    Args:
+        path: File to compress
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    try:
+        import brotli
+        variants.append(('.br', lambda: brotli.compress(data)))
+    except ImportError:
+        pass
+
+    for suffix, compress in variants:
+        tmp_path = f"{path}{suffix}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(compress())
+        os.replace(tmp_path, path + suffix)
+
+
+def _precompress_outputs(name):
+    for relative_path in CHARTS[name][1]:
+        path = os.path.join(STATIC_DIR, relative_path)
+        if path.endswith(PRECOMPRESS_EXTENSIONS) and os.path.exists(path):
+            precompress(path)
+
+
+def ensure_plotlyjs(html_dir):
+    """
+    Write the shared plotly.min.js bundle (and its compressed copies) next to the HTML charts if missing
+
+    Args:
+        html_dir: Folder of the Plotly HTML charts
+    """
+    path = os.path.join(html_dir, "plotly.min.js")
+    if os.path.exists(path):
+        if not os.path.exists(path + '.gz'):
+            precompress(path)
+        return
+    from plotly.offline import get_plotlyjs
+
+    os.makedirs(html_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    os.replace(tmp_path, path)
+    precompress(path)
+
+
+def render_chart_worker(job):
+    """
+    Render one chart in a worker process
+
+    Args:
+        job: (chart name, arguments) tuple
+
+    Returns:
+        dict: Chart name, render time and error message
+    """
+    import visualization
+
+    name, args = job
+    start = time.perf_counter()
+    try:
+        getattr(visualization, CHARTS[name][0])(*args)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {'name': name, 'seconds': time.perf_counter() - start, 'error': error}
+
+
+def render_charts(chart_args, workers=None, force=False):
+    """
+    Render charts in parallel, skipping charts whose input data hasn't changed
+
+    Args:
+        chart_args: Dict of chart name -> tuple of arguments for its chart function
+        workers: Number of worker processes (default: one per chart, at most the CPU count)
+        force: Render every chart even if its fingerprint matches
+
+    Returns:
+        dict: Chart name -> {'seconds', 'skipped', 'error'}, in CHARTS order
+    """
+    import visualization
+
+    fingerprints = _load_fingerprints()
+    jobs, timings = [], {}
+    for name, args in chart_args.items():
+        fingerprint = chart_fingerprint(name, args)
+        previous = fingerprints.get(name)
+        if (not force and previous and previous['fingerprint'] == fingerprint
+                and previous['outputs'] == _output_stats(name)):
+            timings[name] = {'seconds': 0.0, 'skipped': True, 'error': None}
+            count('charts_skipped')
+        else:
+            fingerprints[name] = {'fingerprint': fingerprint}
+            jobs.append((name, args))
+
+    if jobs:
+        ensure_plotlyjs(visualization.HTML_CHART_DIR)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        if workers == 1:
+            results = [render_chart_worker(job) for job in jobs]
+        else:
+            with Pool(processes=workers) as pool:
+                results = pool.map(render_chart_worker, jobs)
+
+        for result in results:
+            name = result['name']
+            timings[name] = {'seconds': result['seconds'], 'skipped': False, 'error': result['error']}
+            record_stage(f"chart.{name}", result['seconds'])
+            count('charts_rendered')
+            if result['error']:
+                fingerprints.pop(name, None)
+            else:
+                _precompress_outputs(name)
+                fingerprints[name]['outputs'] = _output_stats(name)
+
+        _save_fingerprints(fingerprints)
+
+    return {name: timings[name] for name in CHARTS if name in timings}
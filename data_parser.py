@@ -7,6 +7,22 @@ Data Parser Module
 Functions for parsing occupation and title data files.
 """
 
+import hashlib
+import os
+import pickle
+
+from metrics import timed
+
+
+# Prefixes that mark where the source column starts in an alternate titles line
+SOURCE_PREFIXES = ("n/a", "CEO", "CAO", "CFO", "CIO", "CNO", "COO", "CTO", "EVP", "Hospital")
+
+# Snapshot format version; bump it when the parsed structures change
+SNAPSHOT_VERSION = 1
+
+# Loaded snapshots, keyed by snapshot path
+loaded_snapshots = {}
+
 
 def parse_alternate_titles_file(file_path):
     """
@@ -41,10 +57,7 @@ def parse_alternate_titles_file(file_path):
             # Extract the source
             source_index = -1
             for i, part in enumerate(parts):
-                if part.startswith("n/a") or part.startswith("CEO") or part.startswith("CAO") or \
-                   part.startswith("CFO") or part.startswith("CIO") or part.startswith("CNO") or \
-                   part.startswith("COO") or part.startswith("CTO") or part.startswith("EVP") or \
-                   part.startswith("Hospital"):
+                if part.startswith(SOURCE_PREFIXES):
                     source_index = i
                     break
             
@@ -84,7 +97,7 @@ def parse_occupation_data_file(file_path):
         
         current_code = None
         current_title = None
-        current_description = ""
+        description_parts = []
         
         for line in f:
             line = line.strip()
@@ -97,7 +110,7 @@ def parse_occupation_data_file(file_path):
                 if current_code:
                     occupation_data[current_code] = {
                         'title': current_title,
-                        'description': current_description.strip()
+                        'description': " ".join(description_parts).strip()
                     }
                 
                 # Extract the new code and title
@@ -108,18 +121,18 @@ def parse_occupation_data_file(file_path):
                     
                     # Initialize description - it might be on this line or subsequent lines
                     if len(parts) >= 3:
-                        current_description = parts[2].strip()
+                        description_parts = [parts[2].strip()]
                     else:
-                        current_description = ""
+                        description_parts = [""]
             else:
                 # This is a continuation of the description
-                current_description += " " + line
+                description_parts.append(line)
         
         # Don't forget to save the last entry
         if current_code:
             occupation_data[current_code] = {
                 'title': current_title,
-                'description': current_description.strip()
+                'description': " ".join(description_parts).strip()
             }
     
     return occupation_data
@@ -145,4 +158,152 @@ def find_primary_occupation(alternate_title_item, occupation_data):
             'description': occupation_data[onet_code]['description']
         }
     
-    return None
\ No newline at end of file
+    return None
+
+
+def default_snapshot_path(alternate_titles_path):
+    """
+    Get the default snapshot location, next to the alternate titles file
+    
+    Args:
+        alternate_titles_path: Path to the Alternate Titles.txt file
+    
+    Returns:
+        str: Path of the snapshot file
+    """
+    return os.path.join(os.path.dirname(alternate_titles_path), 'onet_snapshot.pkl')
+
+
+def _source_fingerprint(file_path, with_hash=True):
+    """
+    Describe a source file by size, modification time and (optionally) content hash
+    """
+    stat = os.stat(file_path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        with open(file_path, 'rb') as f:
+            fingerprint['sha256'] = hashlib.sha256(f.read()).hexdigest()
+    return fingerprint
+
+
+def _snapshot_is_current(header, sources):
+    """
+    Check that the snapshot was compiled from the current source files.
+    A matching size and mtime is trusted; otherwise the content hash decides.
+    """
+    if header.get('version') != SNAPSHOT_VERSION:
+        return False
+    for name, file_path in sources.items():
+        recorded = header['sources'].get(name)
+        if recorded is None:
+            return False
+        current = _source_fingerprint(file_path, with_hash=False)
+        if current['size'] != recorded['size']:
+            return False
+        if current['mtime_ns'] != recorded['mtime_ns']:
+            if _source_fingerprint(file_path)['sha256'] != recorded['sha256']:
+                return False
+            # Same content with a new mtime; remember it so the hash isn't recomputed
+            recorded['mtime_ns'] = current['mtime_ns']
+    return True
+
+
+@timed('load_onet.compile')
+def compile_onet_snapshot(alternate_titles_path, occupation_data_path, snapshot_path=None):
+    """
+    Parse both O*NET files and save them as one binary snapshot
+    
+    Args:
+        alternate_titles_path: Path to the Alternate Titles.txt file
+        occupation_data_path: Path to the Occupation Data.txt file
+        snapshot_path: Output path (default: onet_snapshot.pkl next to the titles file)
+    
+    Returns:
+        dict: Snapshot with 'alternate_titles' and 'occupation_data'
+    """
+    if snapshot_path is None:
+        snapshot_path = default_snapshot_path(alternate_titles_path)
+
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'sources': {
+            'alternate_titles': _source_fingerprint(alternate_titles_path),
+            'occupation_data': _source_fingerprint(occupation_data_path),
+        },
+    }
+    snapshot = {
+        'alternate_titles': parse_alternate_titles_file(alternate_titles_path),
+        'occupation_data': parse_occupation_data_file(occupation_data_path),
+    }
+
+    # The header is pickled separately so staleness can be checked without loading the data
+    directory = os.path.dirname(snapshot_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+    loaded_snapshots[snapshot_path] = (header, snapshot)
+    return snapshot
+
+
+@timed('load_onet')
+def load_onet_data(alternate_titles_path, occupation_data_path=None, snapshot_path=None):
+    """
+    Load the parsed O*NET data from the snapshot, compiling it first if it is
+    missing or older than the source files. Loaded data is kept for reuse and
+    re-checked against the source files (size and mtime) on every call.
+    
+    Args:
+        alternate_titles_path: Path to the Alternate Titles.txt file
+        occupation_data_path: Path to the Occupation Data.txt file
+            (default: Occupation_Data.txt next to the titles file)
+        snapshot_path: Snapshot path (default: onet_snapshot.pkl next to the titles file)
+    
+    Returns:
+        tuple: (alternate_titles, occupation_data) as returned by the parse functions
+    """
+    if occupation_data_path is None:
+        occupation_data_path = os.path.join(os.path.dirname(alternate_titles_path), 'Occupation_Data.txt')
+    if snapshot_path is None:
+        snapshot_path = default_snapshot_path(alternate_titles_path)
+    sources = {'alternate_titles': alternate_titles_path, 'occupation_data': occupation_data_path}
+
+    snapshot = None
+    if snapshot_path in loaded_snapshots:
+        header, snapshot = loaded_snapshots[snapshot_path]
+        if not _snapshot_is_current(header, sources):
+            snapshot = None
+    else:
+        try:
+            with open(snapshot_path, 'rb') as f:
+                header = pickle.load(f)
+                if _snapshot_is_current(header, sources):
+                    snapshot = pickle.load(f)
+                    loaded_snapshots[snapshot_path] = (header, snapshot)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError):
+            snapshot = None
+
+    if snapshot is None:
+        snapshot = compile_onet_snapshot(alternate_titles_path, occupation_data_path, snapshot_path)
+
+    return snapshot['alternate_titles'], snapshot['occupation_data']
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the O*NET text files into a binary snapshot")
+    parser.add_argument('command', choices=['compile'])
+    parser.add_argument('--titles', default='./data/Alternate_Titles.txt', help='alternate titles file')
+    parser.add_argument('--occupations', default='./data/Occupation_Data.txt', help='occupation data file')
+    parser.add_argument('--output', default=None, help='snapshot path (default: next to the titles file)')
+    args = parser.parse_args()
+
+    compiled = compile_onet_snapshot(args.titles, args.occupations, args.output)
+    print(f"Compiled {len(compiled['alternate_titles'])} alternate titles and "
+          f"{len(compiled['occupation_data'])} occupations into "
+          f"{args.output or default_snapshot_path(args.titles)}")
\ No newline at end of file
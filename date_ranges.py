@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Date Ranges Module
+-----------------
+Finds employment date ranges in resume text with one precompiled regular
+expression and returns them as month ordinals. Recognised forms:
+
+    June 2019 - Present         full or abbreviated month names ("Sept. 2019")
+    Haziran 2019 - Günümüz      Turkish, German, French, Spanish, Italian,
+                                Portuguese and Dutch month names
+    06/2019 - 2021-03           numeric months (MM/YYYY, MM.YYYY, YYYY-MM)
+    2015 - 2018                 years only (January of the start year to
+                                December of the end year)
+
+The end can also be a "still there" word (Present, Current, Günümüz, Halen,
+heute, actualidad, ...). The separator is a hyphen or dash, or "to"/"until".
+
+Numeric and year-only ranges also turn up in descriptions ("Led the migration
+2018-2019", phone numbers), so with numeric=False they only count in a line
+that holds nothing but date ranges and a parenthesized duration.
+"""
+
+import re
+import unicodedata
+
+from date_utils import month_ordinal
+from timeline import format_month
+
+
+# Month names and abbreviations per month number (matched case-insensitively, with or without accents)
+MONTH_ALIASES = {
+    1: ["January", "Jan", "Ocak", "Oca", "Januar", "Janvier", "Janv", "Enero", "Ene", "Gennaio", "Gen",
+        "Janeiro", "Januari"],
+    2: ["February", "Feb", "Şubat", "Şub", "Februar", "Février", "Févr", "Fév", "Febrero", "Febbraio",
+        "Fevereiro", "Fev", "Februari"],
+    3: ["March", "Mar", "Mart", "März", "Mär", "Mars", "Marzo", "Março", "Maart", "Mrt"],
+    4: ["April", "Apr", "Nisan", "Nis", "Avril", "Avr", "Abril", "Abr", "Aprile"],
+    5: ["May", "Mayıs", "Mai", "Mayo", "Maggio", "Mag", "Maio", "Mei"],
+    6: ["June", "Jun", "Haziran", "Haz", "Juni", "Juin", "Junio", "Giugno", "Giu", "Junho"],
+    7: ["July", "Jul", "Temmuz", "Tem", "Juli", "Juillet", "Juil", "Julio", "Luglio", "Lug", "Julho"],
+    8: ["August", "Aug", "Ağustos", "Ağu", "Août", "Agosto", "Ago", "Augustus"],
+    9: ["September", "Sept", "Sep", "Eylül", "Eyl", "Septembre", "Septiembre", "Setiembre", "Settembre",
+        "Set", "Setembro"],
+    10: ["October", "Oct", "Ekim", "Eki", "Oktober", "Okt", "Octobre", "Octubre", "Ottobre", "Ott",
+         "Outubro", "Out"],
+    11: ["November", "Nov", "Kasım", "Kas", "Novembre", "Noviembre", "Novembro"],
+    12: ["December", "Dec", "Aralık", "Ara", "Dezember", "Dez", "Décembre", "Déc", "Diciembre", "Dic",
+         "Dicembre", "Dezembro"],
+}
+
+# Words for a range that has not ended
+PRESENT_WORDS = ["Present", "Current", "Currently", "Now", "Today", "Ongoing", "Günümüz", "Halen", "Hâlâ",
+                 "Hala", "Şu an", "Devam ediyor", "Heute", "Aktuell", "Aujourd'hui", "Actuel", "Présent",
+                 "Actualidad", "Actualmente", "Presente", "Atual", "Oggi", "Heden"]
+
+
+def fold(text):
+    """
+    Lower-case a word and strip its accents (Şubat -> subat, MAYIS -> mayis)
+
+    Args:
+        text: Word
+
+    Returns:
+        str: Folded word
+    """
+    text = text.replace('ı', 'i').replace('İ', 'i')
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+# Folded name -> month number
+MONTH_NUMBERS = {fold(name): number for number, names in MONTH_ALIASES.items() for name in names}
+
+
+def _alternation(words):
+    # Every spelling (accented, folded, upper case) of the words, longest first
+    variants = set()
+    for word in words:
+        variants.update({word, fold(word), word.upper(), fold(word).upper()})
+    return '|'.join(re.escape(variant).replace(r'\ ', r'\s+')
+                    for variant in sorted(variants, key=lambda variant: (-len(variant), variant)))
+
+
+_YEAR = r'(?:19|20)\d{2}(?!\d)'
+_MONTH_NUMBER = r'(?:0?[1-9]|1[0-2])'
+# Any word; month names are checked against MONTH_NUMBERS after the match, which is much
+# faster than trying every spelling of every month at each position
+_MONTH_WORD = r'[^\W\d_]{3,10}'
+
+
+def _date(prefix):
+    # One date of a range; the group names carry the side ('s' start, 'e' end)
+    return (rf'(?:(?P<{prefix}name>{_MONTH_WORD})\.?,?\s+(?P<{prefix}year>{_YEAR})'
+            rf'|(?P<{prefix}num>{_MONTH_NUMBER})[./-](?P<{prefix}numyear>{_YEAR})'
+            rf'|(?P<{prefix}isoyear>{_YEAR})[./-](?P<{prefix}iso>{_MONTH_NUMBER})(?![\d./-])'
+            rf'|(?P<{prefix}onlyyear>{_YEAR}))')
+
+
+# Any date range, in a single alternation
+DATE_RANGE_REGEX = re.compile(
+    rf'(?<![\w/.-]){_date("s")}(?:\s*[-–—]\s*|\s+(?:to|until|till)\s+)'
+    rf'(?:{_date("e")}|(?P<present>{_alternation(PRESENT_WORDS)}))(?!\w)',
+    re.IGNORECASE)
+
+# Lines without a year cannot hold a range and skip the full expression
+YEAR_REGEX = re.compile(r'(?:19|20)\d{2}')
+
+# Parenthesized text such as the "(5 years 2 months)" after a range
+PARENTHESIZED_REGEX = re.compile(r'\([^)]*\)')
+
+
+def _ordinal(groups, prefix, is_end):
+    # Month ordinal of one side of a match, or None if its month word is not a month name
+    name = groups[f'{prefix}name']
+    if name:
+        month = MONTH_NUMBERS.get(fold(name))
+        return month_ordinal(int(groups[f'{prefix}year']), month) if month else None
+    if groups[f'{prefix}num']:
+        return month_ordinal(int(groups[f'{prefix}numyear']), int(groups[f'{prefix}num']))
+    if groups[f'{prefix}iso']:
+        return month_ordinal(int(groups[f'{prefix}isoyear']), int(groups[f'{prefix}iso']))
+    # A bare year covers the whole year
+    return month_ordinal(int(groups[f'{prefix}onlyyear']), 12 if is_end else 1)
+
+
+def _find_ranges(text):
+    # (start, end, written with month names, span) per date range of a line
+    found = []
+    if not YEAR_REGEX.search(text):
+        return found
+    position = 0
+    while True:
+        match = DATE_RANGE_REGEX.search(text, position)
+        if match is None:
+            return found
+        groups = match.groupdict()
+        start = _ordinal(groups, 's', is_end=False)
+        end = None if groups['present'] else _ordinal(groups, 'e', is_end=True)
+        if start is None or (end is None and not groups['present']):
+            # A word that is not a month ("Summer 2019"); look again from the next character
+            position = match.start() + 1
+            continue
+        named = bool(groups['sname']) and bool(groups['present'] or groups['ename'])
+        found.append((start, end, named, match.span()))
+        position = match.end()
+
+
+def _is_date_row(text, spans):
+    # True if nothing but punctuation and parenthesized text is left once the ranges are removed
+    rest, position = [], 0
+    for span_start, span_end in spans:
+        rest.append(text[position:span_start])
+        position = span_end
+    rest.append(text[position:])
+    return not any(char.isalnum() for char in PARENTHESIZED_REGEX.sub('', ''.join(rest)))
+
+
+def extract_date_ranges(text, numeric=True):
+    """
+    Find the date ranges in a line of text
+
+    Args:
+        text: Line of text
+        numeric: Accept numeric and year-only ranges anywhere in the line; with
+            False they only count when the line holds nothing but date ranges
+            (and parenthesized text), while month name ranges count anywhere
+
+    Returns:
+        list: (start, end) month ordinals per range; end is the last month
+            (inclusive), or None for a range that has not ended
+    """
+    found = _find_ranges(text)
+    if not numeric and not all(named for _, _, named, _ in found):
+        if not _is_date_row(text, [span for _, _, _, span in found]):
+            found = [item for item in found if item[2]]
+    return [(start, end) for start, end, _, _ in found]
+
+
+def date_periods(text, date_row=False):
+    """
+    Find the date ranges in a line of text as "Month Year" strings, the
+    'date_period' format of the parsed experience array
+
+    Args:
+        text: Line of text
+        date_row: The line has the 'date' role (see styles.py), so numeric and
+            year-only ranges count anywhere in it
+
+    Returns:
+        list: (start, end, status) tuples such as ("June 2019", "", "Present")
+            or ("May 2003", "June 2004", "")
+    """
+    return [(format_month(start), '', 'Present') if end is None else (format_month(start), format_month(end), '')
+            for start, end in extract_date_ranges(text, numeric=date_row)]
@@ -7,7 +7,9 @@ Date Utilities Module
 Functions for handling dates and calculating durations in resume analysis.
 """
 
+import time
 from datetime import datetime
+from functools import lru_cache
 
 # Month names to numbers mapping
 MONTHS = {
@@ -16,67 +18,183 @@ MONTHS = {
 }
 
 
-def calculate_duration(start_date, end_date):
+def month_ordinal(year, month):
     """
-    Calculate the duration between two dates in years and months
+    Convert a year and month to a single integer month count
     
     Args:
-        start_date (str): Start date in "Month Year" format (e.g., "June 2019")
-        end_date (str): End date in "Month Year" format or "Present"
+        year (int): Year
+        month (int): Month number (1-12)
     
     Returns:
-        str: Duration in "X years Y months" format or None if inputs are invalid
+        int: Months since year 0 (e.g. June 2019 -> 24233)
     """
-    # Parse start date
-    start_parts = start_date.split()
-    if len(start_parts) != 2:
+    return year * 12 + (month - 1)
+
+
+# Cached (expiry time, month ordinal) of the current month
+_current_month = (0.0, 0)
+
+
+def current_month_ordinal():
+    """
+    Get the month ordinal of the current month (re-read from the clock once a minute)
+    
+    Returns:
+        int: Month ordinal for today's month
+    """
+    global _current_month
+    expires, ordinal = _current_month
+    if time.time() >= expires:
+        now = datetime.now()
+        ordinal = month_ordinal(now.year, now.month)
+        _current_month = (time.time() + 60.0, ordinal)
+    return ordinal
+
+
+@lru_cache(maxsize=4096)
+def parse_month_year(date_str):
+    """
+    Parse a "Month Year" string into a month ordinal (results are memoized)
+    
+    Args:
+        date_str (str): Date in "Month Year" format (e.g., "June 2019")
+    
+    Returns:
+        int: Month ordinal, or None if the string is not a valid date
+    """
+    parts = date_str.split()
+    if len(parts) != 2:
         return None
-    start_month = MONTHS.get(start_parts[0])
-    if not start_month:
+    month = MONTHS.get(parts[0])
+    if not month:
         return None
     try:
-        start_year = int(start_parts[1])
+        year = int(parts[1])
     except ValueError:
         return None
+    return month_ordinal(year, month)
+
+
+def duration_months(start_date, end_date, now=None):
+    """
+    Calculate the number of months between two dates
+    
+    The end month is counted as worked, except for "Present" which ends at
+    the current month.
     
-    # Parse end date
+    Args:
+        start_date (str): Start date in "Month Year" format (e.g., "June 2019")
+        end_date (str): End date in "Month Year" format or "Present"
+        now (int): Optional month ordinal to use for "Present" (default: current month)
+    
+    Returns:
+        int: Duration in months or None if inputs are invalid
+    """
+    start = parse_month_year(start_date)
+    if start is None:
+        return None
+
     if end_date == "Present":
-        now = datetime.now()
-        end_month = now.month
-        end_year = now.year
+        end = current_month_ordinal() if now is None else now
     else:
-        end_parts = end_date.split()
-        if len(end_parts) != 2:
-            return None
-        end_month = MONTHS.get(end_parts[0])
-        if not end_month:
+        end = parse_month_year(end_date)
+        if end is None:
             return None
-        try:
-            end_year = int(end_parts[1])
-        except ValueError:
-            return None
-        
-        # Add one month to end date if it's not "Present"
-        # This change makes the calculation inclusive of the end month
-        end_month += 1
-        if end_month > 12:
-            end_month = 1
-            end_year += 1
+        # Make the calculation inclusive of the end month
+        end += 1
+
+    return end - start
+
+
+def format_duration(total_months):
+    """
+    Format a number of months as a duration string
     
-    # Calculate total months
-    total_months = (end_year - start_year) * 12 + (end_month - start_month)
+    Args:
+        total_months (int): Duration in months
     
-    # Convert to years and months
+    Returns:
+        str: Duration in "X years Y months" format
+    """
     years = total_months // 12
     remaining_months = total_months % 12
-    
-    # Format the duration
+
     if remaining_months == 0:
         return f"{years} year{'s' if years != 1 else ''}"
     else:
         return f"{years} year{'s' if years != 1 else ''} {remaining_months} month{'s' if remaining_months != 1 else ''}"
 
 
+def split_months(total_months):
+    """
+    Split a number of months into years and months
+    
+    Args:
+        total_months (int): Duration in months
+    
+    Returns:
+        tuple: (years, months)
+    """
+    return total_months // 12, total_months % 12
+
+
+def duration_months_array(start_dates, end_dates, now=None):
+    """
+    Vectorized duration_months for arrays of periods
+    
+    Each distinct date string is parsed once; the arithmetic runs on NumPy arrays.
+    
+    Args:
+        start_dates: Sequence of start dates in "Month Year" format
+        end_dates: Sequence of end dates in "Month Year" format or "Present"
+        now (int): Optional month ordinal to use for "Present" (default: current month)
+    
+    Returns:
+        tuple: (months, valid) - int64 durations and a boolean mask of valid periods
+    """
+    import numpy as np
+
+    if now is None:
+        now = current_month_ordinal()
+
+    def ordinals(values):
+        # Returns (ordinals, is_valid, is_present) arrays
+        values = np.asarray(values, dtype=object).astype(str)
+        unique, inverse = np.unique(values, return_inverse=True)
+        parsed = [parse_month_year(value) for value in unique]
+        is_present = unique == "Present"
+        is_valid = np.array([value is not None for value in parsed], dtype=bool)
+        result = np.array([value if value is not None else 0 for value in parsed], dtype=np.int64)
+        inverse = inverse.reshape(-1)
+        return result[inverse], is_valid[inverse], is_present[inverse]
+
+    start, start_valid, _ = ordinals(start_dates)
+    end, end_valid, end_present = ordinals(end_dates)
+
+    valid = start_valid & (end_valid | end_present)
+    end = np.where(end_present, now, end + 1)
+    months = np.where(valid, end - start, 0)
+    return months, valid
+
+
+def calculate_duration(start_date, end_date):
+    """
+    Calculate the duration between two dates in years and months
+    
+    Args:
+        start_date (str): Start date in "Month Year" format (e.g., "June 2019")
+        end_date (str): End date in "Month Year" format or "Present"
+    
+    Returns:
+        str: Duration in "X years Y months" format or None if inputs are invalid
+    """
+    months = duration_months(start_date, end_date)
+    if months is None:
+        return None
+    return format_duration(months)
+
+
 def calculate_total_experience_direct(all_durations):
     """
     Calculate total experience by directly summing duration strings
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Embedding Store Module
+---------------------
+Build-once, memory-mapped storage for alternate title embeddings.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+
+# Default folder where embedding matrices are stored
+DEFAULT_CACHE_DIR = os.path.join("cache", "embeddings")
+
+# File digests, keyed by path and validated by size and mtime
+_file_digests = {}
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """
+    Calculate the SHA-256 hash of a file's content
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Number of bytes to read at a time
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(file_path):
+    """
+    Get the SHA-256 of a file, hashing it again only when its size or mtime changed
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        str: Hex digest, or None if the file does not exist
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _file_digests.get(file_path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, file_sha256(file_path))
+        _file_digests[file_path] = cached
+    return cached[1]
+
+
+class EmbeddingStore:
+    """
+    Float32 embedding matrix saved as a .npy file and keyed by the content hash
+    of the source titles file plus the model name
+    """
+    def __init__(self, source_file, model_name, cache_dir=DEFAULT_CACHE_DIR):
+        self.source_file = source_file
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self._key = None
+        self._embeddings = None
+
+    @property
+    def key(self):
+        """Cache key built from the source file hash and the model name"""
+        if self._key is None:
+            digest = hashlib.sha256()
+            digest.update(file_sha256(self.source_file).encode('ascii'))
+            digest.update(self.model_name.encode('utf-8'))
+            self._key = digest.hexdigest()[:24]
+        return self._key
+
+    @property
+    def path(self):
+        """Path of the .npy file for the current key"""
+        base = os.path.splitext(os.path.basename(self.source_file))[0]
+        return os.path.join(self.cache_dir, f"{base}-{self.key}.npy")
+
+    def load(self, encode_fn, expected_rows=None):
+        """
+        Load the embedding matrix, encoding and saving it first if needed
+
+        Args:
+            encode_fn: Function with no arguments that returns the embeddings
+            expected_rows: Optional number of rows the matrix must have
+
+        Returns:
+            numpy.ndarray: Memory-mapped float32 matrix (titles x dimensions)
+        """
+        if self._embeddings is not None:
+            return self._embeddings
+
+        path = self.path
+        embeddings = None
+        if os.path.exists(path):
+            try:
+                embeddings = np.load(path, mmap_mode='r')
+            except (OSError, ValueError):
+                embeddings = None
+            if embeddings is not None and expected_rows is not None and embeddings.shape[0] != expected_rows:
+                embeddings = None
+
+        if embeddings is None:
+            matrix = np.ascontiguousarray(encode_fn(), dtype=np.float32)
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Write to a temporary file first so a crash never leaves a broken cache
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+            embeddings = np.load(path, mmap_mode='r')
+
+        self._embeddings = embeddings
+        return embeddings
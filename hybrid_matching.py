@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Hybrid Matching Module
+---------------------
+Tiered title matching in front of matching.match_all_positions_with_alternate_titles:
+
+    1. cache     position -> match results shared by every resume in the process
+    2. exact     the normalized position is an alternate title (score 1.0)
+    3. lexical   character trigram TF-IDF cosine of at least LEXICAL_THRESHOLD
+                 against an alternate title (the score is that cosine)
+    4. semantic  S-BERT embeddings, only for the positions left over
+
+Tiers 2 and 3 answer top_n=1 requests only; with more matches per position
+every uncached position goes to the embeddings. When every position is
+answered by the first three tiers the S-BERT model is never loaded.
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from embedding_store import file_digest
+from metrics import count, stage
+
+
+# Minimum trigram cosine for a lexical match
+LEXICAL_THRESHOLD = 0.8
+
+# Length of the character n-grams of the lexical index
+NGRAM_SIZE = 3
+
+# Settings that change which tier answers a position; stored match results are keyed by them
+TIER_SETTINGS = {'exact': True, 'lexical_threshold': LEXICAL_THRESHOLD, 'ngram_size': NGRAM_SIZE}
+
+# Largest number of positions the shared match cache keeps
+DEFAULT_CACHE_ENTRIES = 100000
+
+# Lexical indexes, keyed by alternate titles file path (with the file digest they were built from)
+lexical_indexes = {}
+
+
+# Characters that separate the words of a title; '#', '+' and '.' followed by a
+# letter or digit are part of a word ("C#", "C++", "ASP.NET", ".NET")
+TITLE_SEPARATOR_REGEX = re.compile(r'[^\w#+.]|_|\.(?!\w)')
+
+
+def normalize_title(title):
+    """
+    Normalize a title for exact comparison: case-folded, accents and
+    separators removed, whitespace collapsed
+
+    Args:
+        title: Title text
+
+    Returns:
+        str: Normalized title
+    """
+    decomposed = unicodedata.normalize('NFKD', title.casefold())
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(TITLE_SEPARATOR_REGEX.sub(' ', text).split())
+
+
+def char_ngrams(text, n=NGRAM_SIZE):
+    """
+    Get the character n-grams of a normalized title (padded with one space on each side)
+
+    Args:
+        text: Normalized title
+        n: N-gram length
+
+    Returns:
+        list: N-grams
+    """
+    padded = f" {text} "
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+class LexicalTitleIndex:
+    """
+    Exact (normalized string) and character n-gram TF-IDF indexes over the
+    alternate titles. The n-gram postings are only built the first time a
+    position has no exact match.
+    """
+    def __init__(self, alternate_titles, ngram_size=NGRAM_SIZE):
+        self.ngram_size = ngram_size
+        self.titles = [normalize_title(item['alternate_title']) for item in alternate_titles]
+        self.exact = {}
+        for title_id, title in enumerate(self.titles):
+            self.exact.setdefault(title, title_id)
+        self._postings = None
+        self._build_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.titles)
+
+    def exact_match(self, position):
+        """
+        Find an alternate title equal to a position after normalization
+
+        Args:
+            position: Position title
+
+        Returns:
+            int or None: Index of the first such alternate title
+        """
+        return self.exact.get(normalize_title(position))
+
+    def _build(self):
+        # Sparse TF-IDF matrix stored as postings: for every n-gram, the titles holding it and their weights
+        gram_ids = {}
+        rows, cols, counts = [], [], []
+        for title_id, title in enumerate(self.titles):
+            for gram, n in Counter(char_ngrams(title, self.ngram_size)).items():
+                rows.append(title_id)
+                cols.append(gram_ids.setdefault(gram, len(gram_ids)))
+                counts.append(n)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        n_titles, n_grams = len(self.titles), len(gram_ids)
+        idf = np.log((1.0 + n_titles) / (1.0 + np.bincount(cols, minlength=n_grams))) + 1.0
+        weights = (1.0 + np.log(np.asarray(counts, dtype=np.float64))) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_titles))
+        weights /= norms[rows]
+
+        order = np.argsort(cols, kind='stable')
+        starts = np.zeros(n_grams + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=n_grams), out=starts[1:])
+        self._postings = {
+            'gram_ids': gram_ids,
+            'idf': idf,
+            'unseen_idf': math.log(1.0 + n_titles) + 1.0,
+            'starts': starts,
+            'titles': rows[order],
+            'weights': weights[order],
+        }
+
+    def nearest(self, position):
+        """
+        Find the alternate title with the highest n-gram TF-IDF cosine
+
+        Args:
+            position: Position title
+
+        Returns:
+            tuple: (title index, cosine), or (None, 0.0) if no n-gram is shared
+        """
+        if self._postings is None:
+            with self._build_lock:
+                if self._postings is None:
+                    with stage('lexical_index'):
+                        self._build()
+        postings = self._postings
+
+        query = Counter(char_ngrams(normalize_title(position), self.ngram_size))
+        title_parts, weight_parts = [], []
+        query_norm = 0.0
+        for gram, n in query.items():
+            gram_id = postings['gram_ids'].get(gram)
+            idf = postings['unseen_idf'] if gram_id is None else postings['idf'][gram_id]
+            weight = (1.0 + math.log(n)) * idf
+            query_norm += weight * weight
+            if gram_id is not None:
+                start, end = postings['starts'][gram_id], postings['starts'][gram_id + 1]
+                title_parts.append(postings['titles'][start:end])
+                weight_parts.append(postings['weights'][start:end] * weight)
+        if not title_parts:
+            return None, 0.0
+
+        scores = np.bincount(np.concatenate(title_parts), weights=np.concatenate(weight_parts),
+                             minlength=len(self.titles))
+        # argmax keeps the first title on ties, like title_search.top_k
+        title_id = int(np.argmax(scores))
+        return title_id, float(scores[title_id] / math.sqrt(query_norm))
+
+
+def get_lexical_index(alternate_titles, titles_file=None):
+    """
+    Get the lexical index of the alternate titles, reusing the one built for the same file
+
+    Args:
+        alternate_titles: List of alternate title dictionaries
+        titles_file: Optional path of the alternate titles file
+
+    Returns:
+        LexicalTitleIndex: The index
+    """
+    if titles_file is None:
+        return LexicalTitleIndex(alternate_titles)
+
+    digest = file_digest(titles_file)
+    cached = lexical_indexes.get(titles_file)
+    if cached is None or cached[0] != digest or len(cached[1]) != len(alternate_titles):
+        cached = (digest, LexicalTitleIndex(alternate_titles))
+        lexical_indexes[titles_file] = cached
+    return cached[1]
+
+
+class MatchCache:
+    """
+    Thread-safe LRU cache of position -> match results
+    """
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Get cached match results
+
+        Args:
+            key: Cache key
+
+        Returns:
+            list or None: (alternate title dict, score) tuples, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Store match results, dropping the least recently used entries past max_entries
+
+        Args:
+            key: Cache key
+            value: (alternate title dict, score) tuples
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Get the cache size and hit counts
+
+        Returns:
+            dict: 'entries', 'max_entries', 'hits' and 'misses'
+        """
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+# Match cache shared by every hybrid_match() call of the process
+DEFAULT_MATCH_CACHE = MatchCache()
+
+
+def hybrid_match(positions, alternate_titles, top_n=1, titles_file=None, backend='exact', cache=None,
+                 lexical_threshold=LEXICAL_THRESHOLD):
+    """
+    Match positions with alternate titles, using the embeddings only for the
+    positions the cache, exact and lexical tiers cannot answer
+
+    Args:
+        positions: List of position titles to match
+        alternate_titles: List of alternate title dictionaries
+        top_n: Number of top matches to return for each position (default: 1)
+        titles_file: Optional path of the alternate titles file; required for the
+            shared cache, and lets the title embeddings and indexes be reused
+        backend: Search backend name for the embeddings: 'exact' or 'ivf'
+        cache: MatchCache (default: DEFAULT_MATCH_CACHE)
+        lexical_threshold: Minimum trigram cosine of a lexical match (above 1 disables the tier)
+
+    Returns:
+        dict: Position -> list of (alternate title dict, score) tuples
+    """
+    cache = DEFAULT_MATCH_CACHE if cache is None else cache
+    scope = None
+    if titles_file is not None:
+        scope = (file_digest(titles_file), backend, top_n, lexical_threshold)
+
+    position_matches = {}
+    residue = []
+    index = None
+    for position in dict.fromkeys(positions):
+        if scope is not None:
+            cached = cache.get((scope, position))
+            if cached is not None:
+                position_matches[position] = cached
+                count('match_cache_hits')
+                continue
+
+        if top_n == 1 and normalize_title(position):
+            if index is None:
+                index = get_lexical_index(alternate_titles, titles_file)
+            title_id = index.exact_match(position)
+            if title_id is not None:
+                position_matches[position] = [(alternate_titles[title_id], 1.0)]
+                count('matches_exact')
+                continue
+            if lexical_threshold <= 1.0:
+                title_id, score = index.nearest(position)
+                if title_id is not None and score >= lexical_threshold:
+                    position_matches[position] = [(alternate_titles[title_id], score)]
+                    count('matches_lexical')
+                    continue
+        residue.append(position)
+
+    if residue:
+        from matching import match_all_positions_with_alternate_titles
+
+        count('matches_semantic', len(residue))
+        position_matches.update(match_all_positions_with_alternate_titles(
+            residue, alternate_titles, top_n=top_n, titles_file=titles_file, backend=backend))
+
+    if scope is not None:
+        for position, matches in position_matches.items():
+            cache.put((scope, position), matches)
+    return position_matches
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Incremental Analysis Module
+--------------------------
+Runs the pipeline as a chain of stages whose outputs are stored on disk,
+keyed by a fingerprint of their inputs:
+
+    parse      PDF content, parser version, style rules
+    match      the resume's positions, alternate titles file, matcher tier settings
+    aggregate  parse and match keys, occupation data file, current month
+    report     aggregate key (the text report and data_output.json)
+
+A re-run executes only the stages whose fingerprint changed and the stages
+after them. After an O*NET update, for example, the parse stage is loaded
+from disk and only matching and aggregation run again.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+from date_utils import current_month_ordinal
+from embedding_store import file_digest
+from metrics import count
+from parse_cache import DEFAULT_MAX_BYTES
+
+
+# Default folder of the stored stage outputs
+DEFAULT_STAGE_DIR = os.path.join("cache", "stages")
+
+# Stages in dependency order
+STAGES = ('parse', 'match', 'aggregate', 'report')
+
+# Bump when a stage's logic changes so its stored outputs (and everything after it) are recomputed.
+# 'match' must also be bumped when matching.SBERT_MODEL_NAME or the tiers of hybrid_matching change.
+# hybrid_matching.TIER_SETTINGS are part of the match key, so changing them re-runs the stage.
+STAGE_VERSIONS = {'parse': 4, 'match': 3, 'aggregate': 3, 'report': 1}
+
+def stage_key(stage_name, *inputs):
+    """
+    Fingerprint a stage's inputs
+
+    Args:
+        stage_name: Stage name
+        *inputs: JSON-serialisable inputs (upstream keys, file digests, settings)
+
+    Returns:
+        str: Hex key
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([stage_name, STAGE_VERSIONS[stage_name], list(inputs)],
+                             sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Stores stage outputs as pickle files under cache_dir/<stage>/<key>.pkl and
+    records which key produced each output file. The least recently used
+    entries are removed when the folder grows past max_bytes.
+    """
+    def __init__(self, cache_dir=DEFAULT_STAGE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.outputs_path = os.path.join(cache_dir, 'outputs.json')
+
+    def _path(self, stage_name, key):
+        return os.path.join(self.cache_dir, stage_name, f"{key}.pkl")
+
+    def get(self, stage_name, key):
+        """
+        Load a stored stage output
+
+        Returns:
+            tuple: (True, output) on a hit, (False, None) on a miss
+        """
+        path = self._path(stage_name, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return False, None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, value
+
+    def put(self, stage_name, key, value):
+        """
+        Store a stage output and evict old entries if the cache is over its size limit
+        """
+        path = self._path(stage_name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used outputs until the cache fits in max_bytes
+        """
+        entries = []
+        total = 0
+        for stage_name in STAGES:
+            directory = os.path.join(self.cache_dir, stage_name)
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.is_file() and entry.name.endswith('.pkl'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def _load_outputs(self):
+        try:
+            with open(self.outputs_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def output_is_current(self, file_path, key):
+        """
+        Check that an output file was written from the given key and not modified since
+
+        Args:
+            file_path: Output file path
+            key: Stage key the file should have been written from
+
+        Returns:
+            bool: True if the file can be kept
+        """
+        recorded = self._load_outputs().get(os.path.abspath(file_path))
+        if recorded is None or recorded['key'] != key:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return recorded['size'] == stat.st_size and recorded['mtime_ns'] == stat.st_mtime_ns
+
+    def record_output(self, file_path, key):
+        """
+        Remember the key an output file was written from
+
+        Args:
+            file_path: Output file path
+            key: Stage key
+        """
+        outputs = self._load_outputs()
+        stat = os.stat(file_path)
+        outputs[os.path.abspath(file_path)] = {'key': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.outputs_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(outputs, f, indent=4)
+        os.replace(tmp_path, self.outputs_path)
+
+
+def analyse_incremental(resume_file, parse_only=False, titles_file=None, occupation_file=None, cache=None,
+                        stage_cache=None, force=()):
+    """
+    Run pipeline.analyse_resume() stage by stage, reusing stored stage outputs
+
+    Args:
+        resume_file: Path to the resume PDF file
+        parse_only: Skip title matching
+        titles_file: Path to the alternate titles file (default: pipeline.ALTERNATE_TITLES_PATH)
+        occupation_file: Path to the occupation data file (default: pipeline.OCCUPATION_DATA_PATH)
+        cache: Optional parse_cache.ParseCache used when the parse stage runs
+        stage_cache: StageCache (default: one in DEFAULT_STAGE_DIR)
+        force: Stage names to run even if stored; the stages after them run too
+
+    Returns:
+        tuple: (pipeline.AnalysisResult, {stage name: 'cached' or 'run'}, report stage key)
+    """
+    import pipeline
+    from data_parser import load_onet_data
+    from hybrid_matching import TIER_SETTINGS
+    from pdf_parser import PARSER_VERSION
+    from styles import rules_fingerprint
+
+    titles_file = titles_file or pipeline.ALTERNATE_TITLES_PATH
+    occupation_file = occupation_file or pipeline.OCCUPATION_DATA_PATH
+    stage_cache = stage_cache or StageCache()
+    first_forced = min((STAGES.index(name) for name in force), default=len(STAGES))
+    statuses = {}
+
+    def run_stage(stage_name, key, compute):
+        if STAGES.index(stage_name) < first_forced:
+            hit, value = stage_cache.get(stage_name, key)
+            if hit:
+                statuses[stage_name] = 'cached'
+                count('stage_cache_hits')
+                return value
+        value = compute()
+        stage_cache.put(stage_name, key, value)
+        statuses[stage_name] = 'run'
+        count('stage_cache_misses')
+        return value
+
+    parse_key = stage_key('parse', PARSER_VERSION, rules_fingerprint(), file_digest(resume_file))
+    parsed = run_stage('parse', parse_key, lambda: pipeline.parse_resume(resume_file, cache=cache))
+
+    match_key = None
+    position_matches = {}
+    if not parse_only:
+        match_key = stage_key('match', pipeline.unique_positions(parsed['arr']), file_digest(titles_file),
+                              TIER_SETTINGS)
+        position_matches = run_stage('match', match_key, lambda: pipeline.match_resume(parsed, titles_file))
+
+    # "Present" periods grow every month, so the current month is an input of the totals
+    aggregate_key = stage_key('aggregate', parse_key, match_key, parse_only, current_month_ordinal(),
+                              None if parse_only else file_digest(occupation_file))
+    # Only the per-resume totals are stored; the parsed resume, the matches and the
+    # shared O*NET occupation data are attached again from their own sources
+    fields = run_stage('aggregate', aggregate_key, lambda: pipeline.aggregate_resume(
+        resume_file, parsed, position_matches, parse_only=parse_only, titles_file=titles_file,
+        occupation_file=occupation_file).aggregate_fields())
+    occupation_data = {} if parse_only else load_onet_data(titles_file, occupation_file)[1]
+    # The key covers the PDF content, not its path
+    result = pipeline.AnalysisResult(resume_file, parse_only, parsed['df_1'], parsed['df_0'], parsed['arr'],
+                                     parsed['arr_co'], occupation_data, position_matches, **fields)
+
+    return result, statuses, stage_key('report', aggregate_key)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Job Queue Module
+---------------
+Bounded background queue that analyses uploaded resumes in worker processes,
+so the web server threads only save the upload and return a job id. Each
+dispatcher thread owns one worker process; a job that runs past the timeout
+has its worker terminated and replaced.
+
+    jobs = JobQueue(workers=2, max_pending=16)
+    job = jobs.submit('uploads/abc.pdf', 'resume.pdf')    # raises QueueFull when busy
+    jobs.get(job['id'])                                   # status, timings, result
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+# Job states; a job ends in 'done' or 'error'
+QUEUED, RUNNING, DONE, ERROR = 'queued', 'running', 'done', 'error'
+FINISHED_STATES = (DONE, ERROR)
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit() when max_pending jobs are already waiting"""
+
+
+def analyse_resume(pdf_path, titles_file, store_path, source_name=None):
+    """
+    Run the parse -> match -> total experience pipeline on one PDF and store the result
+
+    Runs in a worker process. The title matching goes through the match
+    server when it is running (see match_server.py).
+
+    Args:
+        pdf_path: Path to the uploaded PDF
+        titles_file: Path to the alternate titles file
+        store_path: Candidate database the analysis is added to
+        source_name: Original file name of the upload
+
+    Returns:
+        dict: Candidate id, positions, total experience and the metrics of the run
+    """
+    from batch import collect_positions, total_experience
+    from candidate_store import CandidateStore
+    from embedding_store import file_sha256
+    from match_server import match_positions
+    from metrics import collect, count, stage
+    from output_formatter import build_web_data
+    from parse_cache import ParseCache
+    from pdf_parser import parse_pdf_resume
+
+    with collect() as run_metrics:
+        _, _, _, arr, arr_co = parse_pdf_resume(pdf_path, cache=ParseCache())
+        positions = collect_positions(arr)
+        count('positions', len(positions))
+        with stage('match'):
+            position_matches = match_positions(sorted(set(positions)), titles_file=titles_file, top_n=1)
+        with stage('aggregate'):
+            years, months = total_experience(arr)
+            web_data = build_web_data(arr, arr_co, position_matches, (years, months))
+        with stage('store'):
+            store = CandidateStore(store_path)
+            candidate_id = store.add(web_data, source_file=source_name or pdf_path,
+                                     source_key=file_sha256(pdf_path))
+            store.close()
+
+    return {
+        'candidate_id': candidate_id,
+        'positions': len(positions),
+        'total_experience': {'years': years, 'months': months},
+        'metrics': run_metrics.to_dict(),
+    }
+
+
+def _new_worker():
+    # The web server is multi-threaded, so the worker is spawned rather than forked
+    return multiprocessing.get_context('spawn').Pool(processes=1)
+
+
+class JobQueue:
+    """
+    Bounded job queue served by dispatcher threads that hand each job to their
+    own worker process and record its status and timings
+    """
+    def __init__(self, titles_file='./data/Alternate_Titles.txt', store_path=None, workers=2, max_pending=16,
+                 job_timeout=300, max_finished=1000):
+        from candidate_store import DEFAULT_STORE_PATH
+
+        self.titles_file = titles_file
+        self.store_path = store_path or DEFAULT_STORE_PATH
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.max_finished = max_finished
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._jobs = OrderedDict()
+        self._changed = threading.Condition()
+        self._started = False
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self._dispatch, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, pdf_path, source_name=None):
+        """
+        Queue a PDF for analysis
+
+        Args:
+            pdf_path: Path of the saved upload (deleted once the job finishes)
+            source_name: Original file name of the upload
+
+        Returns:
+            dict: Snapshot of the new job
+
+        Raises:
+            QueueFull: When max_pending jobs are already waiting
+        """
+        self._start()
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': QUEUED,
+            'file': source_name or os.path.basename(pdf_path),
+            'path': pdf_path,
+            'submitted': time.time(),
+            'started': None,
+            'finished': None,
+            'queue_seconds': None,
+            'run_seconds': None,
+            'result': None,
+            'error': None,
+            'version': 0,
+        }
+        with self._changed:
+            try:
+                self._pending.put_nowait(job['id'])
+            except queue.Full:
+                raise QueueFull(f"{self._pending.maxsize} jobs are already waiting")
+            self._jobs[job['id']] = job
+            return self._snapshot(job)
+
+    def _dispatch(self):
+        worker = _new_worker()
+        while True:
+            job_id = self._pending.get()
+            with self._changed:
+                job = self._jobs[job_id]
+                self._update(job, status=RUNNING, started=time.time(),
+                             queue_seconds=round(time.time() - job['submitted'], 4))
+            start = time.perf_counter()
+            try:
+                result = worker.apply_async(
+                    analyse_resume, (job['path'], self.titles_file, self.store_path, job['file'])
+                ).get(self.job_timeout)
+                changes = {'status': DONE, 'result': result}
+            except multiprocessing.TimeoutError:
+                # Kill the stuck worker and wait for it to exit before its upload is deleted
+                worker.terminate()
+                worker.join()
+                worker = _new_worker()
+                changes = {'status': ERROR, 'error': f"timed out after {self.job_timeout}s"}
+            except Exception as e:
+                changes = {'status': ERROR, 'error': f"{type(e).__name__}: {e}"}
+            finally:
+                try:
+                    os.remove(job['path'])
+                except OSError:
+                    pass
+            with self._changed:
+                self._update(job, finished=time.time(), run_seconds=round(time.perf_counter() - start, 4), **changes)
+                self._evict()
+
+    def _update(self, job, **changes):
+        # Called with self._changed held
+        job.update(changes)
+        job['version'] += 1
+        self._changed.notify_all()
+
+    def _evict(self):
+        # Forget the oldest finished jobs beyond max_finished (called with self._changed held)
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _snapshot(job):
+        return {key: value for key, value in job.items() if key != 'path'}
+
+    def get(self, job_id):
+        """
+        Get a job's status, timings and result
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            dict or None: Snapshot of the job, or None if it is unknown
+        """
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def wait(self, job_id, version=-1, timeout=15.0):
+        """
+        Wait until a job changes past the given version
+
+        Args:
+            job_id: Job id
+            version: Last version the caller has seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            dict or None: Snapshot of the job (unchanged if the wait timed out), or None if it is unknown
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: job_id not in self._jobs or self._jobs[job_id]['version'] > version,
+                                   timeout)
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def stats(self):
+        """
+        Get the queue depth and job counts
+
+        Returns:
+            dict: Waiting jobs, queue capacity, workers and job counts per status
+        """
+        with self._changed:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'pending': self._pending.qsize(), 'max_pending': self._pending.maxsize,
+                'workers': self.workers, 'jobs': counts}
@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Match Server Module
+------------------
+Long-running localhost HTTP service that keeps the S-BERT model and the
+alternate title embeddings loaded, plus a client that falls back to
+in-process matching when the service is not running. Matching goes through
+hybrid_matching.hybrid_match(), so the server's match cache is shared by
+every client.
+
+Usage:
+    python match_server.py --port 8765 --titles ./data/Alternate_Titles.txt
+
+Endpoints:
+    POST /match   {"positions": [...], "top_n": 1, "titles_digest": "<sha256>"}
+    GET  /health
+
+The server reloads its alternate titles file when the file changes. A request
+whose titles_digest differs from the server's titles is answered with 409, and
+the client then matches in-process against its own file.
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from embedding_store import file_digest
+
+
+# Default location of the alternate titles file
+DEFAULT_TITLES_FILE = './data/Alternate_Titles.txt'
+
+# Address of the match server; set RESUME_MATCH_SERVER to an empty string to disable it
+DEFAULT_SERVER_URL = os.environ.get('RESUME_MATCH_SERVER', 'http://127.0.0.1:8765')
+
+
+class TitlesMismatch(Exception):
+    """Raised when a request was made for other alternate titles than the server has loaded"""
+
+
+class _PendingRequest:
+    """A match request waiting to be served by the batching thread"""
+    def __init__(self, positions, top_n, titles_digest=None):
+        self.positions = positions
+        self.top_n = top_n
+        self.titles_digest = titles_digest
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MatchService:
+    """
+    Serves match requests from a single background thread. Requests that
+    arrive within batch_window seconds of each other are merged into one
+    encode call.
+    """
+    def __init__(self, titles_file=DEFAULT_TITLES_FILE, backend='exact', batch_window=0.005,
+                 max_batch_positions=1024):
+        from data_parser import load_onet_data
+
+        self.titles_file = titles_file
+        self.backend = backend
+        self.batch_window = batch_window
+        self.max_batch_positions = max_batch_positions
+        self.titles_digest = file_digest(titles_file)
+        self.alternate_titles, _ = load_onet_data(titles_file)
+        self.stats = {'requests': 0, 'batches': 0, 'positions': 0, 'reloads': 0}
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='match-batcher', daemon=True)
+        self._thread.start()
+
+    def warm_up(self):
+        """Load the model, title embeddings, search backend and lexical index before serving requests"""
+        from hybrid_matching import get_lexical_index
+        from matching import get_sbert_model, get_search_engine
+
+        get_sbert_model()
+        get_search_engine(self.alternate_titles, self.titles_file, self.backend)
+        get_lexical_index(self.alternate_titles, self.titles_file).nearest('warm up')
+
+    def reload_if_changed(self):
+        """
+        Reload the alternate titles when their file changed since they were loaded
+
+        Returns:
+            bool: True if the titles were reloaded
+        """
+        from data_parser import load_onet_data
+
+        digest = file_digest(self.titles_file)
+        if digest == self.titles_digest:
+            return False
+        self.alternate_titles, _ = load_onet_data(self.titles_file)
+        self.titles_digest = digest
+        self.stats['reloads'] += 1
+        return True
+
+    def match(self, positions, top_n=1, timeout=None, titles_digest=None):
+        """
+        Match positions with alternate titles, sharing the encode call with concurrent callers
+
+        Args:
+            positions: List of position titles
+            top_n: Number of matches per position
+            timeout: Optional number of seconds to wait for the result
+            titles_digest: Optional SHA-256 of the alternate titles file the caller expects
+
+        Returns:
+            dict: Position -> list of (alternate title dict, score) tuples
+
+        Raises:
+            TitlesMismatch: When titles_digest differs from the server's titles
+        """
+        request = _PendingRequest(list(positions), top_n, titles_digest)
+        if not request.positions:
+            return {}
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("Match request timed out")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self):
+        from hybrid_matching import hybrid_match
+
+        while True:
+            batch = [self._queue.get()]
+            n_positions = len(batch[0].positions)
+
+            # Collect more requests for a short window so they share one encode call
+            deadline = time.monotonic() + self.batch_window
+            while n_positions < self.max_batch_positions:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                n_positions += len(request.positions)
+
+            # Pick up an updated titles file; the matching caches check the file digest themselves
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            for request in batch:
+                if request.titles_digest is not None and request.titles_digest != self.titles_digest:
+                    request.error = TitlesMismatch("the match server has a different alternate titles file loaded")
+            served = [request for request in batch if request.error is None]
+
+            unique_positions = list(dict.fromkeys(p for request in served for p in request.positions))
+            try:
+                if served:
+                    matches = hybrid_match(unique_positions, self.alternate_titles,
+                                           top_n=max(request.top_n for request in served),
+                                           titles_file=self.titles_file, backend=self.backend)
+                    for request in served:
+                        request.result = {p: matches[p][:request.top_n] for p in request.positions}
+            except Exception as e:
+                for request in served:
+                    request.error = e
+
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['positions'] += len(unique_positions)
+            for request in batch:
+                request.done.set()
+
+
+class _MatchHTTPServer(ThreadingHTTPServer):
+    # Allow bursts of concurrent clients to queue instead of being refused
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def _make_handler(service):
+    class MatchRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            from hybrid_matching import DEFAULT_MATCH_CACHE
+
+            if self.path != '/health':
+                self._send_json(404, {'error': 'not found'})
+                return
+            self._send_json(200, {'status': 'ok', 'titles': len(service.alternate_titles),
+                                  'titles_digest': service.titles_digest, 'backend': service.backend, 'match_cache': DEFAULT_MATCH_CACHE.stats(),
+                                  **service.stats})
+
+        def do_POST(self):
+            if self.path != '/match':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                positions = payload['positions']
+                top_n = int(payload.get('top_n', 1))
+                titles_digest = payload.get('titles_digest')
+                if not isinstance(positions, list) or not all(isinstance(p, str) for p in positions):
+                    raise ValueError("positions must be a list of strings")
+                if titles_digest is not None and not isinstance(titles_digest, str):
+                    raise ValueError("titles_digest must be a string")
+            except (KeyError, ValueError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+
+            try:
+                matches = service.match(positions, top_n=top_n, titles_digest=titles_digest)
+            except TitlesMismatch as e:
+                self._send_json(409, {'error': str(e), 'titles_digest': service.titles_digest})
+                return
+            except Exception as e:
+                self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+            self._send_json(200, {'matches': {
+                position: [{'match': match, 'score': float(score)} for match, score in pairs]
+                for position, pairs in matches.items()
+            }})
+
+        def log_message(self, format, *args):
+            pass
+
+    return MatchRequestHandler
+
+
+def serve(host='127.0.0.1', port=8765, titles_file=DEFAULT_TITLES_FILE, backend='exact', batch_window=0.005):
+    """
+    Load the model and titles once, then serve match requests until interrupted
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+        titles_file: Path to the alternate titles file
+        backend: Title search backend name ('exact' or 'ivf')
+        batch_window: Seconds to wait for more requests before encoding a batch
+    """
+    service = MatchService(titles_file, backend=backend, batch_window=batch_window)
+    start = time.perf_counter()
+    service.warm_up()
+    print(f"Model and {len(service.alternate_titles)} alternate titles loaded in "
+          f"{time.perf_counter() - start:.1f}s. Listening on http://{host}:{port}")
+
+    server = _MatchHTTPServer((host, port), _make_handler(service))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def remote_match(positions, top_n=1, server_url=DEFAULT_SERVER_URL, timeout=60, titles_file=None):
+    """
+    Ask the match server for matches
+
+    Args:
+        positions: List of position titles
+        top_n: Number of matches per position
+        server_url: Base URL of the match server
+        timeout: Seconds to wait for the response
+        titles_file: Optional alternate titles file the matches must come from;
+            its digest is sent so a server with other titles refuses the request
+
+    Returns:
+        dict or None: Position -> list of (alternate title dict, score) tuples,
+        or None if the server is not available or has other titles loaded
+    """
+    payload = {'positions': list(positions), 'top_n': top_n}
+    if titles_file is not None:
+        payload['titles_digest'] = file_digest(titles_file)
+    body = json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(server_url.rstrip('/') + '/match', data=body,
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = json.loads(response.read().decode('utf-8'))
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+    # A response of another shape (another service on the port, an older server) means no server
+    try:
+        matches = {
+            position: [(item['match'], item['score']) for item in pairs]
+            for position, pairs in data['matches'].items()
+        }
+    except (KeyError, TypeError, AttributeError):
+        return None
+    if not all(position in matches for position in positions):
+        return None
+    return matches
+
+
+def match_positions(positions, titles_file=DEFAULT_TITLES_FILE, top_n=1, server_url=DEFAULT_SERVER_URL,
+                    backend='exact'):
+    """
+    Match positions through the match server, falling back to in-process matching
+
+    Args:
+        positions: List of position titles
+        titles_file: Path to the alternate titles file (used for the fallback)
+        top_n: Number of matches per position
+        server_url: Base URL of the match server, or None/empty to skip it
+        backend: Title search backend name for the fallback
+
+    Returns:
+        dict: Position -> list of (alternate title dict, score) tuples
+    """
+    if not positions:
+        return {}
+
+    if server_url:
+        matches = remote_match(positions, top_n=top_n, server_url=server_url, titles_file=titles_file)
+        if matches is not None:
+            return matches
+
+    from data_parser import load_onet_data
+    from hybrid_matching import hybrid_match
+
+    alternate_titles, _ = load_onet_data(titles_file)
+    return hybrid_match(positions, alternate_titles, top_n=top_n, titles_file=titles_file, backend=backend)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve title matching with a warm S-BERT model")
+    parser.add_argument('--host', default='127.0.0.1', help='address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to bind (default: 8765)')
+    parser.add_argument('--titles', default=DEFAULT_TITLES_FILE, help='alternate titles file')
+    parser.add_argument('--backend', default='exact', choices=['exact', 'ivf'], help='title search backend')
+    parser.add_argument('--batch-window', type=float, default=0.005,
+                        help='seconds to wait for concurrent requests before encoding (default: 0.005)')
+    args = parser.parse_args(argv)
+
+    serve(host=args.host, port=args.port, titles_file=args.titles, backend=args.backend,
+          batch_window=args.batch_window)
+
+
+if __name__ == "__main__":
+    main()
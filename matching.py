@@ -7,13 +7,47 @@ Matching Module
 Functions for matching job titles using BERT embeddings.
 """
 
+import os
+
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
+from embedding_store import EmbeddingStore, file_digest
+from metrics import count, stage
+from title_search import create_search_backend
+
+
+# Name of the S-BERT model used for all embeddings
+SBERT_MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
 
 # Global variable to cache the BERT model
 sbert_model = None
 
+# Embedding stores for alternate title files, keyed by file path
+embedding_stores = {}
+
+# Search backends, keyed by (alternate titles file path, backend name)
+search_engines = {}
+
+# Digest of each alternate titles file when its embedding store and search backends were created
+title_file_digests = {}
+
+
+def check_titles_file(titles_file):
+    """
+    Drop the embedding store and search backends of an alternate titles file
+    whose content changed since they were created
+
+    Args:
+        titles_file: Path to the alternate titles file
+    """
+    digest = file_digest(titles_file)
+    if title_file_digests.get(titles_file) != digest:
+        embedding_stores.pop(titles_file, None)
+        for key in [key for key in search_engines if key[0] == titles_file]:
+            del search_engines[key]
+        title_file_digests[titles_file] = digest
+
+
 def get_sbert_model():
     """
     Load BERT model and cache it for reuse
@@ -23,11 +57,73 @@ def get_sbert_model():
     """
     global sbert_model
     if sbert_model is None:
-        sbert_model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+        sbert_model = SentenceTransformer(SBERT_MODEL_NAME)
     return sbert_model
 
 
-def match_all_positions_with_alternate_titles(positions, alternate_titles, top_n=1):
+def get_alternate_title_embeddings(alternate_titles, titles_file=None):
+    """
+    Get embeddings for all alternate titles, using the on-disk store when possible
+    
+    Args:
+        alternate_titles: List of alternate title dictionaries
+        titles_file: Optional path of the file the titles were parsed from.
+            When given, embeddings are loaded from (or saved to) the embedding store.
+    
+    Returns:
+        numpy.ndarray: Embedding matrix (alternate_titles x dimensions)
+    """
+    def encode():
+        all_alt_titles = [item['alternate_title'] for item in alternate_titles]
+        model = get_sbert_model()
+        count('titles_encoded', len(all_alt_titles))
+        with stage('encode.titles'):
+            return model.encode(all_alt_titles, show_progress_bar=False)
+
+    if titles_file is None:
+        return encode()
+
+    check_titles_file(titles_file)
+    store = embedding_stores.get(titles_file)
+    if store is None:
+        store = EmbeddingStore(titles_file, SBERT_MODEL_NAME)
+        embedding_stores[titles_file] = store
+    return store.load(encode, expected_rows=len(alternate_titles))
+
+
+def get_search_engine(alternate_titles, titles_file=None, backend='exact'):
+    """
+    Get a search backend over the alternate title embeddings
+    
+    Args:
+        alternate_titles: List of alternate title dictionaries
+        titles_file: Optional path of the alternate titles file. When given, the
+            backend is kept for reuse and the ANN index is saved next to the embeddings.
+        backend: Search backend name ('exact' or 'ivf')
+    
+    Returns:
+        Search backend with a search(queries, top_n) method
+    """
+    key = (titles_file, backend)
+    if titles_file is not None:
+        check_titles_file(titles_file)
+        if key in search_engines:
+            return search_engines[key]
+
+    title_embeddings = get_alternate_title_embeddings(alternate_titles, titles_file)
+
+    index_path = None
+    if titles_file is not None and backend != 'exact':
+        index_path = os.path.splitext(embedding_stores[titles_file].path)[0] + f".{backend}.npz"
+
+    engine = create_search_backend(backend, title_embeddings, index_path)
+    if titles_file is not None:
+        search_engines[key] = engine
+    return engine
+
+
+def match_all_positions_with_alternate_titles(positions, alternate_titles, top_n=1, titles_file=None,
+                                              backend='exact'):
     """
     Match multiple position titles with alternate titles at once using S-BERT embeddings
     
@@ -35,37 +131,31 @@ def match_all_positions_with_alternate_titles(positions, alternate_titles, top_n
         positions: List of position titles to match
         alternate_titles: List of alternate title dictionaries
         top_n: Number of top matches to return for each position (default: 1)
+        titles_file: Optional path of the alternate titles file, used to reuse
+            the stored title embeddings instead of encoding them on every call
+        backend: Search backend name: 'exact' (default) or 'ivf' for approximate search
     
     Returns:
         Dictionary mapping each position to its top matching alternate titles with similarity scores
     """
     # Load the S-BERT model
-    model = get_sbert_model()
-    
-    # Get the list of all alternate titles
-    all_alt_titles = [item['alternate_title'] for item in alternate_titles]
+    with stage('load_model'):
+        model = get_sbert_model()
     
-    # Generate embeddings for all positions and alternate titles at once
-    position_embeddings = model.encode(positions, show_progress_bar=False)
-    title_embeddings = model.encode(all_alt_titles, show_progress_bar=False)
+    # Generate embeddings for the positions; alternate titles come from the store
+    count('positions_encoded', len(positions))
+    with stage('encode.positions'):
+        position_embeddings = model.encode(positions, show_progress_bar=False)
+    engine = get_search_engine(alternate_titles, titles_file, backend)
     
-    # Calculate cosine similarity matrix (positions x alternate_titles)
-    similarities = cosine_similarity(position_embeddings, title_embeddings)
+    # Find the top N alternate titles for every position (sorted by similarity, descending)
+    with stage('search'):
+        results = engine.search(position_embeddings, top_n)
     
     # Create a dictionary to store results for each position
     position_matches = {}
     
-    for i, position in enumerate(positions):
-        # Get similarity scores for this position
-        position_similarities = similarities[i]
-        
-        # Create a list of (title, similarity) pairs
-        title_similarity_pairs = [(alternate_titles[j], position_similarities[j]) for j in range(len(alternate_titles))]
-        
-        # Sort by similarity (descending)
-        title_similarity_pairs.sort(key=lambda x: x[1], reverse=True)
-        
-        # Store top N matches for this position
-        position_matches[position] = title_similarity_pairs[:top_n]
+    for position, (title_ids, scores) in zip(positions, results):
+        position_matches[position] = [(alternate_titles[j], float(score)) for j, score in zip(title_ids, scores)]
     
     return position_matches
\ No newline at end of file
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Metrics Module
+-------------
+Stage timers, counters and memory sampling for the resume pipeline.
+
+A run installs a Metrics collector with collect(); the pipeline modules then
+record into it through the module-level stage(), timed() and count()
+helpers, which do nothing when no collector is active.
+
+    with collect(trace_memory=True) as run_metrics:
+        with stage('parse'):
+            ...
+        count('pages', 2)
+    run_metrics.write('metrics_output.json')
+"""
+
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+# Version of the metrics JSON layout
+METRICS_VERSION = 1
+
+# Collector of the current run (None when metrics are not being collected)
+_active = contextvars.ContextVar('resume_metrics', default=None)
+
+
+class Metrics:
+    """
+    Stage durations and counters of one pipeline run
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = {}
+        self.peak_memory = None
+        self.started = time.time()
+
+    def add_stage(self, name, seconds):
+        """Add the duration of one stage call (repeated calls are summed)"""
+        entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+
+    def count(self, name, n=1):
+        """Increase a counter"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        """
+        Get the metrics as a JSON-serialisable dictionary
+
+        Returns:
+            dict: Version, start time, stages, counters and memory figures
+        """
+        return {
+            'version': METRICS_VERSION,
+            'started': self.started,
+            'stages': {name: {'seconds': round(entry['seconds'], 6), 'calls': entry['calls']}
+                       for name, entry in self.stages.items()},
+            'counters': dict(self.counters),
+            'memory': {
+                'peak_traced_bytes': self.peak_memory,
+                'max_rss_bytes': max_rss_bytes(),
+            },
+        }
+
+    def write(self, path):
+        """
+        Write the metrics report as JSON
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+
+def max_rss_bytes():
+    """
+    Get the peak resident set size of this process
+
+    Returns:
+        int: Peak RSS in bytes, or None where the resource module is not available
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+@contextmanager
+def collect(trace_memory=False):
+    """
+    Collect metrics for the code run inside the block
+
+    Args:
+        trace_memory: Track the peak Python heap size with tracemalloc (slows the run down)
+
+    Yields:
+        Metrics: The collector, complete once the block exits
+    """
+    metrics = Metrics(trace_memory=trace_memory)
+    token = _active.set(metrics)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace_memory:
+        tracemalloc.reset_peak()
+    try:
+        yield metrics
+    finally:
+        if trace_memory:
+            metrics.peak_memory = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        _active.reset(token)
+
+
+def current():
+    """Get the active collector, or None"""
+    return _active.get()
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a pipeline stage into the active collector
+
+    Args:
+        name: Stage name (e.g. 'parse', 'match', 'chart.similarity')
+    """
+    metrics = _active.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """
+    Decorator version of stage()
+
+    Args:
+        name: Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """
+    Increase a counter of the active collector
+
+    Args:
+        name: Counter name (e.g. 'pages', 'titles_encoded')
+        n: Amount to add
+    """
+    metrics = _active.get()
+    if metrics is not None:
+        metrics.count(name, n)
+
+
+def record_stage(name, seconds):
+    """
+    Add a stage duration measured elsewhere (e.g. in a worker process)
+
+    Args:
+        name: Stage name
+        seconds: Duration in seconds
+    """
+    metrics = _active.get()
+    if metrics is not None:
+        metrics.add_stage(name, seconds)
+
+
+@contextmanager
+def profile(path=None):
+    """
+    Run the block under cProfile and dump the stats to a file
+
+    Args:
+        path: Output .prof file (None disables profiling)
+    """
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(path)
+
+
+def percentile(values, q):
+    """
+    Linear-interpolated percentile of a list of numbers
+
+    Args:
+        values: List of numbers
+        q: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or None for an empty list
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize_stages(reports):
+    """
+    Aggregate the stage latencies of many runs into p50/p95 figures
+
+    Args:
+        reports: List of metrics dictionaries (Metrics.to_dict() output)
+
+    Returns:
+        dict: Stage name -> {'runs', 'p50', 'p95', 'max', 'total'} in seconds
+    """
+    samples = {}
+    for report in reports:
+        for name, entry in report.get('stages', {}).items():
+            samples.setdefault(name, []).append(entry['seconds'])
+
+    return {
+        name: {
+            'runs': len(values),
+            'p50': round(percentile(values, 50), 6),
+            'p95': round(percentile(values, 95), 6),
+            'max': round(max(values), 6),
+            'total': round(sum(values), 6),
+        }
+        for name, values in samples.items()
+    }
+
+
+def sum_counters(reports):
+    """
+    Add up the counters of many runs
+
+    Args:
+        reports: List of metrics dictionaries
+
+    Returns:
+        dict: Counter name -> total
+    """
+    totals = {}
+    for report in reports:
+        for name, value in report.get('counters', {}).items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
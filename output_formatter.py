@@ -8,7 +8,9 @@ Functions for formatting and displaying resume analysis results.
 """
 import pandas as pd
 
-def print_position_info(company, position, start_date, end_date, duration, match_info=None):
+from date_utils import calculate_duration
+
+def print_position_info(company, position, start_date, end_date, duration, match_info=None, out=None):
     """
     Print position information with optional matching alternate title
     
@@ -19,17 +21,18 @@ def print_position_info(company, position, start_date, end_date, duration, match
         end_date: End date of the position
         duration: Duration string (e.g., "(2 years 3 months)")
         match_info: Optional tuple of (match_dict, score) with match information
+        out: Writable text stream (default: sys.stdout)
     """
-    print(f"Company: {company}, Position: {position}, Date Period: {start_date} - {end_date}{duration}")
+    print(f"Company: {company}, Position: {position}, Date Period: {start_date} - {end_date}{duration}", file=out)
     
     # If matching information is provided, print it underneath
     if match_info:
         match, score = match_info
-        print(f"  - Matched as: {match['alternate_title']} (O*NET-SOC: {match['onet_soc_code']}, Similarity: {score:.4f})")
-    print()  # Add a blank line
+        print(f"  - Matched as: {match['alternate_title']} (O*NET-SOC: {match['onet_soc_code']}, Similarity: {score:.4f})", file=out)
+    print(file=out)  # Add a blank line
 
 
-def print_contact_information(df_1, df_0, arr_co=None):
+def print_contact_information(df_1, df_0, arr_co=None, out=None):
     """
     Print contact information extracted from the resume
     
@@ -37,17 +40,18 @@ def print_contact_information(df_1, df_0, arr_co=None):
         df_1: DataFrame containing section heading information
         df_0: DataFrame containing detailed content information
         arr_co: Optional array with parsed contact information
+        out: Writable text stream (default: sys.stdout)
     """
-    print("\n" + "="*50)
-    print("CONTACT INFORMATION")
-    print("="*50)
+    print("\n" + "="*50, file=out)
+    print("CONTACT INFORMATION", file=out)
+    print("="*50, file=out)
 
     # Get name information from the first row if available
     if not df_1.empty and not df_1.iloc[0].isnull().any():
         name = df_1.iloc[0].line
-        print(f"Name: {name}")
+        print(f"Name: {name}", file=out)
     else:
-        print("Name: Not Found")
+        print("Name: Not Found", file=out)
     
     # Create a filtered dataframe for contact information
     df_co = df_0[df_0['Title'] == 'Contact'].copy() if 'Title' in df_0.columns else pd.DataFrame()
@@ -108,7 +112,68 @@ def print_contact_information(df_1, df_0, arr_co=None):
                             break
     
     # Print results
-    print(f"Phone: {phone}")
-    print(f"Email: {email}")
-    print(f"LinkedIn: {linkedin_url}")
-    print()
\ No newline at end of file
+    print(f"Phone: {phone}", file=out)
+    print(f"Email: {email}", file=out)
+    print(f"LinkedIn: {linkedin_url}", file=out)
+    print(file=out)
+
+
+def build_web_data(arr, arr_co, position_matches, total_experience):
+    """
+    Build the JSON structure used by the web report
+    
+    Args:
+        arr: Parsed experience array from parse_pdf_resume
+        arr_co: Parsed contact array from parse_pdf_resume
+        position_matches: Dictionary mapping positions to (match, score) lists
+        total_experience: Tuple of (years, months) total experience
+    
+    Returns:
+        dict: Contact information, experience entries and total experience
+    """
+    years, months = total_experience
+    web_data = {
+        "contact": {
+            "name": arr_co[0]['contact'][0] if arr_co else "Not Found",
+            "email": next((line for line in arr_co[0]['contact'] if "@" in line and ".com" in line), "Not Found") if arr_co else "Not Found",
+            "phone": next((line.split("(")[0].strip() for line in arr_co[0]['contact'] if "(Mobile)" in line), "Not Found") if arr_co else "Not Found",
+            "linkedin": next((line.replace("(LinkedIn)", "").strip() for line in arr_co[0]['contact'] if "linkedin" in line.lower()), "Not Found") if arr_co else "Not Found"
+        },
+        "experience": [],
+        "total_experience": {
+            "years": years,
+            "months": months
+        }
+    }
+
+    for item in arr:
+        company = item.get('company', 'Unknown Company')
+        for exp in item.get('experience', []):
+            position = exp.get('position', 'Unknown Position')
+            date_periods = exp.get('date_period', [])
+            for period in date_periods:
+                start_date = period[0] if len(period) > 0 else 'Unknown'
+                end_date = period[1] if len(period) > 1 and period[1] else 'Present'
+                duration = calculate_duration(start_date, end_date)
+
+                match_info = position_matches.get(position, [])
+                match_data = None
+                score = None
+                if match_info:
+                    match, score = match_info[0]
+                    match_data = {
+                        "alternate_title": match['alternate_title'],
+                        "onet_soc_code": match['onet_soc_code']
+                    }
+
+                web_data["experience"].append({
+                    "position": position,
+                    "company": company,
+                    "start": start_date,
+                    "end": end_date,
+                    "duration": duration if duration else "N/A",
+                    "match": match_data,
+                    "score": float(round(score, 4)) if score else None
+                })
+
+    return web_data
\ No newline at end of file
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Parse Cache Module
+-----------------
+Content-addressed on-disk cache for the text rows extracted from PDF resumes.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from embedding_store import file_sha256
+
+
+# Default folder and size limit of the parse cache
+DEFAULT_CACHE_DIR = os.path.join("cache", "parses")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ParseCache:
+    """
+    Stores extracted rows (pdf_parser.RowBuffer columns) as compressed .npz files,
+    keyed by the SHA-256 of the PDF bytes plus the extraction settings.
+    The least recently used files are removed when the cache grows past max_bytes.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def make_key(self, file_path, settings):
+        """
+        Build the cache key for a PDF file
+
+        Args:
+            file_path: Path to the PDF file
+            settings: JSON-serialisable dictionary of extraction settings
+
+        Returns:
+            str: Hex cache key
+        """
+        digest = hashlib.sha256()
+        digest.update(file_sha256(file_path).encode('ascii'))
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key):
+        """
+        Load cached rows
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            RowBuffer or None: The cached rows, or None on a cache miss
+        """
+        from pdf_parser import RowBuffer
+
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                rows = RowBuffer.from_arrays(data['pages'], data['bboxes'], data['sizes'], data['fonts'],
+                                             data['font_names'].tolist(), data['text'].tobytes(), data['offsets'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return rows
+
+    def put(self, key, rows):
+        """
+        Store rows in the cache and evict old entries if it is over its size limit
+
+        Args:
+            key: Cache key from make_key()
+            rows: pdf_parser.RowBuffer
+        """
+        columns = rows.columns()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                pages=columns['pages'],
+                bboxes=columns['bboxes'],
+                sizes=columns['sizes'],
+                fonts=columns['fonts'],
+                font_names=np.array(columns['font_names'], dtype=str),
+                text=np.frombuffer(columns['text'], dtype=np.uint8),
+                offsets=columns['offsets'],
+            )
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.npz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
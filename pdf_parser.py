@@ -7,82 +7,560 @@ PDF Parser Module
 Functions for extracting and parsing text from PDF resumes.
 """
 
-import re
+from bisect import bisect_left, bisect_right
+
+import numpy as np
 import pandas as pd
+import pdfminer
 from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdfparser import PDFParser
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.converter import PDFPageAggregator
-from pdfminer.layout import LTPage, LTChar, LTAnno, LAParams, LTTextBox, LTTextLine
+from pdfminer.layout import LTChar, LTAnno, LAParams, LTTextBox, LTTextLine
 from pdfminer.pdfpage import PDFPage
 
+from date_ranges import date_periods
+from metrics import count, stage, timed
+from styles import (DEFAULT_CLASSIFIER, MAIN_HEADING_ROLES, ROLE_RANKS, SECTION_ROLES, STYLE_RULES,
+                    classify_styles, style_histogram, style_key)
+
+
+# Version of the row extraction; bump it when extracted rows change so cached parses are invalidated
+PARSER_VERSION = 4
+
+# Sections parse_pdf_resume needs; once all of them are closed the rest of the PDF can be skipped
+REQUIRED_SECTIONS = ('Contact', 'Experience', 'Education')
+
+# Least prominent role of a section heading (sidebar headings such as Contact)
+SECTION_HEADING_ROLE = SECTION_ROLES[0]
+
+
+# Layout analysis settings. The rows are re-sorted top to bottom on every page, so the
+# hierarchical text box grouping (boxes_flow) is skipped; vertical text and text inside
+# figures are not analysed either.
+DEFAULT_LAPARAMS = {
+    'line_overlap': 0.5,
+    'char_margin': 2.0,
+    'line_margin': 0.5,
+    'word_margin': 0.1,
+    'boxes_flow': None,
+    'detect_vertical': False,
+    'all_texts': False,
+}
+
+
+def make_laparams(**overrides):
+    """
+    Build LAParams from DEFAULT_LAPARAMS
+
+    Args:
+        **overrides: LAParams settings to change (boxes_flow=None skips the text box grouping)
+
+    Returns:
+        LAParams: Layout analysis settings
+    """
+    settings = dict(DEFAULT_LAPARAMS, **overrides)
+    if settings['boxes_flow'] is None and not hasattr(LAParams, '_validate'):
+        # Older pdfminer releases have no None option; values outside [-1, 1] skip the grouping there
+        settings['boxes_flow'] = 2.0
+    return LAParams(**settings)
+
+
+class RowBuffer:
+    """
+    Growable column buffers for extracted text rows: page number, bounding box
+    (x0, y0, x1, y1), font size, font (an index into font_names), and the
+    UTF-8 text of every row stored back to back with offsets
+    """
+    def __init__(self, capacity=1024):
+        self.pages = np.empty(capacity, dtype=np.int32)
+        self.bboxes = np.empty((capacity, 4), dtype=np.float64)
+        self.sizes = np.empty(capacity, dtype=np.float32)
+        self.fonts = np.empty(capacity, dtype=np.int32)
+        self.font_names = []
+        self._font_ids = {}
+        self.offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.text = bytearray()
+        self.length = 0
+
+    @classmethod
+    def from_arrays(cls, pages, bboxes, sizes, fonts, font_names, text, offsets):
+        """
+        Wrap existing column arrays (e.g. loaded from the parse cache)
+
+        Args:
+            pages: Page number per row
+            bboxes: (rows x 4) bounding boxes
+            sizes: Font size per row
+            fonts: Index into font_names per row
+            font_names: Distinct font names
+            text: UTF-8 bytes of all rows
+            offsets: Start offset of every row's text, plus the end offset
+
+        Returns:
+            RowBuffer: Buffer holding the rows
+        """
+        buffer = cls(capacity=0)
+        buffer.pages = np.asarray(pages, dtype=np.int32)
+        buffer.bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        buffer.sizes = np.asarray(sizes, dtype=np.float32)
+        buffer.fonts = np.asarray(fonts, dtype=np.int32)
+        buffer.font_names = [str(name) for name in font_names]
+        buffer._font_ids = {name: i for i, name in enumerate(buffer.font_names)}
+        buffer.offsets = np.asarray(offsets, dtype=np.int64)
+        buffer.text = bytearray(text)
+        buffer.length = len(buffer.pages)
+        return buffer
+
+    def __len__(self):
+        return self.length
+
+    def _grow(self, needed):
+        capacity = max(needed, 2 * len(self.pages), 64)
+        for name in ('pages', 'bboxes', 'sizes', 'fonts'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.length] = old[:self.length]
+            setattr(self, name, new)
+        offsets = np.zeros(capacity + 1, dtype=np.int64)
+        offsets[:self.length + 1] = self.offsets[:self.length + 1]
+        self.offsets = offsets
+
+    def extend(self, page_rows):
+        """
+        Append rows
+
+        Args:
+            page_rows: List of (page, x0, y0, x1, y1, line, font size, font name) rows
+        """
+        start, stop = self.length, self.length + len(page_rows)
+        if stop > len(self.pages):
+            self._grow(stop)
+        for i, (page, x0, y0, x1, y1, line, size, font) in enumerate(page_rows, start):
+            font_id = self._font_ids.get(font)
+            if font_id is None:
+                font_id = self._font_ids[font] = len(self.font_names)
+                self.font_names.append(font)
+            self.pages[i] = page
+            self.bboxes[i] = (x0, y0, x1, y1)
+            self.sizes[i] = size
+            self.fonts[i] = font_id
+            self.text += line.encode('utf-8')
+            self.offsets[i + 1] = len(self.text)
+        self.length = stop
 
-class PDFPageDetailedAggregator(PDFPageAggregator):
+    def columns(self):
+        """
+        Get the rows as column arrays
+
+        Returns:
+            dict: 'pages', 'bboxes', 'sizes', 'fonts' and 'offsets' arrays trimmed to the row count,
+                plus the 'font_names' list and the 'text' bytes
+        """
+        n = self.length
+        return {'pages': self.pages[:n], 'bboxes': self.bboxes[:n], 'sizes': self.sizes[:n],
+                'fonts': self.fonts[:n], 'font_names': list(self.font_names),
+                'offsets': self.offsets[:n + 1], 'text': bytes(self.text)}
+
+    def lines(self):
+        """
+        Decode the text of every row
+
+        Returns:
+            list: Row texts
+        """
+        text = self.text
+        offsets = self.offsets[:self.length + 1].tolist()
+        return [text[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.length)]
+
+    def rows(self):
+        """
+        Get the rows as lists
+
+        Returns:
+            list: [page, x0, y0, x1, y1, line] rows
+        """
+        bboxes = self.bboxes[:self.length].tolist()
+        return [[page] + bbox + [line]
+                for page, bbox, line in zip(self.pages[:self.length].tolist(), bboxes, self.lines())]
+
+
+class PDFPageRowAggregator(PDFPageAggregator):
     """
-    Extended PDFPageAggregator that extracts detailed text position information
+    PDFPageAggregator that keeps only the text lines of each page as rows
+    (with their font size and name) and drops the page layout as soon as it is read
     """
     def __init__(self, rsrcmgr, pageno=1, laparams=None):
         PDFPageAggregator.__init__(self, rsrcmgr, pageno=pageno, laparams=laparams)
-        self.rows = []
+        self.page_rows = []
         self.page_number = 0
-        
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, *args):
+        adv = PDFPageAggregator.render_char(self, matrix, font, fontsize, scaling, rise, *args)
+        # Font size in page units (the text matrix may scale the nominal size)
+        self.cur_item._objs[-1].fontsize = fontsize * abs(matrix[3] or matrix[0])
+        return adv
+
     def receive_layout(self, ltpage):
-        def render(item, page_number):
-            if isinstance(item, LTPage) or isinstance(item, LTTextBox):
-                for child in item:
-                    render(child, page_number)
-            elif isinstance(item, LTTextLine):
-                child_str = ''
-                for child in item:
-                    if isinstance(child, (LTChar, LTAnno)):
-                        child_str += child.get_text()
-                child_str = ' '.join(child_str.split()).strip()
-                if child_str:
-                    row = [page_number, item.bbox[0], item.bbox[1], item.bbox[2], item.bbox[3], child_str] # bbox == (x1, y1, x2, y2)
-                    self.rows.append(row)
-                for child in item:
-                    render(child, page_number)
-            return
-        render(ltpage, self.page_number)
+        page_number = self.page_number
+        page_rows = []
+        for box in ltpage:
+            if not isinstance(box, LTTextBox):
+                continue
+            for line in box:
+                if not isinstance(line, LTTextLine):
+                    continue
+                parts = []
+                size = 0.0
+                font = ''
+                for char in line:
+                    if isinstance(char, LTChar):
+                        parts.append(char.get_text())
+                        if char.fontsize > size:
+                            size = char.fontsize
+                            font = char.fontname
+                    elif isinstance(char, LTAnno):
+                        parts.append(char.get_text())
+                text = ' '.join(''.join(parts).split())
+                if text:
+                    x0, y0, x1, y1 = line.bbox
+                    page_rows.append((page_number, x0, y0, x1, y1, text, round(size, 2), font))
         self.page_number += 1
-        self.rows = sorted(self.rows, key = lambda x: (x[0], -x[2]))
-        self.result = ltpage
+
+        # Rows top to bottom; the layout itself is not kept
+        page_rows.sort(key=lambda row: -row[2])
+        self.page_rows = page_rows
+        self.result = None
 
 
-def parse_pdf_resume(file_path):
+class SectionTracker:
+    """
+    Follows section headings page by page and reports when all required
+    sections have been closed by a later heading in the same column.
+    Headings are found by font style, classified against the rows seen so far.
+    """
+    def __init__(self, required=REQUIRED_SECTIONS, rules=STYLE_RULES, heading_role=SECTION_HEADING_ROLE):
+        self.required = set(required)
+        self.rules = rules
+        self.min_rank = ROLE_RANKS[heading_role]
+        self.histogram = {}
+        self.open_sections = {}
+        self.closed_sections = set()
+
+    def update(self, rows):
+        """
+        Process the rows of the next page
+        
+        Args:
+            rows: List of (page, x0, y0, x1, y1, line, font size, font name) rows in reading order
+        
+        Returns:
+            int or None: Number of rows of this page that come before the heading
+            closing the last required section, or None while sections are still open
+        """
+        styles = [style_key(row[7], row[6]) for row in rows]
+        style_histogram(styles, [row[5] for row in rows], self.histogram)
+        roles = classify_styles(self.histogram, self.rules)
+
+        for index, (row, style) in enumerate(zip(rows, styles)):
+            if ROLE_RANKS[roles[style]] < self.min_rank:
+                continue
+            x0, line = row[1], row[5]
+
+            # Any heading in the same column ends the sections opened before it
+            for name, section_x0 in list(self.open_sections.items()):
+                if abs(section_x0 - x0) <= max(1.0, 0.01 * section_x0):
+                    del self.open_sections[name]
+                    self.closed_sections.add(name)
+            if self.done:
+                return index
+
+            if line in self.required and line not in self.closed_sections:
+                self.open_sections[line] = x0
+        return None
+
+    @property
+    def done(self):
+        return self.required <= self.closed_sections
+
+
+def iter_pdf_pages(file_path, laparams=None, stop_early=False, required_sections=REQUIRED_SECTIONS):
+    """
+    Lay out a PDF page by page and yield the text rows of each page
+    
+    Args:
+        file_path: Path to the PDF file
+        laparams: Optional LAParams for the layout analysis (default: make_laparams())
+        stop_early: Stop at the heading that closes the last required section,
+            so the remaining pages are never laid out
+        required_sections: Section headings that must be closed before stopping
+    
+    Yields:
+        list: (page, x0, y0, x1, y1, line, font size, font name) rows of one page, top to bottom
+    """
+    with open(file_path, 'rb') as fp:
+        parser = PDFParser(fp)
+        doc = PDFDocument(parser)
+
+        rsrcmgr = PDFResourceManager()
+        device = PDFPageRowAggregator(rsrcmgr, laparams=laparams if laparams is not None else make_laparams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        tracker = SectionTracker(required_sections) if stop_early else None
+
+        for page in PDFPage.create_pages(doc):
+            interpreter.process_page(page)
+            page_rows = device.page_rows
+            device.page_rows = []
+
+            cut = tracker.update(page_rows) if tracker is not None else None
+            if cut is not None:
+                if cut:
+                    yield page_rows[:cut]
+                break
+            yield page_rows
+
+
+def cluster_indentation(x0, pct=0.001):
+    """
+    Group x0 coordinates into indentation levels within a relative tolerance
+    
+    Values are visited in order of first appearance; a value joins the first
+    level whose key is within +/- pct of it, otherwise it starts a new level.
+    Levels are numbered by the sorted order of their keys. Only the distinct
+    x0 values are visited, and existing keys are looked up in a sorted array.
+    
+    Args:
+        x0: Array-like of left x coordinates, one per row
+        pct: Relative tolerance for joining a level (default: 0.001)
+    
+    Returns:
+        numpy.ndarray: Indentation label for every row
+    """
+    x0 = np.asarray(x0, dtype=float)
+    if len(x0) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Distinct values in order of first appearance, plus the row -> value mapping
+    values, first_index, inverse = np.unique(x0, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_index, kind='stable')
+
+    def contains(key, feature):
+        return feature >= (key * (1.0 - pct)) and (key * (1.0 + pct)) >= feature
+
+    def candidate_keys(feature):
+        # Keys that can contain the feature lie in [feature/(1+pct), feature/(1-pct)];
+        # the window is widened slightly and every candidate is checked exactly
+        low, high = feature / (1.0 + pct), feature / (1.0 - pct)
+        low, high = min(low, high), max(low, high)
+        margin = 1e-9 * max(abs(low), abs(high), 1.0)
+        return bisect_left(sorted_keys, low - margin), bisect_right(sorted_keys, high + margin)
+
+    # Pick the level keys (greedy, in order of appearance)
+    sorted_keys = []
+    key_order = {}
+    for value_index in appearance:
+        feature = values[value_index]
+        lo, hi = candidate_keys(feature)
+        if not any(contains(key, feature) for key in sorted_keys[lo:hi]):
+            key_order[feature] = len(key_order)
+            sorted_keys.insert(bisect_left(sorted_keys, feature), feature)
+
+    # Each distinct value takes the earliest created level that contains it
+    value_labels = np.empty(len(values), dtype=np.int64)
+    for value_index, feature in enumerate(values):
+        lo, hi = candidate_keys(feature)
+        matches = [(key_order[sorted_keys[i]], i) for i in range(lo, hi) if contains(sorted_keys[i], feature)]
+        # A negative x0 never falls inside its own tolerance band, so it keeps its own level
+        value_labels[value_index] = min(matches)[1] if matches else bisect_left(sorted_keys, feature)
+
+    return value_labels[inverse.reshape(-1)]
+
+
+def extract_rows(file_path, laparams=None, stop_early=False, cache=None):
+    """
+    Extract the text rows of a PDF, using the parse cache when one is given
+    
+    Args:
+        file_path: Path to the PDF file
+        laparams: Optional LAParams for the layout analysis (default: make_laparams())
+        stop_early: Stop once the required sections are closed
+        cache: Optional ParseCache; on a hit pdfminer is skipped entirely
+    
+    Returns:
+        RowBuffer: The rows in reading order
+    """
+    if laparams is None:
+        laparams = make_laparams()
+
+    key = None
+    if cache is not None:
+        settings = {
+            'parser_version': PARSER_VERSION,
+            'pdfminer_version': getattr(pdfminer, '__version__', ''),
+            'laparams': vars(laparams),
+            'stop_early': stop_early,
+        }
+        key = cache.make_key(file_path, settings)
+        rows = cache.get(key)
+        if rows is not None:
+            count('parse_cache_hits')
+            return rows
+        count('parse_cache_misses')
+
+    rows = RowBuffer()
+    with stage('parse.layout'):
+        for page_rows in iter_pdf_pages(file_path, laparams=laparams, stop_early=stop_early):
+            rows.extend(page_rows)
+
+    if cache is not None:
+        cache.put(key, rows)
+    return rows
+
+
+def assign_titles(df, heading_roles):
+    """
+    Give every row the text of the closest heading above it
+    
+    Args:
+        df: DataFrame with 'line' and 'role' columns, in reading order
+        heading_roles: Roles of the heading rows
+    
+    Returns:
+        pandas.Series: Heading text per row (NaN before the first heading)
+    """
+    return df['line'].where(df['role'].isin(heading_roles)).ffill()
+
+
+def parse_experience_rows(df_ex):
+    """
+    Group the rows of the Experience section by company and position
+    
+    Rows are told apart by their 'role' (see styles.py). Body and date rows
+    belong to the last position of the current company: rows with a date
+    range add to its 'date_period', the others to its 'meta' text. Numeric
+    and year-only ranges only count in date rows and rows holding nothing
+    else, so a year span in a description stays in 'meta'.
+    
+    Args:
+        df_ex: DataFrame of the Experience section rows, in reading order
+    
+    Returns:
+        list: One dictionary per company with its 'experience' entries
+    """
+    if df_ex.empty:
+        return []
+
+    role = df_ex['role'].to_numpy()
+    lines = df_ex['line'].tolist()
+    row_index = np.arange(len(lines))
+    is_company = role == 'company'
+    is_position = role == 'position'
+    is_body = (role == 'body') | (role == 'date')
+
+    # Position of the latest company and position row at or above every row
+    last_company = np.maximum.accumulate(np.where(is_company, row_index, -1))
+    last_position = np.maximum.accumulate(np.where(is_position, row_index, -1))
+
+    # Body rows only count when the current company already has a position
+    owner = np.where(is_body & (last_position > last_company), last_position, -1)
+
+    # Build the company and position dictionaries from the heading rows only
+    arr = []
+    entries = {}
+    for i in np.flatnonzero(is_company | (is_position & (last_company >= 0))):
+        if is_company[i]:
+            arr.append({'company': lines[i]})
+        else:
+            entry = {'position': lines[i]}
+            arr[-1].setdefault('experience', []).append(entry)
+            entries[i] = entry
+
+    body_index = np.flatnonzero(owner >= 0)
+    if len(body_index) == 0:
+        return arr
+
+    body = pd.DataFrame({
+        'owner': owner[body_index],
+        'line': [lines[i] for i in body_index],
+        'periods': [date_periods(lines[i], date_row=role[i] == 'date') for i in body_index],
+    })
+    body['kind'] = np.where(body['periods'].str.len() > 0, 'date_period', 'meta')
+
+    dates = body[body['kind'] == 'date_period'].groupby('owner', sort=False)['periods'].agg(
+        lambda periods: [period for row_periods in periods for period in row_periods])
+    meta = body[body['kind'] == 'meta'].groupby('owner', sort=False)['line'].agg(
+        lambda rows: ''.join(' ' + line for line in rows))
+
+    # Add the keys in the order their first row appears
+    for owner_row, kind in body.drop_duplicates(['owner', 'kind'])[['owner', 'kind']].itertuples(index=False):
+        entries[owner_row][kind] = dates[owner_row] if kind == 'date_period' else meta[owner_row]
+
+    return arr
+
+
+def parse_contact_rows(df_co):
+    """
+    Group the rows of the Contact section
+    
+    Every sidebar heading row starts a new group; body and date rows are
+    collected in its 'contact' list.
+    
+    Args:
+        df_co: DataFrame of the Contact section rows, in reading order
+    
+    Returns:
+        list: One dictionary per contact group
+    """
+    if df_co.empty:
+        return []
+
+    role = df_co['role'].to_numpy()
+    group = np.cumsum(role == SECTION_HEADING_ROLE)
+    arr_co = [{} for _ in range(group[-1])]
+
+    is_contact = ((role == 'body') | (role == 'date')) & (group > 0)
+    contact_lines = df_co['line'][is_contact]
+    for group_number, lines in contact_lines.groupby(group[is_contact], sort=True):
+        arr_co[group_number - 1]['contact'] = lines.tolist()
+    return arr_co
+
+
+@timed('parse')
+def parse_pdf_resume(file_path, stop_early=False, cache=None, classifier=None):
     """
     Parse a PDF resume file and extract structured information
     
     Args:
         file_path: Path to the PDF resume file
+        stop_early: Stop laying out pages once the Contact, Experience and
+            Education sections are closed. Pages after that point are not
+            part of the returned DataFrames.
+        cache: Optional ParseCache holding previously extracted rows
+        classifier: Optional styles.StyleClassifier mapping font styles to roles
+            (default: styles.DEFAULT_CLASSIFIER)
         
     Returns:
         tuple: (df, df_1, df_0, arr, arr_co) - Dataframes and arrays containing parsed resume data
     """
-    # Open and parse the PDF file
-    fp = open(file_path, 'rb')
-    parser = PDFParser(fp)
-    doc = PDFDocument(parser)
-
-    rsrcmgr = PDFResourceManager()
-    laparams = LAParams()
-    device = PDFPageDetailedAggregator(rsrcmgr, laparams=laparams)
-    interpreter = PDFPageInterpreter(rsrcmgr, device)
-
-    # Process each page
-    for page in PDFPage.create_pages(doc):
-        interpreter.process_page(page)
-        # Get the LTPage object for this page
-        device.get_result()
-
-    # Extract the rows of text
-    my_array = device.rows
+    # Extract the rows of text page by page
+    rows = extract_rows(file_path, stop_early=stop_early, cache=cache)
 
-    # Create a DataFrame from the extracted text
-    df = pd.DataFrame.from_records(my_array)
-    df.columns = ['pn','x0','y0','x1','y1','line']
+    # Create a DataFrame from the extracted columns
+    columns = rows.columns()
+    bboxes = columns['bboxes']
+    df = pd.DataFrame({'pn': columns['pages'].astype(np.int64), 'x0': bboxes[:, 0], 'y0': bboxes[:, 1],
+                       'x1': bboxes[:, 2], 'y1': bboxes[:, 3], 'line': rows.lines(),
+                       'font_size': columns['sizes'].astype(np.float64),
+                       'font': np.array(columns['font_names'] or [''], dtype=object)[columns['fonts']]})
+    count('pages', int(df['pn'].nunique()))
+    count('lines', len(df))
     df['y_dif'] = round(df['y1']-df['y0'])
 
+    # Map the font styles to roles (heading, company, position, date, body, ...)
+    with stage('parse.styles'):
+        classifier = classifier or DEFAULT_CLASSIFIER
+        df['role'] = classifier.row_roles(df['font'], df['font_size'], df['line'])
+
     # Calculate cumulative y-coordinates for multi-page documents
     grouped_y0 = df.groupby(['pn'])['y0'].max().reset_index().sort_values('pn', ascending=True)
     grouped_y1 = df.groupby(['pn'])['y1'].max().reset_index().sort_values('pn', ascending=True)
@@ -108,85 +586,27 @@ def parse_pdf_resume(file_path):
     df.drop(['cum_y0', 'cum_y1'], axis=1, inplace=True)
 
     # Group text by indentation level
-    indent_cat = {}
-    pct = 0.001
-    for index, row in df.iterrows():
-        feature = row['x0']
-        bin_found = False
-        for bin_key,bin_arr in indent_cat.items():
-            if feature >= (bin_key * (1.0-pct)) and (bin_key * (1.0+pct)) >= feature:
-                bin_found = True
-                bin_arr.append(index)
-        if not bin_found:
-            indent_cat[feature] = [index]
-
-    def labeling(x, cat_):
-        for key, val in cat_.items():
-            if x in val:
-                return list(sorted(cat_)).index(key)
-
-    df['indent_label'] = df.index.map(lambda x: labeling(x, indent_cat))
+    df['indent_label'] = cluster_indentation(df['x0'].to_numpy())
 
     # Split DataFrame by indentation level
     df_1 = df[df['indent_label'] == 1].copy()
     df_0 = df[df['indent_label'] == 0].copy()
 
     # Add title information to the DataFrames
-    arr = []
-    def title(row):
-        if row.y_dif >= 22:
-            arr.append(row.line)
-        return arr[-1]
-
-    df_1['Title'] = df_1.apply(lambda row: title(row), axis=1)
+    df_1['Title'] = assign_titles(df_1, MAIN_HEADING_ROLES)
     
     # Add title to df_0 as well for contact section identification
-    arr_0 = []
-    def title_0(row):
-        if row.y_dif >= 18:
-            arr_0.append(row.line)
-        return arr_0[-1]
-    
-    df_0['Title'] = df_0.apply(lambda row: title_0(row), axis=1)
+    df_0['Title'] = assign_titles(df_0, SECTION_ROLES)
 
     # Extract experience and education sections
     df_ex = df_1[df_1['Title'] == 'Experience'].copy()
     df_ed = df_1[df_1['Title'] == 'Education'].copy()
 
-    # Regular expression for parsing date ranges
-    pattern = r'([a-zA-Z]+\s\d{4})\s-\s(?:([a-zA-Z]+\s\d{4})|(\w+))'
-    regex = re.compile(pattern, re.IGNORECASE)
-
     # Parse experience section
-    arr = []
-    for index, row in df_ex.iterrows():
-        if row['y_dif'] == 17:
-            arr.append({})
-            arr[-1]['company'] = row['line']
-        elif row['y_dif'] == 16:
-            if 'experience' not in arr[-1]:
-                arr[-1]['experience'] = []
-            arr[-1]['experience'].append({})
-            arr[-1]['experience'][-1]['position'] = row['line']
-        elif row['y_dif'] == 15 and regex.findall(row['line']):
-            if 'experience' in arr[-1]:
-                t = arr[-1]['experience'][-1]['date_period'] if('date_period' in arr[-1]['experience'][-1]) else []
-                arr[-1]['experience'][-1]['date_period'] = t + regex.findall(row['line'])
-        elif row['y_dif'] == 15:
-            if 'experience' in arr[-1]:
-                t = arr[-1]['experience'][-1]['meta'] if('meta' in arr[-1]['experience'][-1]) else ''
-                arr[-1]['experience'][-1]['meta'] = t + ' ' + row['line']
+    arr = parse_experience_rows(df_ex)
     
     # Parse contact information section
-    arr_co = []
     df_co = df_0[df_0['Title'] == 'Contact'].copy() if 'Title' in df_0.columns else pd.DataFrame()
-    
-    for index, row in df_co.iterrows():
-        if row['y_dif'] == 18:
-            arr_co.append({})
-        
-        if row['y_dif'] == 15:
-            t = arr_co[-1]['contact'] if ('contact' in arr_co[-1]) else []
-            arr_co[-1]['contact'] = t + [row['line']]
+    arr_co = parse_contact_rows(df_co)
     
     return df, df_1, df_0, arr, arr_co
\ No newline at end of file
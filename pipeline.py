@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline Module
+--------------
+The resume analysis pipeline as a function that returns its results instead
+of printing them, plus the text report writer.
+
+Nothing here touches sys.stdout or other process-wide state, so several
+analyses can run at the same time in threads of one process:
+
+    result = analyse_resume('./Profile2.pdf')
+    with open('resume_analysis_output.txt', 'w', encoding='utf-8') as f:
+        write_report(result, f)
+"""
+
+from date_utils import duration_months, format_duration, split_months
+from aggregation import aggregate_experience
+from timeline import work_period_intervals, covered_months, find_gaps, format_month
+from data_parser import load_onet_data
+from metrics import count, stage
+
+
+# Default locations of the O*NET data files
+ALTERNATE_TITLES_PATH = './data/Alternate_Titles.txt'
+OCCUPATION_DATA_PATH = './data/Occupation_Data.txt'
+
+
+# AnalysisResult fields computed by aggregate_resume(); the others come from the parsed
+# resume, the title matches and the O*NET data
+AGGREGATE_FIELDS = ('periods', 'all_work_periods', 'all_durations', 'all_matches', 'total_experience',
+                    'career_gaps', 'aggregate', 'onet_months')
+
+
+class AnalysisResult:
+    """
+    Everything one analysis produces: the parsed resume, the title matches, the
+    work periods and the experience totals used by the report, JSON and charts
+    """
+    def __init__(self, resume_file, parse_only, df_1, df_0, arr, arr_co, occupation_data, position_matches,
+                 periods, all_work_periods, all_durations, all_matches, total_experience, career_gaps,
+                 aggregate, onet_months):
+        self.resume_file = resume_file
+        self.parse_only = parse_only
+        self.df_1 = df_1
+        self.df_0 = df_0
+        self.arr = arr
+        self.arr_co = arr_co
+        self.occupation_data = occupation_data
+        self.position_matches = position_matches
+        self.periods = periods
+        self.all_work_periods = all_work_periods
+        self.all_durations = all_durations
+        self.all_matches = all_matches
+        self.total_experience = total_experience
+        self.career_gaps = career_gaps
+        self.aggregate = aggregate
+        self.onet_months = onet_months
+
+    def aggregate_fields(self):
+        """
+        Get the fields computed by the aggregate stage
+
+        Returns:
+            dict: Field name -> value for each name in AGGREGATE_FIELDS
+        """
+        return {name: getattr(self, name) for name in AGGREGATE_FIELDS}
+
+    def web_data(self):
+        """
+        Get the JSON structure used by the web report
+
+        Returns:
+            dict: output_formatter.build_web_data() output for this analysis
+        """
+        from output_formatter import build_web_data
+
+        return build_web_data(self.arr, self.arr_co, self.position_matches, self.total_experience)
+
+
+def parse_resume(resume_file, cache=None):
+    """
+    Parse stage: extract the sections of a resume PDF
+
+    Args:
+        resume_file: Path to the resume PDF file
+        cache: Optional parse_cache.ParseCache
+
+    Returns:
+        dict: 'df_1', 'df_0', 'arr' and 'arr_co' from parse_pdf_resume()
+    """
+    from pdf_parser import parse_pdf_resume
+
+    _, df_1, df_0, arr, arr_co = parse_pdf_resume(resume_file, cache=cache)
+    return {'df_1': df_1, 'df_0': df_0, 'arr': arr, 'arr_co': arr_co}
+
+
+def unique_positions(arr):
+    """
+    Get the distinct position titles of a parsed experience array, sorted
+
+    Args:
+        arr: Parsed experience array
+
+    Returns:
+        list: Position titles
+    """
+    return sorted({exp.get('position', 'Unknown Position') for item in arr for exp in item.get('experience', [])})
+
+
+def match_resume(parsed, titles_file=ALTERNATE_TITLES_PATH):
+    """
+    Match stage: match every position with the alternate titles in one call
+    (through the match server when it is running)
+
+    Args:
+        parsed: Output of parse_resume()
+        titles_file: Path to the alternate titles file
+
+    Returns:
+        dict: Position -> list of (alternate title dict, score) tuples
+    """
+    from match_server import match_positions
+
+    with stage('match'):
+        return match_positions(unique_positions(parsed['arr']), titles_file=titles_file, top_n=1)
+
+
+def analyse_resume(resume_file, parse_only=False, titles_file=ALTERNATE_TITLES_PATH,
+                   occupation_file=OCCUPATION_DATA_PATH, cache=None):
+    """
+    Parse a resume, match its positions and calculate the experience totals
+
+    Args:
+        resume_file: Path to the resume PDF file
+        parse_only: Skip title matching (never imports the S-BERT model or torch)
+        titles_file: Path to the alternate titles file
+        occupation_file: Path to the occupation data file
+        cache: Optional parse_cache.ParseCache
+
+    Returns:
+        AnalysisResult: The analysis
+    """
+    parsed = parse_resume(resume_file, cache=cache)
+    position_matches = {} if parse_only else match_resume(parsed, titles_file)
+    return aggregate_resume(resume_file, parsed, position_matches, parse_only=parse_only,
+                            titles_file=titles_file, occupation_file=occupation_file)
+
+
+def aggregate_resume(resume_file, parsed, position_matches, parse_only=False, titles_file=ALTERNATE_TITLES_PATH,
+                     occupation_file=OCCUPATION_DATA_PATH):
+    """
+    Aggregate stage: collect the work periods and calculate the experience totals
+
+    Args:
+        resume_file: Path to the resume PDF file
+        parsed: Output of parse_resume()
+        position_matches: Output of match_resume() ({} with parse_only)
+        parse_only: The analysis has no title matches (the O*NET data is not loaded)
+        titles_file: Path to the alternate titles file
+        occupation_file: Path to the occupation data file
+
+    Returns:
+        AnalysisResult: The analysis
+    """
+    arr = parsed['arr']
+    count('positions', len(unique_positions(arr)))
+
+    # Load occupation data files
+    occupation_data = {}
+    if not parse_only:
+        _, occupation_data = load_onet_data(titles_file, occupation_file)
+
+    # Collect every period with its duration and match, and the work periods with valid dates
+    periods = []
+    all_work_periods = []
+    all_durations = []  # Track durations in months
+    all_matches = []
+    for item in arr:
+        company = item.get('company', 'Unknown Company')
+        for exp in item.get('experience', []):
+            position = exp.get('position', 'Unknown Position')
+
+            # Get the match for this position
+            match_info = position_matches.get(position, [])
+
+            for period in exp.get('date_period', []):
+                start_date = period[0] if len(period) > 0 else 'Unknown Start'
+                end_date = period[1] if len(period) > 1 and period[1] else 'Present'
+                current_status = period[2] if len(period) > 2 and period[2] else ''
+
+                # If end_date is empty but current_status has a value, use that as the end status
+                if not end_date and current_status:
+                    end_date = current_status
+                    current_status = ''
+
+                # Calculate duration for this position
+                months = None
+                if start_date != 'Unknown Start' and end_date != 'Unknown End':
+                    months = duration_months(start_date, end_date)
+                    if months is not None:
+                        all_durations.append(months)
+
+                periods.append({
+                    'company': company,
+                    'position': position,
+                    'start': start_date,
+                    'end': end_date,
+                    'months': months,
+                    'match': match_info[0] if match_info else None,
+                })
+
+                if start_date != 'Unknown Start' and end_date != 'Unknown End':
+                    all_work_periods.append({
+                        'start': start_date,
+                        'end': end_date,
+                        'company': company,
+                        'position': position,
+                        'months': months
+                    })
+
+                if match_info:
+                    match, score = match_info[0]
+                    all_matches.append({
+                        'position': position,
+                        'company': company,
+                        'match': match,
+                        'score': score
+                    })
+
+    # Calculate total experience as elapsed time, counting overlapping roles once
+    count('work_periods', len(all_work_periods))
+    with stage('timeline'):
+        work_intervals = work_period_intervals(all_work_periods)
+        total_experience = split_months(covered_months(work_intervals))
+        career_gaps = find_gaps(work_intervals)
+
+    # Group positions by O*NET-SOC codes and total their elapsed experience in one pass
+    with stage('aggregate'):
+        aggregate = aggregate_experience(all_matches, all_work_periods)
+        onet_months = aggregate['onet_months']
+
+    return AnalysisResult(resume_file, parse_only, parsed['df_1'], parsed['df_0'], arr, parsed['arr_co'],
+                          occupation_data, position_matches, periods, all_work_periods, all_durations, all_matches,
+                          total_experience, career_gaps, aggregate, onet_months)
+
+
+def write_report(result, out):
+    """
+    Write the text report of an analysis
+
+    Args:
+        result: AnalysisResult from analyse_resume()
+        out: Writable text stream (file, io.StringIO, ...)
+    """
+    from output_formatter import print_contact_information, print_position_info
+
+    def write(text=""):
+        out.write(text + "\n")
+
+    print_contact_information(result.df_1, result.df_0, result.arr_co, out=out)
+
+    if not result.parse_only:
+        write("Matching positions with alternate titles...\n")
+
+    write("="*50)
+    write("WORK EXPERIENCE WITH MATCHED TITLES")
+    write("="*50 + "\n")
+
+    for period in result.periods:
+        duration = f" ({format_duration(period['months'])})" if period['months'] is not None else ""
+        print_position_info(period['company'], period['position'], period['start'], period['end'], duration,
+                            period['match'], out=out)
+
+    direct_years, direct_months = result.total_experience
+    write("\n" + "="*50)
+    write("TOTAL WORK EXPERIENCE")
+    write("="*50)
+    write(f"Total Work Experience: {direct_years} years and {direct_months} months")
+    summed_months = sum(result.all_durations)
+    if summed_months != direct_years * 12 + direct_months:
+        summed_years, summed_remaining = split_months(summed_months)
+        write(f"Sum of Position Durations: {summed_years} years and {summed_remaining} months (overlapping roles)")
+
+    if result.career_gaps:
+        write("\nCareer Gaps:")
+        for gap_start, gap_end in result.career_gaps:
+            gap_years, gap_months = split_months(gap_end - gap_start)
+            write(f"  • {format_month(gap_start)} - {format_month(gap_end - 1)} "
+                  f"({gap_years} years and {gap_months} months)")
+
+    # Find and write occupations for each code group
+    write("\n" + "="*50)
+    write("POSITIONS GROUPED BY O*NET-SOC CODE")
+    write("="*50)
+
+    occupation_data = result.occupation_data
+    for onet_code, match_infos in sorted(result.aggregate['onet_groups'].items()):
+        if onet_code not in occupation_data:
+            continue
+        primary_occupation = occupation_data[onet_code]
+
+        write(f"\nO*NET-SOC Code: {onet_code}")
+        write(f"Primary Occupation: {primary_occupation['title']}")
+        description_text = primary_occupation['description']
+        write(f"Description: {description_text[:200]}..." if len(description_text) > 200 else f"Description: {description_text}")
+
+        # Show positions contributing to the grouping
+        write("\nMatched Positions:")
+
+        # Find highest match score for each unique position
+        position_scores = {}
+        for match_info in match_infos:
+            position = match_info['position']
+            company = match_info['company']
+            score = match_info['score']
+            key = f"{position} at {company}"
+            if key not in position_scores or score > position_scores[key]['score']:
+                position_scores[key] = {
+                    'position': position,
+                    'company': company,
+                    'score': score,
+                    'alternate_title': match_info['match']['alternate_title']
+                }
+
+        # Sort by highest match scores
+        for pos_info in sorted(position_scores.values(), key=lambda x: x['score'], reverse=True):
+            write(f"  • {pos_info['position']} at {pos_info['company']} (Similarity: {pos_info['score']:.4f})")
+            write(f"    Matched as: {pos_info['alternate_title']}")
+
+        # Total work duration for this occupation group
+        occupation_years, occupation_months = split_months(result.onet_months[onet_code])
+        write(f"\nTotal experience in {primary_occupation['title']}: {occupation_years} years and {occupation_months} months")
+        write("-" * 50)
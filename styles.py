@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Styles Module
+------------
+Maps the text styles of a resume (font name and size) to layout roles such
+as section headings, company and position rows, so sections are detected by
+font size relative to the body text rather than by fixed line heights.
+
+A document's style histogram is built in one pass over its rows. The body
+style is the one with the most characters, and every other style is mapped
+to a role by the first matching rule of STYLE_RULES. Mappings are cached
+per template fingerprint: the set of styles, the body style and which
+styles pass the date share rules. Only the rows of the styles a date rule is checked for are scanned for
+date ranges.
+
+    classifier = StyleClassifier()
+    roles = classifier.row_roles(df['font'], df['font_size'], df['line'])
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+from date_ranges import extract_date_ranges
+from metrics import count
+
+
+# Roles from least to most prominent
+ROLES = ('small', 'body', 'date', 'position', 'company', 'subheading', 'heading', 'title')
+ROLE_RANKS = {role: rank for rank, role in enumerate(ROLES)}
+
+# Rows that start a section in the main column (section titles, the name) and in the sidebar (Contact, Top Skills, ...)
+MAIN_HEADING_ROLES = ('heading', 'title')
+SECTION_ROLES = ('subheading', 'heading', 'title')
+
+# Rules mapping a style to a role; the first matching rule wins. Keys:
+#   role            Role of the matching styles
+#   min_ratio       Minimum font size relative to the body size
+#   max_ratio       Optional maximum font size relative to the body size
+#   font            Optional regular expression searched in the font name (e.g. 'Bold')
+#   min_date_share  Optional minimum share of the style's rows that contain a date range
+# The ratios fit LinkedIn exports (body 10.5pt; URL 11, position 11.5, company 12,
+# sidebar headings 13, section titles 15.75 and the name 26pt).
+STYLE_RULES = (
+    {'role': 'title', 'min_ratio': 1.6},
+    {'role': 'heading', 'min_ratio': 1.35},
+    {'role': 'subheading', 'min_ratio': 1.17},
+    {'role': 'company', 'min_ratio': 1.115},
+    {'role': 'position', 'min_ratio': 1.06},
+    {'role': 'date', 'min_ratio': 0.95, 'min_date_share': 0.6},
+    {'role': 'body', 'min_ratio': 0.95},
+    {'role': 'small', 'min_ratio': 0.0},
+)
+
+# Subset fonts are named like "EAAAAA+ArialUnicodeMS"; the tag differs between documents
+SUBSET_TAG_REGEX = re.compile(r'^[A-Z]{6}\+')
+
+
+def style_key(font, size):
+    """
+    Get the style of a row
+
+    Args:
+        font: Font name
+        size: Font size
+
+    Returns:
+        tuple: (font name without the subset tag, size rounded to 0.01)
+    """
+    return SUBSET_TAG_REGEX.sub('', font or ''), round(float(size), 2)
+
+
+def style_histogram(styles, lines, histogram=None):
+    """
+    Count the rows and characters of every style
+
+    Args:
+        styles: Style per row (from style_key())
+        lines: Text per row
+        histogram: Optional histogram to add the rows to
+
+    Returns:
+        dict: Style -> [rows, characters]
+    """
+    histogram = {} if histogram is None else histogram
+    for style, line in zip(styles, lines):
+        entry = histogram.get(style)
+        if entry is None:
+            histogram[style] = [1, len(line)]
+        else:
+            entry[0] += 1
+            entry[1] += len(line)
+    return histogram
+
+
+def rules_fingerprint(rules=STYLE_RULES):
+    """
+    Fingerprint a rule table, so stored results can be invalidated when it changes
+
+    Args:
+        rules: Style rules
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def body_style(histogram):
+    """
+    Get the body text style, the one with the most characters (then rows)
+
+    Args:
+        histogram: Output of style_histogram()
+
+    Returns:
+        tuple: Style, or None for an empty histogram
+    """
+    if not histogram:
+        return None
+    return max(histogram.items(), key=lambda item: (item[1][1], item[1][0]))[0]
+
+
+def date_rule_styles(histogram, rules=STYLE_RULES):
+    """
+    Get the styles whose role depends on their share of date rows
+
+    Args:
+        histogram: Output of style_histogram()
+        rules: Style rules
+
+    Returns:
+        list: Styles for which classify_styles() checks a min_date_share rule
+    """
+    checked = []
+    classify_styles(histogram, rules, date_share=lambda style: checked.append(style) or 0.0)
+    return list(dict.fromkeys(checked))
+
+
+def template_fingerprint(histogram, rules=STYLE_RULES, date_shares=None):
+    """
+    Fingerprint a layout template by its set of styles, its body style and
+    the min_date_share rules its styles pass
+
+    Args:
+        histogram: Output of style_histogram()
+        rules: Style rules the mapping is made with
+        date_shares: Optional style -> share of its rows with a date range,
+            for the styles of date_rule_styles()
+
+    Returns:
+        str: Hex digest
+    """
+    thresholds = sorted({rule['min_date_share'] for rule in rules if 'min_date_share' in rule})
+    date_rows = sorted([style, [share >= threshold for threshold in thresholds]]
+                       for style, share in (date_shares or {}).items())
+    digest = hashlib.sha256(rules_fingerprint(rules).encode('ascii'))
+    digest.update(json.dumps([sorted(histogram), body_style(histogram), date_rows]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def classify_styles(histogram, rules=STYLE_RULES, date_share=None):
+    """
+    Map every style of a document to a role
+
+    Args:
+        histogram: Output of style_histogram()
+        rules: Style rules, checked in order
+        date_share: Optional function of a style returning the share of its rows
+            with a date range; without it rules using min_date_share never match
+
+    Returns:
+        dict: Style -> role
+    """
+    if not histogram:
+        return {}
+
+    body_size = body_style(histogram)[1]
+
+    roles = {}
+    for style in histogram:
+        font, size = style
+        ratio = size / body_size if body_size else 1.0
+        roles[style] = 'body'
+        for rule in rules:
+            if ratio < rule['min_ratio'] or ('max_ratio' in rule and ratio > rule['max_ratio']):
+                continue
+            if 'font' in rule and not re.search(rule['font'], font):
+                continue
+            if 'min_date_share' in rule and (date_share is None or date_share(style) < rule['min_date_share']):
+                continue
+            roles[style] = rule['role']
+            break
+    return roles
+
+
+class StyleClassifier:
+    """
+    Assigns a role to every row of a document, caching the style -> role
+    mapping of up to max_templates layout templates (thread-safe)
+    """
+    def __init__(self, rules=STYLE_RULES, max_templates=256):
+        self.rules = rules
+        self.max_templates = max_templates
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def row_roles(self, fonts, sizes, lines):
+        """
+        Get the role of every row
+
+        Args:
+            fonts: Font name per row
+            sizes: Font size per row
+            lines: Text per row
+
+        Returns:
+            list: Role per row
+        """
+        styles = [style_key(font, size) for font, size in zip(fonts, sizes)]
+        lines = list(lines)
+        histogram = style_histogram(styles, lines)
+
+        # The date share rules need the rows of a few styles only (the body and date rows)
+        date_shares = {}
+        for style in date_rule_styles(histogram, self.rules):
+            style_lines = [line for row_style, line in zip(styles, lines) if row_style == style]
+            date_shares[style] = sum(1 for line in style_lines if extract_date_ranges(line)) / len(style_lines)
+        fingerprint = template_fingerprint(histogram, self.rules, date_shares)
+
+        with self._lock:
+            roles = self._templates.get(fingerprint)
+            if roles is not None:
+                self._templates.move_to_end(fingerprint)
+        if roles is not None:
+            count('style_cache_hits')
+        else:
+            count('style_cache_misses')
+            roles = classify_styles(histogram, self.rules, date_share=date_shares.get)
+            with self._lock:
+                self._templates[fingerprint] = roles
+                while len(self._templates) > self.max_templates:
+                    self._templates.popitem(last=False)
+
+        return [roles[style] for style in styles]
+
+
+# Classifier used by pdf_parser.parse_pdf_resume() when none is given
+DEFAULT_CLASSIFIER = StyleClassifier()
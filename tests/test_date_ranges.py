@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from date_ranges import date_periods
+from pdf_parser import parse_experience_rows
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("June 2019 - Present (5 years 2 months)", [("June 2019", "", "Present")]),
+    ("Haziran 2019 - Günümüz", [("June 2019", "", "Present")]),
+    ("06/2019 - 03/2021", [("June 2019", "March 2021", "")]),
+    ("2015 - 2018 (3 years)", [("January 2015", "December 2018", "")]),
+    ("Led the migration 2018-2019", []),
+    ("Tel: 0532 2019-2020", []),
+    ("Summer 2019 - 2020 season", []),
+])
+def test_date_periods_of_body_rows(line, expected):
+    assert date_periods(line) == expected
+
+
+def test_date_rows_accept_numeric_ranges_anywhere():
+    assert date_periods("2019-06 - 2021-03 · Istanbul", date_row=True) == [("June 2019", "March 2021", "")]
+
+
+def test_year_span_in_description_stays_in_meta():
+    df_ex = pd.DataFrame({
+        'line': ["Acme", "Engineer", "June 2019 - Present (5 years)", "Led the migration 2018-2019"],
+        'role': ['company', 'position', 'date', 'body'],
+    })
+    entry = parse_experience_rows(df_ex)[0]['experience'][0]
+    assert entry['date_period'] == [("June 2019", "", "Present")]
+    assert entry['meta'] == " Led the migration 2018-2019"
@@ -0,0 +1,60 @@
+import sys
+import types
+
+import pytest
+
+from hybrid_matching import LexicalTitleIndex, MatchCache, hybrid_match, normalize_title
+
+
+ALTERNATE_TITLES = [
+    {'alternate_title': title, 'onet_soc_code': code} for title, code in (
+        ('C Developer', '15-1252.00'),
+        ('Java Developer', '15-1252.00'),
+        ('Senior Software Engineer', '15-1252.00'),
+        ('ASP.NET Developer', '15-1254.00'),
+        ('Registered Nurse', '29-1141.00'),
+    )
+]
+
+
+@pytest.fixture
+def semantic_positions(monkeypatch):
+    # Record the positions sent to the embeddings instead of loading the S-BERT model
+    sent = []
+
+    def match_all(positions, alternate_titles, top_n=1, titles_file=None, backend='exact'):
+        sent.extend(positions)
+        return {position: [(alternate_titles[-1], 0.5)] for position in positions}
+
+    monkeypatch.setitem(sys.modules, 'matching',
+                        types.SimpleNamespace(match_all_positions_with_alternate_titles=match_all))
+    return sent
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('C# Developer', 'c# developer'),
+    ('C++ Developer', 'c++ developer'),
+    ('ASP.NET Developer', 'asp.net developer'),
+    ('.NET Developer', '.net developer'),
+    ('Sr. Software Engineer', 'sr software engineer'),
+    ('Software Engineer (Backend)', 'software engineer backend'),
+    ('Front-End_Developer.', 'front end developer'),
+])
+def test_normalize_title_keeps_symbols_inside_words(title, expected):
+    assert normalize_title(title) == expected
+
+
+def test_symbol_titles_do_not_match_the_plain_title():
+    index = LexicalTitleIndex(ALTERNATE_TITLES)
+    for position in ('C# Developer', 'C++ Developer'):
+        assert index.exact_match(position) is None
+        assert index.nearest(position)[1] < 0.8
+    assert index.exact_match('c developer') == 0
+    assert index.exact_match('Asp.Net Developer') == 3
+
+
+def test_symbol_titles_go_to_the_embeddings(semantic_positions):
+    matches = hybrid_match(['C# Developer', 'C++ Developer', 'C Developer'], ALTERNATE_TITLES,
+                           cache=MatchCache())
+    assert semantic_positions == ['C# Developer', 'C++ Developer']
+    assert matches['C Developer'] == [(ALTERNATE_TITLES[0], 1.0)]
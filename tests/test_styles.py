@@ -0,0 +1,44 @@
+from styles import StyleClassifier
+
+
+def document(body_size, other_size, n_other):
+    # Ten long rows in the body size and n_other short rows in the other size
+    fonts = ['Arial'] * (10 + n_other)
+    sizes = [body_size] * 10 + [other_size] * n_other
+    lines = [f"Body text row {i} with enough characters" for i in range(10)] + ['Heading'] * n_other
+    return fonts, sizes, lines
+
+
+def dated_document(dates):
+    # Body text plus a second font of the same size whose rows are dates or plain text
+    fonts = ['Arial'] * 10 + ['Arial-Light'] * 3
+    sizes = [10] * 13
+    lines = [f"Body text row {i} with enough characters" for i in range(10)]
+    lines += ['January 2019 - March 2020'] * 3 if dates else ['Istanbul, Turkey'] * 3
+    return fonts, sizes, lines
+
+
+def test_roles_do_not_depend_on_document_order():
+    # Same two styles, but the body style differs between the documents
+    doc_a = document(10, 12, 2)
+    doc_b = document(12, 10, 2)
+    expected = {name: StyleClassifier().row_roles(*doc) for name, doc in (('a', doc_a), ('b', doc_b))}
+    assert expected['a'][-1] == 'subheading'
+    assert expected['b'][-1] == 'small'
+
+    for order in (('a', 'b'), ('b', 'a')):
+        classifier = StyleClassifier()
+        docs = {'a': doc_a, 'b': doc_b}
+        for name in order:
+            assert classifier.row_roles(*docs[name]) == expected[name]
+
+
+def test_date_rows_do_not_depend_on_document_order():
+    expected = {dates: StyleClassifier().row_roles(*dated_document(dates)) for dates in (True, False)}
+    assert expected[True][-1] == 'date'
+    assert expected[False][-1] == 'body'
+
+    for order in ((True, False), (False, True)):
+        classifier = StyleClassifier()
+        for dates in order:
+            assert classifier.row_roles(*dated_document(dates)) == expected[dates]
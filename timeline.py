@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Timeline Module
+--------------
+Career timelines as sorted month-ordinal intervals. Overlapping roles are
+merged so total experience counts elapsed time instead of summing every
+position, and the holes between merged intervals are reported as gaps.
+
+An interval is a (start, end) pair of month ordinals where the end is
+exclusive, so its length equals date_utils.duration_months().
+"""
+
+from date_utils import MONTHS, current_month_ordinal, parse_month_year
+
+
+# Month number to name mapping (reverse of date_utils.MONTHS)
+MONTH_NAMES = {number: name for name, number in MONTHS.items()}
+
+
+def period_interval(start_date, end_date, now=None):
+    """
+    Convert a work period to a month-ordinal interval
+
+    Args:
+        start_date (str): Start date in "Month Year" format (e.g., "June 2019")
+        end_date (str): End date in "Month Year" format or "Present"
+        now (int): Optional month ordinal to use for "Present" (default: current month)
+
+    Returns:
+        tuple: (start, end) with an exclusive end, or None if the dates are invalid or empty
+    """
+    start = parse_month_year(start_date)
+    if start is None:
+        return None
+
+    if end_date == "Present":
+        end = current_month_ordinal() if now is None else now
+    else:
+        end = parse_month_year(end_date)
+        if end is None:
+            return None
+        end += 1
+
+    if end <= start:
+        return None
+    return start, end
+
+
+def work_period_intervals(work_periods, now=None):
+    """
+    Get the intervals of a list of work periods
+
+    Args:
+        work_periods: List of work period dictionaries ('start', 'end', ...)
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        list: (start, end) intervals of the periods with valid dates
+    """
+    intervals = []
+    for period in work_periods:
+        interval = period_interval(period['start'], period['end'], now=now)
+        if interval is not None:
+            intervals.append(interval)
+    return intervals
+
+
+def resume_intervals(arr, now=None):
+    """
+    Get the intervals of every period in a parsed experience array
+
+    Args:
+        arr: Parsed experience array
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        list: (start, end) intervals of the periods with valid dates
+    """
+    intervals = []
+    for item in arr:
+        for exp in item.get('experience', []):
+            for period in exp.get('date_period', []):
+                start_date = period[0] if len(period) > 0 else 'Unknown'
+                end_date = period[1] if len(period) > 1 and period[1] else 'Present'
+                interval = period_interval(start_date, end_date, now=now)
+                if interval is not None:
+                    intervals.append(interval)
+    return intervals
+
+
+def merge_intervals(intervals):
+    """
+    Merge overlapping and touching intervals with a sorted sweep
+
+    Args:
+        intervals: Iterable of (start, end) intervals
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) intervals
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covered_months(intervals):
+    """
+    Count the months covered by at least one interval
+
+    Args:
+        intervals: Iterable of (start, end) intervals
+
+    Returns:
+        int: Elapsed months, with overlapping roles counted once
+    """
+    return sum(end - start for start, end in merge_intervals(intervals))
+
+
+def find_gaps(intervals, min_months=1):
+    """
+    Find the gaps between merged intervals
+
+    Args:
+        intervals: Iterable of (start, end) intervals
+        min_months (int): Shortest gap to report
+
+    Returns:
+        list: (start, end) intervals of the gaps, in time order
+    """
+    merged = merge_intervals(intervals)
+    gaps = []
+    for (_, previous_end), (next_start, _) in zip(merged, merged[1:]):
+        if next_start - previous_end >= min_months:
+            gaps.append((previous_end, next_start))
+    return gaps
+
+
+def format_month(ordinal):
+    """
+    Format a month ordinal as a "Month Year" string
+
+    Args:
+        ordinal (int): Month ordinal
+
+    Returns:
+        str: Date in "Month Year" format (e.g., "June 2019")
+    """
+    year, month = divmod(ordinal, 12)
+    return f"{MONTH_NAMES[month + 1]} {year}"
+
+
+def role_intervals(work_periods, now=None):
+    """
+    Index the intervals of work periods by role
+
+    Args:
+        work_periods: List of work period dictionaries ('start', 'end', 'company', 'position')
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        dict: (position, company) -> list of (start, end) intervals
+    """
+    intervals_by_role = {}
+    for period in work_periods:
+        interval = period_interval(period['start'], period['end'], now=now)
+        if interval is not None:
+            intervals_by_role.setdefault((period['position'], period['company']), []).append(interval)
+    return intervals_by_role
+
+
+def match_coverage(match_groups, intervals_by_role):
+    """
+    Count the elapsed months of each group of matches, counting overlapping roles once
+
+    Args:
+        match_groups: Group key -> list of match dictionaries ('position', 'company', ...)
+        intervals_by_role: Result of role_intervals()
+
+    Returns:
+        dict: Group key -> covered months, in the order of match_groups
+    """
+    coverage = {}
+    for key, match_infos in match_groups.items():
+        roles = {(match['position'], match['company']) for match in match_infos}
+        coverage[key] = covered_months(
+            interval for role in roles for interval in intervals_by_role.get(role, []))
+    return coverage
+
+
+def onet_coverage(onet_groups, work_periods, now=None):
+    """
+    Count the elapsed months of each O*NET-SOC code group
+
+    Args:
+        onet_groups: O*NET-SOC code -> list of match dictionaries ('position', 'company', ...)
+        work_periods: List of work period dictionaries ('start', 'end', 'company', 'position')
+        now (int): Optional month ordinal to use for "Present"
+
+    Returns:
+        dict: O*NET-SOC code -> covered months
+    """
+    return match_coverage(onet_groups, role_intervals(work_periods, now=now))
+
+
+def batch_coverage(starts, ends, owners, n_owners=None):
+    """
+    Vectorized covered_months and total gap length for many candidates at once
+
+    All intervals are sorted by (owner, start) in one call. Each owner's
+    values are shifted into its own range, so a single running maximum of the
+    end ordinals gives, for every interval, the furthest end seen so far for
+    the same owner. The part of an interval past that end is new coverage and
+    the part of the start past it is a gap.
+
+    Args:
+        starts: Sequence of interval start ordinals
+        ends: Sequence of exclusive interval end ordinals
+        owners: Sequence of owner (candidate) indexes, one per interval
+        n_owners (int): Number of owners (default: max(owners) + 1)
+
+    Returns:
+        tuple: (covered, gaps) int64 arrays of months per owner
+    """
+    import numpy as np
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    owners = np.asarray(owners, dtype=np.int64)
+    if n_owners is None:
+        n_owners = int(owners.max()) + 1 if len(owners) else 0
+    if len(starts) == 0:
+        return np.zeros(n_owners, dtype=np.int64), np.zeros(n_owners, dtype=np.int64)
+
+    ends = np.maximum(ends, starts)
+    origin = starts.min()
+    span = int(ends.max() - origin) + 1
+    order = np.lexsort((starts, owners))
+    starts, ends, owners = starts[order], ends[order], owners[order]
+
+    shift = owners * span - origin
+    reach = np.maximum.accumulate(ends + shift) - shift
+
+    # Furthest end before each interval; the first interval of an owner has none
+    first = np.ones(len(owners), dtype=bool)
+    first[1:] = owners[1:] != owners[:-1]
+    previous = np.empty_like(reach)
+    previous[0] = starts[0]
+    previous[1:] = reach[:-1]
+    previous[first] = starts[first]
+
+    covered = np.maximum(ends - np.maximum(starts, previous), 0)
+    gaps = np.maximum(starts - previous, 0)
+    return (np.bincount(owners, weights=covered, minlength=n_owners).astype(np.int64),
+            np.bincount(owners, weights=gaps, minlength=n_owners).astype(np.int64))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Title Search Module
+------------------
+Nearest-neighbour search backends for matching position embeddings
+against alternate title embeddings.
+"""
+
+import os
+
+import numpy as np
+
+
+def normalize_rows(matrix):
+    """
+    L2-normalize each row of a matrix so dot products equal cosine similarity
+
+    Args:
+        matrix: 2D array-like of embeddings
+
+    Returns:
+        numpy.ndarray: Float32 matrix with unit-length rows (zero rows stay zero)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores, k, ids=None):
+    """
+    Select the k highest scores of a 1D array in descending order
+
+    Ties are broken by the lower index first, which gives the same order as a
+    stable descending sort over the full list.
+
+    Args:
+        scores: 1D array of scores
+        k: Number of results to keep
+        ids: Optional array of ids matching the scores (default: positions)
+
+    Returns:
+        tuple: (ids, scores) arrays of length min(k, len(scores))
+    """
+    if ids is None:
+        ids = np.arange(len(scores))
+    k = min(k, len(scores))
+    if k <= 0:
+        return ids[:0], scores[:0]
+
+    if k < len(scores):
+        # Partial selection gives the k-th best score, then every score that
+        # reaches it is kept so ties can be ordered by id
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= kth_score)
+    else:
+        candidates = np.arange(len(scores))
+
+    order = np.lexsort((ids[candidates], -scores[candidates]))[:k]
+    selected = candidates[order]
+    return ids[selected], scores[selected]
+
+
+class ExactSearch:
+    """
+    Brute-force cosine search over pre-normalized vectors
+    """
+    name = 'exact'
+
+    def __init__(self, vectors):
+        self.vectors = normalize_rows(vectors)
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def search(self, queries, top_n=1):
+        """
+        Find the top matches for each query vector
+
+        Args:
+            queries: 2D array of query embeddings
+            top_n: Number of matches to return per query
+
+        Returns:
+            list: One (ids, scores) tuple per query
+        """
+        queries = normalize_rows(queries)
+        similarities = queries @ self.vectors.T
+        return [top_k(row, top_n) for row in similarities]
+
+
+class IVFIndex:
+    """
+    Inverted-file index: vectors are grouped around k-means centroids and a
+    query only scans the lists of its closest centroids
+    """
+    name = 'ivf'
+
+    def __init__(self, vectors, centroids, list_offsets, list_ids, n_probe=8):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+        self.n_probe = n_probe
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, n_iter=10, sample_size=None, n_probe=8, seed=0):
+        """
+        Build an index with spherical k-means clustering
+
+        Args:
+            vectors: 2D array of embeddings
+            n_lists: Number of clusters (default: about 4 * sqrt(number of vectors))
+            n_iter: Number of k-means iterations
+            sample_size: Number of vectors used for training (default: 64 per list)
+            n_probe: Number of lists scanned per query
+            seed: Random seed for centroid initialisation
+
+        Returns:
+            IVFIndex: The built index
+        """
+        vectors = normalize_rows(vectors)
+        n_vectors = vectors.shape[0]
+        if n_lists is None:
+            n_lists = int(4 * np.sqrt(n_vectors))
+        n_lists = max(1, min(n_lists, n_vectors))
+
+        rng = np.random.default_rng(seed)
+        if sample_size is None:
+            sample_size = 64 * n_lists
+        if sample_size < n_vectors:
+            sample = vectors[rng.choice(n_vectors, sample_size, replace=False)]
+        else:
+            sample = vectors
+
+        centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assignment = _assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+
+            # Empty clusters keep their previous centroid
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize_rows(sums)
+
+        assignment = _assign(vectors, centroids)
+        list_ids = np.argsort(assignment, kind='stable')
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=n_lists), out=list_offsets[1:])
+
+        return cls(vectors, centroids, list_offsets, list_ids, n_probe=n_probe)
+
+    def save(self, path):
+        """
+        Save the centroids and inverted lists (not the vectors) to an .npz file
+
+        Args:
+            path: Output file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, centroids=self.centroids, list_offsets=self.list_offsets,
+                     list_ids=self.list_ids, n_vectors=np.array(len(self)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, vectors, n_probe=8):
+        """
+        Load an index saved with save()
+
+        Args:
+            path: Path of the .npz file
+            vectors: The same embeddings the index was built from
+            n_probe: Number of lists scanned per query
+
+        Returns:
+            IVFIndex or None: The index, or None if it doesn't match the vectors
+        """
+        vectors = normalize_rows(vectors)
+        with np.load(path) as data:
+            if int(data['n_vectors']) != vectors.shape[0]:
+                return None
+            return cls(vectors, data['centroids'], data['list_offsets'], data['list_ids'], n_probe=n_probe)
+
+    def search(self, queries, top_n=1):
+        """
+        Find the approximate top matches for each query vector
+
+        Args:
+            queries: 2D array of query embeddings
+            top_n: Number of matches to return per query
+
+        Returns:
+            list: One (ids, scores) tuple per query
+        """
+        queries = normalize_rows(queries)
+        n_probe = min(self.n_probe, self.centroids.shape[0])
+        centroid_scores = queries @ self.centroids.T
+
+        results = []
+        for query, row in zip(queries, centroid_scores):
+            probe = np.argpartition(-row, n_probe - 1)[:n_probe]
+            candidates = np.concatenate([
+                self.list_ids[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe
+            ])
+            candidates.sort()
+            scores = self.vectors[candidates] @ query
+            results.append(top_k(scores, top_n, ids=candidates))
+        return results
+
+
+def _assign(vectors, centroids, batch_size=8192):
+    """
+    Assign each vector to its most similar centroid, in batches to bound memory
+    """
+    assignment = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], batch_size):
+        batch = vectors[start:start + batch_size]
+        assignment[start:start + batch_size] = np.argmax(batch @ centroids.T, axis=1)
+    return assignment
+
+
+# Available search backends by name
+SEARCH_BACKENDS = {
+    'exact': ExactSearch,
+    'ivf': IVFIndex,
+}
+
+
+def create_search_backend(name, vectors, index_path=None):
+    """
+    Create a search backend, loading or saving the ANN index when a path is given
+
+    Args:
+        name: Backend name ('exact' or 'ivf')
+        vectors: 2D array of alternate title embeddings
+        index_path: Optional .npz path for the IVF index
+
+    Returns:
+        ExactSearch or IVFIndex: The search backend
+    """
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {name} (choose from {', '.join(SEARCH_BACKENDS)})")
+
+    if name == 'exact':
+        return ExactSearch(vectors)
+
+    index = None
+    if index_path and os.path.exists(index_path):
+        index = IVFIndex.load(index_path, vectors)
+    if index is None:
+        index = IVFIndex.build(vectors)
+        if index_path:
+            index.save(index_path)
+    return index
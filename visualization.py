@@ -1,16 +1,22 @@
 import matplotlib.pyplot as plt
-from date_utils import calculate_duration, calculate_total_experience_direct
+from date_utils import split_months
+from aggregation import period_months
 import os
 import plotly.graph_objects as go
 import plotly.express as px  # En üste eklendiğinden emin ol
 import os
 from collections import defaultdict
-from date_utils import calculate_duration, calculate_total_experience_direct
 import pandas as pd
 
 # Grafiklerin kaydedileceği klasör (Flask'ın static klasörü içinde olacak)
 CHART_DIR = os.path.join("web_viewer", "static", "charts")
-os.makedirs(CHART_DIR, exist_ok=True)
+
+
+def chart_path(directory, filename):
+    # Klasör import sırasında değil, ilk grafik kaydedilirken oluşturulur
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
 
 def save_similarity_scores_bar(all_matches):
     labels = [f"{item['position']} @ {item['company']}" for item in all_matches]
@@ -21,7 +27,7 @@ def save_similarity_scores_bar(all_matches):
     plt.xlabel("Benzerlik Skoru (S-BERT)")
     plt.title("Pozisyonlara Göre Eşleşme Skorları")
     plt.tight_layout()
-    plt.savefig(os.path.join(CHART_DIR, "similarity.png"), dpi=150)
+    plt.savefig(chart_path(CHART_DIR, "similarity.png"), dpi=150)
     plt.close()
 
 def save_position_durations_bar(all_work_periods):
@@ -29,10 +35,8 @@ def save_position_durations_bar(all_work_periods):
     durations_in_months = []
 
     for period in all_work_periods:
-        dur_str = calculate_duration(period['start'], period['end'])
-        if dur_str:
-            y, m = calculate_total_experience_direct([dur_str])
-            months = y * 12 + m
+        months = period_months(period)
+        if months is not None:
             labels.append(f"{period['position']} @ {period['company']}")
             durations_in_months.append(months)
 
@@ -41,21 +45,13 @@ def save_position_durations_bar(all_work_periods):
     plt.xlabel("Süre (ay)")
     plt.title("Pozisyon Bazında Çalışma Süresi")
     plt.tight_layout()
-    plt.savefig(os.path.join(CHART_DIR, "position_durations.png"), dpi=150)
+    plt.savefig(chart_path(CHART_DIR, "position_durations.png"), dpi=150)
     plt.close()
 
-def save_onet_experience_pie(onet_code_groups, all_work_periods):
+def save_onet_experience_pie(aggregate):
+    # aggregation.aggregate_experience() sonucundaki O*NET toplamlarını kullan
     onet_totals = {}
-    for onet_code, match_infos in onet_code_groups.items():
-        durations = []
-        for match in match_infos:
-            for period in all_work_periods:
-                if match['position'] == period['position'] and match['company'] == period['company']:
-                    dur = calculate_duration(period['start'], period['end'])
-                    if dur:
-                        durations.append(dur)
-        years, months = calculate_total_experience_direct(durations)
-        total_months = years * 12 + months
+    for onet_code, total_months in aggregate['onet_months'].items():
         if total_months > 0:
             onet_totals[onet_code] = total_months
 
@@ -69,32 +65,16 @@ def save_onet_experience_pie(onet_code_groups, all_work_periods):
     plt.pie(values, labels=labels, autopct='%1.1f%%', startangle=140)
     plt.title("O*NET Kodlarına Göre Dağılım (Pasta Grafik)")
     plt.tight_layout()
-    plt.savefig(os.path.join(CHART_DIR, "onet_experience.png"), dpi=150)
+    plt.savefig(chart_path(CHART_DIR, "onet_experience.png"), dpi=150)
     plt.close()
 
-def save_matched_titles_pie(all_matches, all_work_periods, occupation_data):
-    from collections import defaultdict
+def save_matched_titles_pie(aggregate):
     import matplotlib.patches as mpatches
 
-    matched_totals = defaultdict(list)
-
-    # Grupla: matched title => durations
-    for match_info in all_matches:
-        matched_title = match_info['match']['alternate_title']
-        position = match_info['position']
-        company = match_info['company']
-
-        for period in all_work_periods:
-            if period['position'] == position and period['company'] == company:
-                duration = calculate_duration(period['start'], period['end'])
-                if duration:
-                    matched_totals[matched_title].append(duration)
-
-    # Ay cinsine çevir
+    # Yıl/ay olarak ayır (matched title => toplam ay)
     labels, values, durations = [], [], []
-    for title, duration_list in matched_totals.items():
-        y, m = calculate_total_experience_direct(duration_list)
-        months = y * 12 + m
+    for title, months in aggregate['title_months'].items():
+        y, m = split_months(months)
         if months > 0:
             labels.append(title)
             values.append(months)
@@ -111,25 +91,15 @@ def save_matched_titles_pie(all_matches, all_work_periods, occupation_data):
     plt.legend(handles=patches, loc="center left", bbox_to_anchor=(1, 0.5), fontsize=9)
     plt.title("Matched Mesleklere Göre Toplam Süre (Pasta Grafik)")
     plt.tight_layout()
-    plt.savefig(os.path.join(CHART_DIR, "matched_titles_pie.png"), dpi=150)
+    plt.savefig(chart_path(CHART_DIR, "matched_titles_pie.png"), dpi=150)
     plt.close()
 
-def save_position_titles_pie(all_work_periods):
-    from collections import defaultdict
+def save_position_titles_pie(aggregate):
     import matplotlib.patches as mpatches
 
-    durations_by_position = defaultdict(list)
-
-    for period in all_work_periods:
-        position = period['position']
-        duration = calculate_duration(period['start'], period['end'])
-        if duration:
-            durations_by_position[position].append(duration)
-
     labels, values, durations = [], [], []
-    for pos, duration_list in durations_by_position.items():
-        y, m = calculate_total_experience_direct(duration_list)
-        total_months = y * 12 + m
+    for pos, total_months in aggregate['position_months'].items():
+        y, m = split_months(total_months)
         if total_months > 0:
             labels.append(pos)
             values.append(total_months)
@@ -145,34 +115,22 @@ def save_position_titles_pie(all_work_periods):
     plt.legend(handles=patches, loc="center left", bbox_to_anchor=(1, 0.5), fontsize=9)
     plt.title("Pozisyonlara Göre Toplam Çalışma Süresi (Pasta Grafik)")
     plt.tight_layout()
-    plt.savefig(os.path.join(CHART_DIR, "position_titles_pie.png"), dpi=150)
+    plt.savefig(chart_path(CHART_DIR, "position_titles_pie.png"), dpi=150)
     plt.close()
 
    
 
 HTML_CHART_DIR = os.path.join("web_viewer", "static", "charts_html")
-os.makedirs(HTML_CHART_DIR, exist_ok=True)
 
-#todo: ALTERNATİVE TİTLE GÖRE PASTA GRAFİĞİ
-def save_matched_titles_pie_plotly(all_matches, all_work_periods):
-    durations_by_title = defaultdict(list)
-
-    for match_info in all_matches:
-        matched_title = match_info['match']['alternate_title']
-        position = match_info['position']
-        company = match_info['company']
-
-        for period in all_work_periods:
-            if position == period['position'] and company == period['company']:
-                duration = calculate_duration(period['start'], period['end'])
-                if duration:
-                    durations_by_title[matched_title].append(duration)
+# Plotly grafikleri plotly.js'i gömmek yerine aynı klasördeki ortak plotly.min.js dosyasını kullanır
+PLOTLYJS_MODE = 'directory'
 
+#todo: ALTERNATİVE TİTLE GÖRE PASTA GRAFİĞİ
+def save_matched_titles_pie_plotly(aggregate):
     labels, values, hovertexts = [], [], []
 
-    for title, duration_list in durations_by_title.items():
-        y, m = calculate_total_experience_direct(duration_list)
-        total_months = y * 12 + m
+    for title, total_months in aggregate['title_months'].items():
+        y, m = split_months(total_months)
         if total_months > 0:
             labels.append(title)
             values.append(total_months)
@@ -195,7 +153,7 @@ def save_matched_titles_pie_plotly(all_matches, all_work_periods):
         font=dict(color="#333", size=14),
     )
 
-    fig.write_html(os.path.join(HTML_CHART_DIR, "matched.html"))
+    fig.write_html(chart_path(HTML_CHART_DIR, "matched.html"), include_plotlyjs=PLOTLYJS_MODE)
 
 from datetime import datetime
 
@@ -216,12 +174,8 @@ def save_career_timeline_plotly(all_work_periods):
         start = period.get("start")
         end = period.get("end")
 
-        # 🔍 log at: hangi kayıt işleniyor
-        print(f"👉 Pozisyon: {position} @ {company} | Start: {start} | End: {end}")
-
         # 💥 Eksik veri varsa atla
         if not start or not end:
-            print("⛔ Boş tarih - atlandı")
             continue
         if isinstance(start, str) and "unknown" in start.lower():
             continue
@@ -235,7 +189,6 @@ def save_career_timeline_plotly(all_work_periods):
             end_dt = pd.to_datetime(end, errors="coerce")
 
             if pd.isna(start_dt) or pd.isna(end_dt):
-                print("❌ Tarih çevrilemedi - atlandı")
                 continue
 
             timeline_data.append({
@@ -244,11 +197,11 @@ def save_career_timeline_plotly(all_work_periods):
                 "Başlangıç": start_dt,
                 "Bitiş": end_dt
             })
-        except Exception as e:
-            print(f"⚠️ Hata: {e}")
+        except Exception:
+            # Tarih çevrilemedi - atlandı
+            continue
 
     if not timeline_data:
-        print("🚫 Hiç geçerli pozisyon eklenemedi.")
         return
 
     df = pd.DataFrame(timeline_data)
@@ -272,26 +225,16 @@ def save_career_timeline_plotly(all_work_periods):
         font=dict(size=14)
     )
 
-    fig.write_html(os.path.join(HTML_CHART_DIR, "career.html"))
-
+    fig.write_html(chart_path(HTML_CHART_DIR, "career.html"), include_plotlyjs=PLOTLYJS_MODE)
 
 
 
 
-def save_company_durations_pie_plotly(all_work_periods):
-    from collections import defaultdict
-    durations_by_company = defaultdict(list)
-
-    for period in all_work_periods:
-        company = period['company']
-        duration = calculate_duration(period['start'], period['end'])
-        if duration:
-            durations_by_company[company].append(duration)
 
+def save_company_durations_pie_plotly(aggregate):
     labels, values, hovertexts = [], [], []
-    for comp, duration_list in durations_by_company.items():
-        y, m = calculate_total_experience_direct(duration_list)
-        total_months = y * 12 + m
+    for comp, total_months in aggregate['company_months'].items():
+        y, m = split_months(total_months)
         if total_months > 0:
             labels.append(comp)
             values.append(total_months)
@@ -315,22 +258,12 @@ def save_company_durations_pie_plotly(all_work_periods):
         font=dict(color="#333", size=14),
     )
 
-    fig.write_html(os.path.join(HTML_CHART_DIR, "company.html"))
+    fig.write_html(chart_path(HTML_CHART_DIR, "company.html"), include_plotlyjs=PLOTLYJS_MODE)
 
-def save_onet_experience_pie_plotly(onet_code_groups, all_work_periods, occupation_data):
-    from collections import defaultdict
+def save_onet_experience_pie_plotly(aggregate, occupation_data):
     onet_totals = {}
 
-    for onet_code, match_infos in onet_code_groups.items():
-        durations = []
-        for match in match_infos:
-            for period in all_work_periods:
-                if match['position'] == period['position'] and match['company'] == period['company']:
-                    dur = calculate_duration(period['start'], period['end'])
-                    if dur:
-                        durations.append(dur)
-        y, m = calculate_total_experience_direct(durations)
-        total_months = y * 12 + m
+    for onet_code, total_months in aggregate['onet_months'].items():
         if total_months > 0:
             title = occupation_data[onet_code]["title"] if onet_code in occupation_data else onet_code
             onet_totals[title] = total_months
@@ -357,7 +290,7 @@ def save_onet_experience_pie_plotly(onet_code_groups, all_work_periods, occupati
         font=dict(color="#333", size=14),
     )
 
-    fig.write_html(os.path.join(HTML_CHART_DIR, "onet.html"))
+    fig.write_html(chart_path(HTML_CHART_DIR, "onet.html"), include_plotlyjs=PLOTLYJS_MODE)
 
 
 